@@ -0,0 +1,81 @@
+# File: benchmarks/bench_import.py
+"""
+Cold import time of the framework modules, each measured in a fresh interpreter
+(median of several runs), plus the time to construct an Orchestrator from a
+config, which must not import ns3gym or SeQUeNCo:
+
+    python benchmarks/bench_import.py --repeats 5 --output imports.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+PROJECT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+MODULES = (
+    "numpy",
+    "qsagin.core.orchestrator",
+    "qsagin.simulators.registry",
+    "qsagin.simulators.sim_mock",
+    "qsagin.simulators.sim_quantum",
+    "qsagin.simulators.sim_classical",
+    "sequence.kernel.timeline",
+    "ns3gym.ns3env",
+)
+
+CONFIG_ONLY = """
+from qsagin.core.orchestrator import Orchestrator
+Orchestrator.from_config({"classical_network": {"port": 5555}, "quantum_network": {}})
+"""
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+exec(sys.argv[1])
+elapsed = time.perf_counter() - start
+heavy = sorted(m for m in ("sequence", "ns3gym", "zmq") if m in sys.modules)
+print(elapsed, ",".join(heavy))
+"""
+
+def time_statement(statement, repeats):
+    """Returns (median seconds, heavy modules loaded) or None if the statement fails."""
+    times, heavy = [], ""
+    for _ in range(repeats):
+        result = subprocess.run([sys.executable, "-c", PROBE, statement], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            return None
+        elapsed, _, heavy = result.stdout.strip().partition(" ")
+        times.append(float(elapsed))
+    return float(np.median(times)), heavy
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold import time of Q-SAGINsim modules.")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", help="Optional JSON file for the results.")
+    args = parser.parse_args()
+
+    statements = {module: f"import {module}" for module in MODULES}
+    statements["Orchestrator.from_config"] = CONFIG_ONLY
+    results = []
+    for name, statement in statements.items():
+        measured = time_statement(statement, args.repeats)
+        if measured is None:
+            results.append({"name": name, "available": False})
+            print(f"{name:36s}  not importable here")
+            continue
+        seconds, heavy = measured
+        results.append({"name": name, "available": True, "median_ms": seconds * 1e3,
+                        "heavy_modules_loaded": heavy.split(",") if heavy else []})
+        print(f"{name:36s}  {seconds * 1e3:8.1f} ms  heavy deps loaded: {heavy or 'none'}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
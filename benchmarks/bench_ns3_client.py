@@ -0,0 +1,89 @@
+# File: benchmarks/bench_ns3_client.py
+"""
+Throughput/latency of the NS3Simulator client path (ns3gym + ZMQ + protobuf)
+against the ns3-gym stand-in server, without building ns-3:
+
+    python benchmarks/bench_ns3_client.py --steps 5000 --output ns3_client.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import time
+
+# Add the project root to the Python path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from qsagin.core.profiling import LatencyHistogram
+from qsagin.simulators.ns3_standin import serve
+from qsagin.simulators.sim_classical import NS3Simulator
+
+# Observation sizes (number of floats per ns-3 observation) to benchmark.
+OBS_SIZES = (1, 16, 256, 4096)
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("localhost", 0))
+        return s.getsockname()[1]
+
+def bench_obs_size(obs_size, steps, episode_length, step_latency_s):
+    """Runs `steps` client steps against a fresh stand-in server; returns step/reset summaries."""
+    port = free_port()
+    server = multiprocessing.Process(target=serve, args=({
+        "port": port, "obs_size": obs_size, "episode_length": episode_length,
+        "step_latency_s": step_latency_s, "seed": 0,
+    },), daemon=True)
+    server.start()
+    sim = NS3Simulator({"port": port})
+    step_hist, reset_hist = LatencyHistogram(), LatencyHistogram()
+    try:
+        start_ns = time.perf_counter_ns()
+        sim.reset()
+        reset_hist.record(time.perf_counter_ns() - start_ns)
+        loop_start = time.perf_counter()
+        for i in range(steps):
+            start_ns = time.perf_counter_ns()
+            _, _, done, _ = sim.step(i % 2)
+            step_hist.record(time.perf_counter_ns() - start_ns)
+            if done:
+                start_ns = time.perf_counter_ns()
+                sim.reset()
+                reset_hist.record(time.perf_counter_ns() - start_ns)
+        elapsed = time.perf_counter() - loop_start
+    finally:
+        sim.close()
+        server.terminate()
+        server.join()
+    return {
+        "obs_size": obs_size,
+        "steps_per_sec": steps / elapsed,
+        "step": step_hist.summary(),
+        "reset": reset_hist.summary(),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="NS3Simulator step/reset latency against the ns3-gym stand-in.")
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--episode-length", type=int, default=500)
+    parser.add_argument("--step-latency-ms", type=float, default=0.0,
+                        help="Simulated ns-3 time per step inside the stand-in server.")
+    parser.add_argument("--obs-sizes", type=int, nargs="*", default=list(OBS_SIZES))
+    parser.add_argument("--output", help="Optional JSON file for the results.")
+    args = parser.parse_args()
+
+    results = []
+    for obs_size in args.obs_sizes:
+        row = bench_obs_size(obs_size, args.steps, args.episode_length, args.step_latency_ms / 1e3)
+        results.append(row)
+        print(f"obs_size={obs_size:5d}  {row['steps_per_sec']:9.1f} steps/s  "
+              f"step p50={row['step']['p50_ms']:.3f} ms p99={row['step']['p99_ms']:.3f} ms  "
+              f"reset p50={row['reset']['p50_ms']:.1f} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# File: benchmarks/bench_reset.py
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from qsagin.simulators.sim_quantum import SequenceSimulator
+
+# Topology sizes (number of QKD nodes in a chain) to benchmark.
+TOPOLOGY_SIZES = (2, 4, 8, 16, 32)
+
+def make_config(num_nodes, reset_mode):
+    """Builds a sliced-mode config for a chain topology with `num_nodes` nodes."""
+    nodes = [f"node{i}" for i in range(num_nodes)]
+    return {
+        "mode": "sliced",
+        "time_slice_ns": 1,
+        "sim_time_ns": 1e9,
+        "topology": {
+            "nodes": nodes,
+            "links": [{"src": a, "dst": b, "distance": 1e3} for a, b in zip(nodes, nodes[1:])],
+        },
+        "key_size": 128,
+        "num_keys": 1,
+        "seed": 0,
+        "reset_mode": reset_mode,
+    }
+
+def time_resets(config, repeats):
+    """
+    Returns per-episode-start latencies (seconds): a reset followed by a 1-unit
+    slice that activates every link, so lazily built links are included. The first
+    (template building) episode is excluded.
+    """
+    sim = SequenceSimulator(config)
+    sim.reset()
+    all_links = np.ones(len(sim.links), dtype=bool)
+    sim.step(all_links)
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        sim.reset()
+        sim.step(all_links)
+        latencies.append(time.perf_counter() - start)
+    return np.asarray(latencies)
+
+def main():
+    parser = argparse.ArgumentParser(description="SequenceSimulator reset latency: rebuild vs snapshot.")
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--output", help="Optional JSON file for the results.")
+    args = parser.parse_args()
+
+    results = []
+    for num_nodes in TOPOLOGY_SIZES:
+        row = {"nodes": num_nodes}
+        for reset_mode in ("rebuild", "snapshot"):
+            latencies = time_resets(make_config(num_nodes, reset_mode), args.repeats)
+            row[f"{reset_mode}_median_ms"] = float(np.median(latencies) * 1e3)
+            row[f"{reset_mode}_p95_ms"] = float(np.percentile(latencies, 95) * 1e3)
+        row["speedup"] = row["rebuild_median_ms"] / row["snapshot_median_ms"]
+        results.append(row)
+        print(f"nodes={num_nodes:3d}  rebuild={row['rebuild_median_ms']:8.3f} ms  "
+              f"snapshot={row['snapshot_median_ms']:8.3f} ms  speedup={row['speedup']:.1f}x")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
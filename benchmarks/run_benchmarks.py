@@ -0,0 +1,205 @@
+# File: benchmarks/run_benchmarks.py
+"""
+Offline benchmark suite for Q-SAGINsim.
+
+Runs without ns-3 (mock classical simulator) and writes machine-readable results:
+
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --baseline baseline.json --tolerance 0.15
+    python benchmarks/run_benchmarks.py --output baseline.json --only orchestrator
+
+SeQUeNCo benchmarks are reported as skipped when the `sequence` package is not
+installed. The exit code is 1 when a metric regressed against the baseline.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from qsagin.agents.base_agent import RandomAgent
+from qsagin.core.orchestrator import Orchestrator
+from qsagin.simulators.sim_mock import MockClassicalSimulator, MockQuantumSimulator
+
+BENCHMARKS = {}
+
+def benchmark(name):
+    """Registers a benchmark function returning {metric: (value, unit, higher_is_better)}."""
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+def _sequence_simulator():
+    # sim_quantum imports SeQUeNCo lazily, so check for the package itself.
+    if importlib.util.find_spec("sequence") is None:
+        return None
+    from qsagin.simulators.sim_quantum import SequenceSimulator
+    return SequenceSimulator
+
+@benchmark("orchestrator")
+def bench_orchestrator(quick):
+    num_steps = 2000 if quick else 20000
+    classical_sim = MockClassicalSimulator({"obs_size": 16, "episode_length": num_steps + 1, "seed": 0})
+    quantum_sim = MockQuantumSimulator({"done_on_step": False})
+    orchestrator = Orchestrator(classical_sim, quantum_sim, RandomAgent(seed=0))
+    start = time.perf_counter()
+    orchestrator.run(num_steps)
+    elapsed = time.perf_counter() - start
+    return {"steps_per_sec": (num_steps / elapsed, "steps/s", True)}
+
+@benchmark("agent")
+def bench_agent(quick):
+    num_actions = 20000 if quick else 200000
+    agent = RandomAgent(seed=0)
+    state = {"classical": np.zeros(16), "quantum": {"key_rate_bps": 0.0}}
+    start = time.perf_counter()
+    for _ in range(num_actions):
+        agent.get_action(state)
+    elapsed = time.perf_counter() - start
+    batch = np.zeros((256, 16))
+    start = time.perf_counter()
+    for _ in range(num_actions // len(batch)):
+        agent.get_actions(batch)
+    batched_elapsed = time.perf_counter() - start
+    return {
+        "actions_per_sec": (num_actions / elapsed, "actions/s", True),
+        "batched_actions_per_sec": (num_actions // len(batch) * len(batch) / batched_elapsed, "actions/s", True),
+    }
+
+@benchmark("sequence")
+def bench_sequence(quick):
+    SequenceSimulator = _sequence_simulator()
+    if SequenceSimulator is None:
+        return None
+    repeats = 2 if quick else 5
+    grid = {
+        "num_keys": (1, 5, 10) if quick else (1, 5, 10, 50),
+        "key_size": (64, 256) if quick else (64, 256, 1024),
+        "distance": (1e3, 1e4) if quick else (1e3, 1e4, 5e4),
+    }
+    base = {"sim_time_ns": 1e10, "topology": {"nodes": ["Alice", "Bob"], "distance": 1e3},
+            "key_size": 256, "num_keys": 10, "seed": 0}
+    metrics = {}
+    for param, values in grid.items():
+        for value in values:
+            config = json.loads(json.dumps(base))
+            if param == "distance":
+                config["topology"]["distance"] = value
+            else:
+                config[param] = value
+            sim = SequenceSimulator(config)
+            reset_times, step_times = [], []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                sim.reset()
+                reset_times.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                sim.step(0)
+                step_times.append(time.perf_counter() - start)
+            metrics[f"reset_ms[{param}={value:g}]"] = (float(np.median(reset_times)) * 1e3, "ms", False)
+            metrics[f"step_ms[{param}={value:g}]"] = (float(np.median(step_times)) * 1e3, "ms", False)
+    return metrics
+
+@benchmark("sequence_analytic")
+def bench_sequence_analytic(quick):
+    # Analytic mode never imports SeQUeNCo, so this runs without it installed.
+    from qsagin.simulators.sim_quantum import SequenceSimulator
+    num_steps = 2000 if quick else 20000
+    sim = SequenceSimulator({"mode": "analytic", "topology": {"nodes": ["Alice", "Bob"], "distance": 1e4}})
+    sim.reset()
+    start = time.perf_counter()
+    for _ in range(num_steps):
+        sim.step(0)
+    elapsed = time.perf_counter() - start
+    return {"steps_per_sec": (num_steps / elapsed, "steps/s", True)}
+
+def run_benchmark(name, quick):
+    """
+    Runs one benchmark untraced for its timings, then once more in quick mode under
+    tracemalloc to add its peak traced memory (tracing would distort the timings).
+    """
+    metrics = BENCHMARKS[name](quick)
+    if metrics is None:
+        return {"skipped": True}
+    tracemalloc.start()
+    try:
+        BENCHMARKS[name](True)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    metrics["peak_memory_mb"] = (peak / 2 ** 20, "MB", False)
+    return {name: {"value": value, "unit": unit, "higher_is_better": better}
+            for name, (value, unit, better) in metrics.items()}
+
+def compare(results, baseline, tolerance):
+    """Returns a list of (benchmark, metric, baseline, current, relative_change) regressions."""
+    regressions = []
+    for bench_name, metrics in results.items():
+        for metric, current in metrics.items():
+            if not isinstance(current, dict):
+                continue
+            reference = baseline.get(bench_name, {}).get(metric)
+            if not isinstance(reference, dict) or reference["value"] == 0:
+                continue
+            change = (current["value"] - reference["value"]) / reference["value"]
+            worse = -change if current["higher_is_better"] else change
+            if worse > tolerance:
+                regressions.append((bench_name, metric, reference["value"], current["value"], change))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Q-SAGINsim offline benchmark suite.")
+    parser.add_argument("--only", nargs="*", choices=sorted(BENCHMARKS), help="Benchmarks to run.")
+    parser.add_argument("--quick", action="store_true", help="Smaller problem sizes.")
+    parser.add_argument("--output", help="JSON file for the results.")
+    parser.add_argument("--baseline", help="JSON results to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="Allowed relative slowdown before a metric counts as a regression.")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.only or BENCHMARKS:
+        print(f"Running benchmark '{name}'...")
+        results[name] = run_benchmark(name, args.quick)
+        for metric, entry in results[name].items():
+            if isinstance(entry, dict):
+                print(f"  {metric:40s} {entry['value']:14.3f} {entry['unit']}")
+            else:
+                print("  skipped (dependency not installed)")
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": args.quick,
+            "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for bench_name, metric, reference, current, change in regressions:
+            print(f"REGRESSION {bench_name}.{metric}: {reference:.3f} -> {current:.3f} ({change:+.1%})")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}.")
+
+if __name__ == "__main__":
+    main()
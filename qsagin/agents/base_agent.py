@@ -1,33 +1,104 @@
 # File: qsagin/agents/base_agent.py
 
+import asyncio
 import numpy as np
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+from ..core.log import get_logger
+
+logger = get_logger("agents")
 
 class BaseAgent(ABC):
     """
     Abstract Base Class for all AI agents.
     This defines the "contract" that any agent must follow: it must be able to
     provide an action based on a given state.
+
+    Agents can commit to several steps at once: setting `action_repeat` > 1 holds
+    each action for that many steps, and overriding `get_action_chunk` returns an
+    open-loop plan. The Orchestrator then executes the whole chunk with one
+    `step_chunk` call per simulator.
     """
-    @abstractmethod
+    action_repeat = 1
+
+    def __init__(self, seed=None, replay_buffer=None):
+        """
+        Args:
+            seed (int): (Optional) Seed of the agent's own random generator `self.rng`,
+                        so runs are reproducible without touching numpy's global state.
+            replay_buffer (ReplayBuffer): (Optional) Buffer that `learn` adds every
+                        transition to before calling `learn_batch`; agents sample
+                        their training batches from `self.replay_buffer`.
+        """
+        self.rng = np.random.default_rng(seed)
+        self.replay_buffer = replay_buffer
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # get_action and get_actions default to each other; an agent must implement one.
+        if cls.get_action is BaseAgent.get_action and cls.get_actions is BaseAgent.get_actions:
+            raise TypeError(f"{cls.__name__} must implement get_action or get_actions.")
+
+    def get_actions(self, batch_states):
+        """
+        Receives a batch of states and returns one action per state.
+        By default calls `get_action` once per state.
+
+        Args:
+            batch_states (sequence or np.ndarray): States of several environments, e.g.
+                          a list of state dicts or the (num_envs, obs_dim) observations of
+                          a VecOrchestrator.
+
+        Returns:
+            np.ndarray or list: One action per state. A (classical, quantum) tuple or a
+                        dict is split between the simulators; any other action (a
+                        scalar, a link list or mask...) is sent to both unchanged.
+        """
+        actions = [self.get_action(state) for state in batch_states]
+        if all(np.isscalar(action) for action in actions):
+            return np.asarray(actions)
+        return actions
+
     def get_action(self, state):
         """
         Receives the current state of the environment and returns an action.
+        By default built on `get_actions` with a batch of one.
         
         Args:
             state (dict): The current state of the system, typically containing
                           'classical' and 'quantum' substates.
                           
         Returns:
-            dict: An action dictionary. The structure depends on the specific problem.
+            A scalar action, a (classical, quantum) tuple or any action accepted by
+            both simulators (see `split_action`).
         """
-        pass
+        action = self.get_actions([state])[0]
+        if isinstance(action, (np.generic, np.ndarray)) and action.ndim == 0:
+            return action.item()
+        return action
     
+    def get_action_chunk(self, state):
+        """
+        Returns a list of actions to execute in order before the agent observes
+        the state again. By default the action from `get_action` repeated
+        `action_repeat` times.
+        """
+        return [self.get_action(state)] * self.action_repeat
+
+    def learn_batch(self, states, actions, rewards, next_states, dones):
+        """
+        (Optional) Learns from a batch of experience tuples, e.g. one lockstep
+        iteration of a VecOrchestrator. Arguments are aligned sequences/arrays with
+        one entry per transition.
+        """
+        pass
+
     def learn(self, state, action, reward, next_state, done):
         """
         (Optional) Allows the agent to learn from an experience tuple.
-        This method is crucial for Reinforcement Learning agents but can be left empty
-        for simple agents like RandomAgent.
+        Stores it in `self.replay_buffer` (if any), then calls `learn_batch` with
+        a batch of one, so agents only need to implement the batched version.
         
         Args:
             state: The state before the action was taken.
@@ -36,7 +107,28 @@ class BaseAgent(ABC):
             next_state: The state after the action was taken.
             done (bool): A flag indicating if the episode has ended.
         """
-        pass
+        replay_buffer = getattr(self, "replay_buffer", None)
+        if replay_buffer is not None:
+            replay_buffer.add(state, action, reward, next_state, done)
+        self.learn_batch([state], [action], [reward], [next_state], [done])
+
+    def snapshot(self):
+        """
+        Returns the agent state stored in orchestrator checkpoints: the state of
+        `self.rng` plus every other instance attribute (parameters, counters...).
+        The result is pickled immediately. Agents holding unpicklable members
+        (sockets, locks, external models) should override this and `restore`.
+        """
+        attributes = {name: value for name, value in vars(self).items() if name != "rng"}
+        # Subclasses that do not call BaseAgent.__init__ have no `rng`.
+        rng = getattr(self, "rng", None)
+        return {"rng": None if rng is None else rng.bit_generator.state, "attributes": attributes}
+
+    def restore(self, snapshot):
+        """Restores a state returned by `snapshot`."""
+        vars(self).update(snapshot["attributes"])
+        if snapshot["rng"] is not None:
+            self.rng.bit_generator.state = snapshot["rng"]
 
 
 class RandomAgent(BaseAgent):
@@ -44,7 +136,7 @@ class RandomAgent(BaseAgent):
     A simple agent that takes random actions.
     This agent is primarily used for testing the simulation loop and environment interaction.
     """
-    def __init__(self, num_quantum_links=5, num_satellites=5):
+    def __init__(self, num_quantum_links=5, num_satellites=5, seed=None):
         """
         Initializes the RandomAgent.
         
@@ -53,32 +145,73 @@ class RandomAgent(BaseAgent):
                                      ns3-gym 'opengym' scenario, this is 5.
             num_satellites (int): Kept for API compatibility, but not used in the
                                   simplified action generation.
+            seed (int): (Optional) Seed of the agent's random generator.
         """
+        super().__init__(seed)
         # For the default 'opengym' C++ scenario, the action space is Discrete(5).
         # We use num_quantum_links to represent this size.
         self.action_space_size = num_quantum_links
-        print(f"RandomAgent initialized with action space size: {self.action_space_size}")
+        logger.info("RandomAgent initialized with action space size: %d", self.action_space_size)
 
-    def get_action(self, state):
+    def get_actions(self, batch_states):
         """
-        Generates a random action compatible with the simple 'opengym' environment.
-        The default ns-3 environment expects a single integer as an action.
+        Generates one random integer per state, compatible with the simple 'opengym'
+        environment. The default ns-3 environment expects a single integer as an
+        action; the same integer is used for the quantum simulator.
         
         Args:
-            state (dict): The current environment state (ignored by this agent).
+            batch_states: The current environment states (ignored by this agent).
             
         Returns:
-            dict: An action dictionary containing a single random integer for both
-                  'classical' and 'quantum' keys to ensure compatibility with
-                  the Orchestrator and the underlying ns-3 environment.
+            np.ndarray: int64 array of shape (len(batch_states),).
         """
-        # Generate a single random integer from 0 to (action_space_size - 1)
-        random_action = np.random.randint(0, self.action_space_size)
-        
-        # We still return a dictionary to maintain a consistent API with the Orchestrator.
-        # Both keys point to the same action. The Orchestrator will pick the correct one.
-        action = {
-            "classical": random_action,
-            "quantum": random_action
-        }
-        return action
+        return self.rng.integers(0, self.action_space_size, size=len(batch_states))
+
+    def learn(self, state, action, reward, next_state, done):
+        # Nothing to learn; skip building a batch of one on every step.
+        pass
+
+
+class AsyncBaseAgent(ABC):
+    """
+    Asyncio counterpart of BaseAgent for the AsyncOrchestrator. Agents that wait on
+    I/O (e.g. a remote policy server) implement it directly so that many
+    environments can await their actions concurrently; synchronous agents are
+    wrapped automatically by SyncAgentAdapter.
+    """
+    @abstractmethod
+    async def get_action(self, state):
+        pass
+
+    async def learn(self, state, action, reward, next_state, done):
+        pass
+
+    async def close(self):
+        pass
+
+
+class SyncAgentAdapter(AsyncBaseAgent):
+    """
+    Wraps a synchronous BaseAgent. Calls run in a single-threaded executor, so the
+    agent is never entered concurrently even when it serves many environments.
+    """
+    def __init__(self, agent):
+        self.agent = agent
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="qsagin-async-agent")
+
+    async def get_action(self, state):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self.agent.get_action, state)
+
+    async def learn(self, state, action, reward, next_state, done):
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, self.agent.learn, state, action, reward, next_state, done)
+
+    async def close(self):
+        self._executor.shutdown(wait=False)
+
+
+def as_async_agent(agent):
+    """Returns `agent` if it is already asynchronous, otherwise wraps it."""
+    if isinstance(agent, AsyncBaseAgent):
+        return agent
+    return SyncAgentAdapter(agent)
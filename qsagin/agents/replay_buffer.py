@@ -0,0 +1,225 @@
+# File: qsagin/agents/replay_buffer.py
+import os
+
+import numpy as np
+
+from ..core.state import StateBuffer, action_pair_row, as_flat_state
+
+
+class ReplayBuffer:
+    """
+    Fixed-size experience replay backed by preallocated numpy ring arrays.
+
+    Inserting a transition is O(1) (the oldest one is overwritten once the buffer is
+    full) and sampling gathers a whole batch with fancy indexing. Actions are stored
+    like in TrajectoryRecorder: 2 * action_dim entries per row, the classical then
+    the quantum part, each flattened and NaN-padded. With `directory` the columns
+    are memory-mapped .npy files, so the buffer can be larger than RAM.
+    """
+    def __init__(self, capacity, state_dim, state_dtype=np.float32, directory=None, seed=None,
+                 action_dim=1):
+        """
+        Args:
+            capacity (int): Maximum number of transitions.
+            state_dim (int): Length of a flattened global state.
+            state_dtype: dtype used to store states.
+            directory (str): (Optional) Directory for memory-mapped columns.
+            seed (int): (Optional) Seed of the sampling generator.
+            action_dim (int): Entries per action part (1 for scalar actions, the
+                              number of links for link masks...).
+        """
+        self.capacity = capacity
+        self.state_dim = state_dim
+        self.action_dim = action_dim
+        self.directory = directory
+        self.rng = np.random.default_rng(seed)
+        self.pos = 0
+        self.size = 0
+        shapes = {
+            "state": ((capacity, state_dim), state_dtype),
+            "action": ((capacity, 2 * action_dim), np.float64),
+            "reward": ((capacity,), np.float64),
+            "next_state": ((capacity, state_dim), state_dtype),
+            "done": ((capacity,), bool),
+        }
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self.columns = {name: self._allocate(name, shape, dtype) for name, (shape, dtype) in shapes.items()}
+
+    def _allocate(self, name, shape, dtype):
+        if self.directory is None:
+            return np.zeros(shape, dtype=dtype)
+        return np.lib.format.open_memmap(os.path.join(self.directory, f"{name}.npy"),
+                                         mode="w+", dtype=dtype, shape=shape)
+
+    @classmethod
+    def from_schema(cls, schemas, capacity, **kwargs):
+        """
+        Sizes the buffer from the simulators' state schemas.
+
+        Args:
+            schemas (dict or StateBuffer): {part: StateSchema} as returned by the
+                                           simulators' `state_spec()`, or a StateBuffer.
+        """
+        if isinstance(schemas, StateBuffer):
+            schemas = schemas.schemas
+        return cls(capacity, sum(schema.size for schema in schemas.values()), **kwargs)
+
+    def __len__(self):
+        return self.size
+
+    def _advance(self, count):
+        start = self.pos
+        self.pos = (self.pos + count) % self.capacity
+        self.size = min(self.size + count, self.capacity)
+        return start
+
+    def add(self, state, action, reward, next_state, done):
+        """Inserts one transition and returns its slot index."""
+        i = self._advance(1)
+        columns = self.columns
+        columns["state"][i] = as_flat_state(state)
+        columns["next_state"][i] = as_flat_state(next_state)
+        columns["action"][i] = action_pair_row(action, self.action_dim)
+        columns["reward"][i] = reward
+        columns["done"][i] = done
+        return i
+
+    def add_batch(self, states, actions, rewards, next_states, dones):
+        """
+        Inserts a batch of transitions (e.g. from BaseAgent.learn_batch) with one
+        vectorized write per column. States must be a (batch, state_dim) array;
+        actions a (batch, 2 * action_dim) array of stored rows, a (batch,) array of
+        scalars (with action_dim 1) or any sequence of agent actions (converted
+        row by row). Returns the slot indices.
+        """
+        rewards = np.asarray(rewards, dtype=np.float64)
+        count = len(rewards)
+        if count > self.capacity:
+            raise ValueError(f"Batch of {count} transitions exceeds the capacity {self.capacity}.")
+        indices = (self._advance(count) + np.arange(count)) % self.capacity
+        actions = self._action_rows(actions, count)
+        columns = self.columns
+        columns["state"][indices] = states
+        columns["next_state"][indices] = next_states
+        columns["action"][indices] = actions
+        columns["reward"][indices] = rewards
+        columns["done"][indices] = dones
+        return indices
+
+    def _action_rows(self, actions, count):
+        if isinstance(actions, np.ndarray) and actions.dtype.kind in "biuf":
+            if actions.shape == (count, 2 * self.action_dim):
+                return actions
+            if actions.shape == (count,) and self.action_dim == 1:
+                return np.repeat(actions[:, None].astype(np.float64), 2, axis=1)
+        return np.stack([action_pair_row(action, self.action_dim) for action in actions])
+
+    def gather(self, indices):
+        """Returns {column: array} for the given slot indices."""
+        return {name: column[indices] for name, column in self.columns.items()}
+
+    def sample(self, batch_size):
+        """Samples `batch_size` transitions uniformly (with replacement)."""
+        if self.size == 0:
+            raise ValueError("Cannot sample from an empty replay buffer.")
+        indices = self.rng.integers(0, self.size, size=batch_size)
+        batch = self.gather(indices)
+        batch["indices"] = indices
+        return batch
+
+    def flush(self):
+        """Flushes memory-mapped columns to disk (no-op for in-memory buffers)."""
+        for column in self.columns.values():
+            if isinstance(column, np.memmap):
+                column.flush()
+
+
+class SumTree:
+    """
+    Binary sum tree over `capacity` non-negative priorities, stored in one array.
+    Updates and prefix-sum searches are vectorized over batches: each costs one
+    numpy operation per tree level (O(log n) levels).
+    """
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.leaves = 1
+        while self.leaves < capacity:
+            self.leaves *= 2
+        self.depth = self.leaves.bit_length() - 1
+        # Node 1 is the root; the children of node i are 2i and 2i + 1.
+        self.tree = np.zeros(2 * self.leaves, dtype=np.float64)
+
+    @property
+    def total(self):
+        return self.tree[1]
+
+    def __getitem__(self, indices):
+        return self.tree[np.asarray(indices) + self.leaves]
+
+    def update(self, indices, priorities):
+        nodes = np.asarray(indices, dtype=np.int64) + self.leaves
+        self.tree[nodes] = priorities
+        for _ in range(self.depth):
+            nodes = np.unique(nodes // 2)
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def find(self, values):
+        """Returns the leaf indices whose cumulative priority range contains `values`."""
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        for _ in range(self.depth):
+            left = self.tree[2 * nodes]
+            go_right = values > left
+            values -= left * go_right
+            nodes = 2 * nodes + go_right
+        return nodes - self.leaves
+
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    """
+    Proportional prioritized replay (Schaul et al., 2016) on top of ReplayBuffer.
+    New transitions get the maximum priority seen so far; `sample` draws one
+    transition per equal-mass segment of the sum tree and returns importance
+    sampling weights; `update_priorities` feeds back the new TD errors.
+    """
+    def __init__(self, capacity, state_dim, alpha=0.6, beta=0.4, epsilon=1e-6, **kwargs):
+        super().__init__(capacity, state_dim, **kwargs)
+        self.alpha = alpha
+        self.beta = beta
+        self.epsilon = epsilon
+        self.tree = SumTree(capacity)
+        self.max_priority = 1.0
+
+    def add(self, state, action, reward, next_state, done):
+        i = super().add(state, action, reward, next_state, done)
+        self.tree.update([i], self.max_priority ** self.alpha)
+        return i
+
+    def add_batch(self, states, actions, rewards, next_states, dones):
+        indices = super().add_batch(states, actions, rewards, next_states, dones)
+        self.tree.update(indices, self.max_priority ** self.alpha)
+        return indices
+
+    def sample(self, batch_size, beta=None):
+        """
+        Returns the batch columns plus "indices" (for update_priorities) and
+        "weights" (importance sampling weights normalised to a maximum of 1).
+        """
+        if self.size == 0:
+            raise ValueError("Cannot sample from an empty replay buffer.")
+        beta = self.beta if beta is None else beta
+        total = self.tree.total
+        bounds = (np.arange(batch_size) + self.rng.random(batch_size)) * (total / batch_size)
+        indices = np.minimum(self.tree.find(bounds), self.size - 1)
+        probabilities = self.tree[indices] / total
+        weights = (self.size * probabilities) ** -beta
+        batch = self.gather(indices)
+        batch["indices"] = indices
+        batch["weights"] = weights / weights.max()
+        return batch
+
+    def update_priorities(self, indices, td_errors):
+        priorities = np.abs(np.asarray(td_errors, dtype=np.float64)) + self.epsilon
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        self.tree.update(indices, priorities ** self.alpha)
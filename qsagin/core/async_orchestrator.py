@@ -0,0 +1,105 @@
+# File: qsagin/core/async_orchestrator.py
+import asyncio
+
+from .log import get_logger
+from .orchestrator import SimulatorError
+from .state import split_action
+from ..agents.base_agent import as_async_agent
+from ..simulators.base_simulator import as_async_simulator
+
+logger = get_logger("orchestrator.async")
+
+
+class AsyncOrchestrator:
+    """
+    Drives many (classical, quantum) environment pairs on a single asyncio event
+    loop. Each environment runs the same loop as the Orchestrator; while one waits
+    for ns-3 or a remote agent, the others make progress, so I/O-bound scenarios
+    get high concurrency without a process per environment.
+
+    Synchronous simulators and agents are wrapped automatically (see
+    SyncSimulatorAdapter / SyncAgentAdapter); a single agent is shared by all
+    environments.
+    """
+    def __init__(self, envs, agent):
+        """
+        Args:
+            envs (list): (classical_sim, quantum_sim) pairs, sync or async.
+            agent: A BaseAgent or AsyncBaseAgent.
+        """
+        self.envs = [(as_async_simulator(c), as_async_simulator(q)) for c, q in envs]
+        self.agent = as_async_agent(agent)
+        logger.info("AsyncOrchestrator created with %d environments.", len(self.envs))
+
+    async def _both(self, phase, classical_call, quantum_call):
+        """Awaits one call per simulator; like Orchestrator._dispatch, waits for both before raising."""
+        results = await asyncio.gather(classical_call, quantum_call, return_exceptions=True)
+        errors = {name: result for name, result in zip(("classical", "quantum"), results)
+                  if isinstance(result, BaseException)}
+        if errors:
+            raise SimulatorError(phase, errors) from next(iter(errors.values()))
+        return results
+
+    async def _get_global_state(self, classical_sim, quantum_sim):
+        classical_state, quantum_state = await self._both(
+            "get_state", classical_sim.get_state(), quantum_sim.get_state())
+        return {"classical": classical_state, "quantum": quantum_state}
+
+    async def _run_env(self, index, num_steps):
+        """Runs one environment for up to `num_steps` steps; returns its episode summary."""
+        classical_sim, quantum_sim = self.envs[index]
+        await self._both("reset", classical_sim.reset(), quantum_sim.reset())
+        state = await self._get_global_state(classical_sim, quantum_sim)
+
+        total_reward = 0.0
+        done = False
+        t = 0
+        while t < num_steps and not done:
+            action = await self.agent.get_action(state)
+            classical_action, quantum_action = split_action(action)
+            (_, c_reward, c_done, _), (_, q_reward, q_done, _) = await self._both(
+                "step", classical_sim.step(classical_action), quantum_sim.step(quantum_action))
+            next_state = await self._get_global_state(classical_sim, quantum_sim)
+            reward = c_reward + q_reward
+            done = bool(c_done or q_done)
+            await self.agent.learn(state, action, reward, next_state, done)
+            state = next_state
+            total_reward += reward
+            t += 1
+        logger.debug("Environment %d finished after %d steps (reward %.4f).", index, t, total_reward)
+        return {"steps": t, "total_reward": total_reward, "done": done}
+
+    async def run(self, num_steps):
+        """
+        Runs every environment for up to `num_steps` steps (one episode) concurrently
+        and returns their summaries in environment order. If one environment fails,
+        the others are cancelled and the error is re-raised.
+        """
+        logger.info("=== Starting Async Simulation Run ===")
+        tasks = [asyncio.ensure_future(self._run_env(i, num_steps)) for i in range(len(self.envs))]
+        finished, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        for index, task in enumerate(tasks):
+            if task in finished and task.exception() is not None:
+                logger.error("Environment %d failed: %s", index, task.exception())
+                raise task.exception()
+        logger.info("=" * 15 + " Async Simulation Finished " + "=" * 15)
+        return [task.result() for task in tasks]
+
+    async def close(self):
+        for classical_sim, quantum_sim in self.envs:
+            await classical_sim.close()
+            await quantum_sim.close()
+        await self.agent.close()
+
+    def run_sync(self, num_steps):
+        """Convenience wrapper running `run` and `close` on a fresh event loop."""
+        async def main():
+            try:
+                return await self.run(num_steps)
+            finally:
+                await self.close()
+        return asyncio.run(main())
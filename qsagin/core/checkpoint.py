@@ -0,0 +1,208 @@
+# File: qsagin/core/checkpoint.py
+import glob
+import io
+import os
+import pickle
+import random
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .log import get_logger
+
+logger = get_logger("checkpoint")
+
+CHECKPOINT_VERSION = 1
+_PATTERN = "checkpoint_{step:010d}.pkl"
+ACTION_LOG = "actions.log"
+
+
+def capture_global_rng():
+    """Returns the state of numpy's and Python's global random generators."""
+    return {"numpy": np.random.get_state(), "python": random.getstate()}
+
+
+def restore_global_rng(state):
+    np.random.set_state(state["numpy"])
+    random.setstate(state["python"])
+
+
+def list_checkpoints(directory):
+    """Checkpoint files of `directory`, oldest first."""
+    return sorted(glob.glob(os.path.join(directory, "checkpoint_*.pkl")))
+
+
+def load_checkpoint(path):
+    """
+    Loads a checkpoint written by CheckpointManager.
+
+    Args:
+        path (str): A checkpoint file, or a directory (its latest checkpoint is used).
+
+    Returns:
+        dict: The checkpoint payload (see Orchestrator.run).
+    """
+    if os.path.isdir(path):
+        checkpoints = list_checkpoints(path)
+        if not checkpoints:
+            raise FileNotFoundError(f"No checkpoint found in {path}.")
+        path = checkpoints[-1]
+    with open(path, "rb") as f:
+        payload = pickle.load(f)
+    if payload.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {payload.get('version')} in {path}.")
+    logger.info("Loaded checkpoint %s (step %d).", path, payload["step"])
+    return payload
+
+
+def read_action_log(log):
+    """
+    Reads the actions referenced by a checkpoint's "action_log" entry
+    ({"path", "log_id", "end"}): every action logged up to the checkpoint.
+    """
+    with open(log["path"], "rb") as f:
+        data = f.read(log["end"])
+    stream = io.BytesIO(data)
+    header = pickle.load(stream)
+    if header.get("log_id") != log["log_id"]:
+        raise ValueError(f"{log['path']} was overwritten by a later run; the checkpoint cannot be replayed.")
+    actions = []
+    while stream.tell() < len(data):
+        actions.append(pickle.load(stream))
+    return actions
+
+
+class CheckpointManager:
+    """
+    Periodic checkpoints of an Orchestrator run.
+
+    The payload is pickled on the calling thread, so it is a consistent snapshot of
+    the step it was taken at; writing, fsync and rotation happen on a background
+    thread. Files are written to a temporary name and renamed, so a crash never
+    leaves a partial checkpoint behind. If the previous write is still in flight
+    when the next checkpoint is due, `save` waits for it (the loop only blocks when
+    the disk is slower than the checkpoint interval).
+
+    Simulators without snapshots are restored by replaying the episode's actions.
+    For those runs the actions are appended to an action log in the directory as
+    they are taken, and each checkpoint only stores the log's current offset, so a
+    checkpoint costs the same at step 100 and at step 100,000.
+    """
+    def __init__(self, directory, every=1000, keep=3):
+        """
+        Args:
+            directory (str): Directory holding the checkpoint files.
+            every (int): Checkpoint interval in orchestrator steps.
+            keep (int): Number of most recent checkpoints kept on disk.
+        """
+        self.directory = directory
+        self.every = every
+        self.keep = keep
+        self.last_step = 0
+        self.saved = 0
+        self.last_save_seconds = 0.0
+        os.makedirs(directory, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="qsagin-checkpoint")
+        self._pending = None
+        self.action_log_path = os.path.abspath(os.path.join(directory, ACTION_LOG))
+        self._action_log = None
+        self._log_id = None
+
+    @property
+    def logging_actions(self):
+        return self._action_log is not None
+
+    def start_episode(self, log_actions, actions=()):
+        """
+        Starts checkpointing a new episode. With `log_actions` the action log is
+        restarted, pre-filled with `actions` (the replayed prefix when resuming).
+        Checkpoints of an earlier run that used the log can no longer be replayed.
+        """
+        self.wait()
+        self._close_action_log()
+        if not log_actions:
+            return
+        self._log_id = uuid.uuid4().hex
+        self._action_log = open(self.action_log_path, "wb")
+        pickle.dump({"log_id": self._log_id}, self._action_log, protocol=pickle.HIGHEST_PROTOCOL)
+        for action in actions:
+            self.log_action(action)
+
+    def log_action(self, action):
+        pickle.dump(action, self._action_log, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _action_log_entry(self):
+        if self._action_log is None:
+            return None
+        self._action_log.flush()
+        return {"path": self.action_log_path, "log_id": self._log_id, "end": self._action_log.tell()}
+
+    def _close_action_log(self):
+        if self._action_log is not None:
+            self._action_log.close()
+            self._action_log = None
+
+    def due(self, step):
+        return self.every > 0 and step - self.last_step >= self.every
+
+    def save(self, step, payload):
+        """Serializes `payload` now and writes it to disk in the background."""
+        start = time.perf_counter()
+        action_log = self._action_log_entry()
+        blob = pickle.dumps(dict(payload, version=CHECKPOINT_VERSION, step=step, action_log=action_log),
+                            protocol=pickle.HIGHEST_PROTOCOL)
+        self.wait()
+        log_fd = self._action_log.fileno() if action_log is not None else None
+        self._pending = self._executor.submit(self._write, step, blob, log_fd)
+        self.last_step = step
+        self.last_save_seconds = time.perf_counter() - start
+        logger.debug("Checkpoint at step %d serialized (%d bytes, %.1f ms).",
+                     step, len(blob), self.last_save_seconds * 1e3)
+
+    def _write(self, step, blob, log_fd=None):
+        path = os.path.join(self.directory, _PATTERN.format(step=step))
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            if log_fd is not None:
+                # The logged actions must be durable before the checkpoint pointing at them.
+                os.fsync(log_fd)
+            with os.fdopen(fd, "wb") as f:
+                f.write(blob)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except Exception:
+            logger.exception("Writing checkpoint %s failed.", path)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self.saved += 1
+        for old in list_checkpoints(self.directory)[:-self.keep]:
+            os.remove(old)
+        logger.info("Checkpoint written: %s", path)
+
+    def wait(self):
+        """Blocks until the checkpoint being written (if any) is on disk."""
+        if self._pending is not None:
+            self._pending.result()
+            self._pending = None
+
+    def latest(self):
+        """Path of the most recent checkpoint, or None."""
+        self.wait()
+        checkpoints = list_checkpoints(self.directory)
+        return checkpoints[-1] if checkpoints else None
+
+    def close(self):
+        self.wait()
+        self._close_action_log()
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,71 @@
+# File: qsagin/core/log.py
+import logging
+import sys
+from collections import deque
+
+ROOT_LOGGER_NAME = "qsagin"
+DEFAULT_FORMAT = "%(asctime)s %(levelname)-7s [%(name)s] %(message)s"
+
+
+def get_logger(component):
+    """
+    Returns the logger of a framework component, e.g. get_logger("orchestrator")
+    -> "qsagin.orchestrator". Components can be tuned individually through
+    `configure_logging(components=...)`.
+
+    Hot-loop call sites pass arguments %-style (logger.debug("x=%s", x)) so that no
+    string formatting happens when the level is disabled.
+    """
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{component}")
+
+
+def configure_logging(level="INFO", components=None, stream=None, fmt=DEFAULT_FORMAT):
+    """
+    Configures the framework's log output. Calling it again replaces the previous
+    configuration.
+
+    Args:
+        level (str or int): Default level for every qsagin component.
+        components (dict): (Optional) Per-component overrides, e.g.
+                           {"orchestrator": "DEBUG", "simulators.sequence": "WARNING"}.
+        stream: (Optional) Output stream, defaults to stdout.
+        fmt (str): logging format string.
+
+    Returns:
+        logging.Logger: The root "qsagin" logger.
+    """
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    for handler in list(root.handlers):
+        if getattr(handler, "_qsagin_handler", False):
+            root.removeHandler(handler)
+    handler = logging.StreamHandler(stream or sys.stdout)
+    handler.setFormatter(logging.Formatter(fmt))
+    handler._qsagin_handler = True
+    root.addHandler(handler)
+    root.setLevel(level)
+    root.propagate = False
+    for name, component_level in (components or {}).items():
+        get_logger(name).setLevel(component_level)
+    return root
+
+
+class StepRingBuffer:
+    """
+    Bounded buffer of the most recent per-step records. Recording a step is a single
+    deque append, so it can stay enabled in production runs; the buffer is dumped to
+    the log when a run fails.
+    """
+    def __init__(self, capacity=1000):
+        self.records = deque(maxlen=capacity)
+
+    def record(self, **fields):
+        self.records.append(fields)
+
+    def clear(self):
+        self.records.clear()
+
+    def dump(self, logger, level=logging.ERROR):
+        """Writes the buffered records to `logger`, oldest first."""
+        logger.log(level, "Last %d step records:", len(self.records))
+        for record in self.records:
+            logger.log(level, "  %s", record)
@@ -1,4 +1,28 @@
 # File: qsagin/core/orchestrator.py
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+from .checkpoint import capture_global_rng, load_checkpoint, read_action_log, restore_global_rng
+from .log import get_logger
+from .state import StateBuffer, split_action
+from ..agents.base_agent import BaseAgent, RandomAgent
+
+logger = get_logger("orchestrator")
+
+_NO_PHASE = nullcontext()
+
+
+class SimulatorError(RuntimeError):
+    """
+    Raised in concurrent mode when one or both simulators fail during the same phase.
+    `errors` maps the simulator name ("classical" / "quantum") to its exception.
+    """
+    def __init__(self, phase, errors):
+        self.phase = phase
+        self.errors = errors
+        details = "; ".join(f"{name}: {type(exc).__name__}: {exc}" for name, exc in errors.items())
+        super().__init__(f"Simulator failure during {phase} -> {details}")
+
 
 class Orchestrator:
     """
@@ -6,72 +30,373 @@ class Orchestrator:
     It manages the simulation loop, coordinates the simulators (classical and quantum),
     and communicates with the AI agent.
     """
-    def __init__(self, classical_sim, quantum_sim, agent):
+    def __init__(self, classical_sim, quantum_sim, agent, concurrent=False, step_buffer=None,
+                 profiler=None, recorder=None, checkpoint=None, state_buffers=False):
         """
         Initializes the Orchestrator with dependency injection.
+
+        Args:
+            concurrent (bool): If True, the classical and quantum simulators are stepped
+                               (and queried for their state) in parallel threads, so a
+                               step costs max(classical, quantum) instead of their sum.
+            step_buffer (StepRingBuffer): (Optional) Keeps the most recent step records,
+                                          which are dumped to the log if the run fails.
+            profiler (StepProfiler): (Optional) Records per-phase latencies and runs
+                                     its hooks around every phase of the loop.
+            recorder (TrajectoryRecorder): (Optional) Streams every transition to disk.
+            checkpoint (CheckpointManager): (Optional) Saves periodic checkpoints that
+                                            `resume_from` can continue from.
+
+        Agents with `action_repeat` > 1 or their own `get_action_chunk` are run in
+        chunked mode: every iteration executes a whole action chunk with one
+        `step_chunk` call per simulator (see NS3Simulator.step_chunk).
+
+            state_buffers (bool): If True and both simulators declare a `state_spec()`,
+                                  states are written into two preallocated StateBuffers
+                                  used alternately (the current state and the next one)
+                                  instead of building new dicts every step. Only enable
+                                  it for agents that copy the states they keep: a buffer
+                                  is overwritten two states later.
         """
-        print("Orchestrator is being created...")
+        logger.info("Orchestrator is being created...")
         self.classical_sim = classical_sim
         self.quantum_sim = quantum_sim
         self.agent = agent
+        self.concurrent = concurrent
+        self.step_buffer = step_buffer
+        self.profiler = profiler
+        self.recorder = recorder
+        self.checkpoint = checkpoint
+        self.state_buffers = state_buffers
+        self._executor = None
+        self._state_buffers = None
+        self._next_buffer = 0
+        self.chunked = (getattr(agent, "action_repeat", 1) > 1
+                        or getattr(type(agent), "get_action_chunk", BaseAgent.get_action_chunk)
+                        is not BaseAgent.get_action_chunk)
+
+    @classmethod
+    def from_config(cls, config, agent=None, **kwargs):
+        """
+        Builds an Orchestrator from a scenario config (see scripts/run_simulation.py).
+
+        The simulator backends are chosen by the "backend" key of the
+        "classical_network" / "quantum_network" sections (default "ns3" and
+        "sequence"; see qsagin.simulators.registry) and wrapped in LazySimulator,
+        so neither ns3gym nor SeQUeNCo is imported, and ns-3 is not contacted,
+        before the run starts.
+
+        Args:
+            config (dict): Scenario config.
+            agent (BaseAgent): (Optional) Agent to use; defaults to a RandomAgent
+                               built from the "agent" section.
+            **kwargs: Forwarded to the constructor (concurrent, profiler, ...).
+        """
+        from ..simulators.registry import DEFAULT_BACKENDS, create_simulator
+
+        simulators = {}
+        for role in ("classical", "quantum"):
+            sim_config = dict(config.get(f"{role}_network", {}))
+            backend = sim_config.pop("backend", DEFAULT_BACKENDS[role])
+            simulators[role] = create_simulator(backend, sim_config, role=role, lazy=True)
+        if agent is None:
+            agent_config = config.get("agent", {})
+            agent = RandomAgent(num_quantum_links=agent_config.get("action_space_size", 5),
+                                seed=agent_config.get("seed"))
+        return cls(simulators["classical"], simulators["quantum"], agent, **kwargs)
+
+    def _phase(self, name):
+        """Returns the profiler's timing context for `name`, or a no-op context."""
+        if self.profiler is None:
+            return _NO_PHASE
+        return self.profiler.phase(name)
+
+    def _timed(self, name, func, *args):
+        with self._phase(name):
+            return func(*args)
+
+    def _dispatch(self, phase, classical_call, quantum_call):
+        """
+        Runs one call per simulator and returns (classical_result, quantum_result).
+        In concurrent mode both calls are submitted to a 2-thread pool; results are
+        always returned in the same order, so the outcome does not depend on which
+        simulator finishes first.
+        """
+        if not self.concurrent:
+            return classical_call(), quantum_call()
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="qsagin-sim")
+        futures = {
+            "classical": self._executor.submit(classical_call),
+            "quantum": self._executor.submit(quantum_call),
+        }
+        # Wait for both calls before reporting, so an error in one simulator never
+        # leaves the other one running in the background.
+        errors = {name: future.exception() for name, future in futures.items()}
+        errors = {name: exc for name, exc in errors.items() if exc is not None}
+        if errors:
+            raise SimulatorError(phase, errors) from next(iter(errors.values()))
+        return futures["classical"].result(), futures["quantum"].result()
+
+    def close(self):
+        """Shuts down the worker threads used in concurrent mode and waits for pending checkpoints."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self.checkpoint is not None:
+            self.checkpoint.wait()
         
     def _get_global_state(self):
         """
         A private method to collect and aggregate the state from all simulators.
         """
+        with self._phase("get_state"):
+            classical_state, quantum_state = self._dispatch(
+                "get_state", self.classical_sim.get_state, self.quantum_sim.get_state)
+        return self._make_state(classical_state, quantum_state)
+
+    def _make_state(self, classical_state, quantum_state):
+        """Builds a global state from two observations, in the next StateBuffer if enabled."""
+        if self._state_buffers is not None:
+            state = self._state_buffers[self._next_buffer]
+            self._next_buffer ^= 1
+            state.write("classical", classical_state)
+            state.write("quantum", quantum_state)
+            return state
         state = {
-            "classical": self.classical_sim.get_state(),
-            "quantum": self.quantum_sim.get_state(),
+            "classical": classical_state,
+            "quantum": quantum_state,
         }
         return state
 
+    def _allocate_state_buffers(self):
+        """Preallocates the double state buffers if enabled and both simulators declare a schema."""
+        if not self.state_buffers:
+            self._state_buffers = None
+            return
+        specs = {
+            "classical": getattr(self.classical_sim, "state_spec", lambda: None)(),
+            "quantum": getattr(self.quantum_sim, "state_spec", lambda: None)(),
+        }
+        if any(spec is None for spec in specs.values()):
+            self._state_buffers = None
+            return
+        self._state_buffers = (StateBuffer(specs), StateBuffer(specs))
+        self._next_buffer = 0
+        logger.debug("Using preallocated state buffers of %d values.", self._state_buffers[0].flat.size)
+
+    def _step(self, t, num_steps, state):
+        """Runs one iteration of the loop and returns (next_state, done)."""
+        logger.debug("===== Time Step %d/%d =====", t + 1, num_steps)
+        
+        # 3. The agent observes the current state and decides on an action.
+        with self._phase("get_action"):
+            action = self.agent.get_action(state)
+        logger.debug("Agent decided action -> %s", action)
+        if self.checkpoint is not None and self.checkpoint.logging_actions:
+            self.checkpoint.log_action(action)
+        
+        # 4. Dispatch actions and execute a step in each simulator.
+        classical_action, quantum_action = split_action(action)
+        
+        # The `step` method returns (next_observation, reward, done, info)
+        (c_next_obs, c_reward, c_done, c_info), (q_next_obs, q_reward, q_done, q_info) = self._dispatch(
+            "step",
+            lambda: self._timed("classical_step", self.classical_sim.step, classical_action),
+            lambda: self._timed("quantum_step", self.quantum_sim.step, quantum_action),
+        )
+        
+        # 5. Aggregate results from all simulators.
+        next_state = self._get_global_state()
+        total_reward = c_reward + q_reward 
+        done = c_done or q_done
+        
+        logger.debug("Step resulted in total reward -> %.4f", total_reward)
+        if self.step_buffer is not None:
+            self.step_buffer.record(step=t + 1, action=action, reward=total_reward, done=done)
+        
+        # 6. (Optional) Allow the agent to learn.
+        with self._phase("learn"):
+            self.agent.learn(state, action, total_reward, next_state, done)
+        if self.recorder is not None:
+            self.recorder.record(state, action, total_reward, next_state, done)
+        
+        return next_state, done
+
+    def _step_chunk(self, t, num_steps, state):
+        """
+        Runs one action chunk and returns (next_state, done, steps_taken). The agent
+        still learns from (and the recorder stores) every individual step; the
+        intermediate states are built from the observations returned by step_chunk,
+        with the same type (dict or StateBuffer) as the other states.
+        """
+        logger.debug("===== Time Step %d/%d (chunk) =====", t + 1, num_steps)
+        with self._phase("get_action"):
+            actions = list(self.agent.get_action_chunk(state))[:num_steps - t]
+        logger.debug("Agent decided action chunk -> %s", actions)
+        classical_actions, quantum_actions = zip(*(split_action(action) for action in actions))
+
+        (c_obs, c_rewards, c_dones, c_infos), (q_obs, q_rewards, q_dones, q_infos) = self._dispatch(
+            "step",
+            lambda: self._timed("classical_step", self.classical_sim.step_chunk, list(classical_actions)),
+            lambda: self._timed("quantum_step", self.quantum_sim.step_chunk, list(quantum_actions)),
+        )
+        # Each simulator stops at its own end of episode; the chunk ends with the first.
+        steps = min(len(c_rewards), len(q_rewards))
+        if self.checkpoint is not None and self.checkpoint.logging_actions:
+            for action in actions[:steps]:
+                self.checkpoint.log_action(action)
+        with self._phase("get_state"):
+            final_obs = self._dispatch("get_state", self.classical_sim.get_state, self.quantum_sim.get_state)
+
+        done = False
+        for i in range(steps):
+            if i == steps - 1:
+                next_state = self._make_state(*final_obs)
+            else:
+                next_state = self._make_state(c_obs[i], q_obs[i])
+            reward = c_rewards[i] + q_rewards[i]
+            done = bool(c_dones[i] or q_dones[i])
+            if self.step_buffer is not None:
+                self.step_buffer.record(step=t + i + 1, action=actions[i], reward=reward, done=done)
+            with self._phase("learn"):
+                self.agent.learn(state, actions[i], reward, next_state, done)
+            if self.recorder is not None:
+                self.recorder.record(state, actions[i], reward, next_state, done)
+            state = next_state
+        logger.debug("Chunk of %d steps resulted in total reward -> %.4f",
+                     steps, float(sum(c_rewards[:steps]) + sum(q_rewards[:steps])))
+        return state, done, steps
+
+    def _save_checkpoint(self, t, num_steps):
+        """
+        Checkpoints the run after `t` steps: progress, the agent (parameters and RNG),
+        the global RNGs and a snapshot of each simulator that supports one (None
+        otherwise). The actions needed to replay the others are in the checkpoint
+        manager's action log.
+        """
+        with self._phase("checkpoint"):
+            simulators = {
+                "classical": getattr(self.classical_sim, "snapshot", lambda: None)(),
+                "quantum": getattr(self.quantum_sim, "snapshot", lambda: None)(),
+            }
+            if not self.checkpoint.logging_actions and None in simulators.values():
+                logger.warning("A simulator returned no snapshot at step %d and no action log is kept; "
+                               "this checkpoint cannot be resumed.", t)
+            self.checkpoint.save(t, {
+                "num_steps": num_steps,
+                "agent": self.agent.snapshot(),
+                "simulators": simulators,
+                "rng": capture_global_rng(),
+            })
+
+    def _needs_action_log(self):
+        """True if a simulator cannot snapshot its state and must be replayed on resume."""
+        return not all(getattr(sim, "supports_snapshot", lambda: False)()
+                       for sim in (self.classical_sim, self.quantum_sim))
+
+    def _loop(self, t, num_steps, state):
+        """Runs the loop from step `t` (with the current global `state`) to `num_steps`."""
+        try:
+            while t < num_steps:
+                if self.profiler is not None:
+                    self.profiler.step = t + 1
+                with self._phase("step"):
+                    if self.chunked:
+                        next_state, done, steps = self._step_chunk(t, num_steps, state)
+                    else:
+                        next_state, done = self._step(t, num_steps, state)
+                        steps = 1
+                t += steps
+                
+                # 7. Update the state for the next iteration.
+                state = next_state
+                
+                # 8. If the episode is finished, end the loop.
+                if done:
+                    logger.info("--- Episode finished at step %d ---", t)
+                    break
+                if self.checkpoint is not None and self.checkpoint.due(t):
+                    self._save_checkpoint(t, num_steps)
+        except Exception:
+            logger.exception("Simulation run failed at step %d.", t + 1)
+            if self.step_buffer is not None:
+                self.step_buffer.dump(logger)
+            raise
+        finally:
+            if self.recorder is not None:
+                self.recorder.flush()
+            self.close()
+            
+        logger.info("=" * 17 + " Simulation Finished " + "=" * 17)
+
     def run(self, num_steps):
         """
         Executes the main simulation loop for a given number of steps.
         """
-        print("=== Starting Simulation Run ===")
+        logger.info("=== Starting Simulation Run ===")
         
         # 1. Reset all environments to their initial states.
         # The `reset` methods now correctly return two values: (observation, info_dictionary).
-        print("Resetting classical simulator...")
+        logger.info("Resetting classical simulator...")
         c_obs, c_info = self.classical_sim.reset()
-        print("Resetting quantum simulator...")
+        logger.info("Resetting quantum simulator...")
         q_obs, q_info = self.quantum_sim.reset()
+        if self.checkpoint is not None:
+            self.checkpoint.last_step = 0
+            self.checkpoint.start_episode(self._needs_action_log())
         
         # 2. Get the initial global state after resetting.
+        self._allocate_state_buffers()
         state = self._get_global_state()
-        
-        for t in range(num_steps):
-            print(f"\n" + "="*15 + f" Time Step {t + 1}/{num_steps} " + "="*15)
-            
-            # 3. The agent observes the current state and decides on an action.
-            action = self.agent.get_action(state)
-            print(f"[Orchestrator] Agent decided action -> {action}")
-            
-            # 4. Dispatch actions and execute a step in each simulator.
-            classical_action = action.get("classical", action.get("quantum"))
-            quantum_action = action.get("quantum")
-            
-            # The `step` method returns (next_observation, reward, done, info)
-            c_next_obs, c_reward, c_done, c_info = self.classical_sim.step(classical_action)
-            q_next_obs, q_reward, q_done, q_info = self.quantum_sim.step(quantum_action)
-            
-            # 5. Aggregate results from all simulators.
-            next_state = self._get_global_state()
-            total_reward = c_reward + q_reward 
-            done = c_done or q_done
-            
-            print(f"[Orchestrator] Step resulted in total reward -> {total_reward:.4f}")
-            
-            # 6. (Optional) Allow the agent to learn.
-            self.agent.learn(state, action, total_reward, next_state, done)
-            
-            # 7. Update the state for the next iteration.
-            state = next_state
-            
-            # 8. If the episode is finished, end the loop.
-            if done:
-                print(f"--- Episode finished at step {t + 1} ---")
-                break
-            
-        print("\n" + "="*17 + " Simulation Finished " + "="*17)
+        self._loop(0, num_steps, state)
+
+    def resume_from(self, checkpoint, num_steps=None):
+        """
+        Continues a run from a checkpoint written by `self.checkpoint` (or any
+        CheckpointManager), given as a payload, a file or a checkpoint directory.
+
+        Simulators with a snapshot are restored directly; the others (e.g. ns-3) are
+        reset and replay the actions taken since the start of the episode, which
+        reproduces their state when the backend is seeded. The agent and the global
+        RNGs are then restored, so the remaining steps are the same as in an
+        uninterrupted run. Recorders and step buffers are not part of checkpoints.
+
+        Args:
+            checkpoint (dict or str): Checkpoint payload, file or directory.
+            num_steps (int): (Optional) Total number of steps; defaults to the
+                             value of the checkpointed run.
+        """
+        if not isinstance(checkpoint, dict):
+            checkpoint = load_checkpoint(checkpoint)
+        t = checkpoint["step"]
+        if num_steps is None:
+            num_steps = checkpoint["num_steps"]
+        logger.info("=== Resuming Simulation Run at step %d/%d ===", t, num_steps)
+
+        logged_actions = []
+        if checkpoint["action_log"] is not None:
+            logged_actions = read_action_log(checkpoint["action_log"])
+        actions = [split_action(action) for action in logged_actions]
+        for index, (name, sim) in enumerate((("classical", self.classical_sim), ("quantum", self.quantum_sim))):
+            snapshot = checkpoint["simulators"][name]
+            if snapshot is not None:
+                sim.restore(snapshot)
+                continue
+            if checkpoint["action_log"] is None:
+                raise RuntimeError(f"The checkpoint has neither a snapshot of the {name} simulator "
+                                   "nor an action log to replay it.")
+            logger.info("Replaying %d actions on the %s simulator...", len(actions), name)
+            sim.reset()
+            for action in actions:
+                sim.step(action[index])
+        self.agent.restore(checkpoint["agent"])
+        restore_global_rng(checkpoint["rng"])
+        if self.checkpoint is not None:
+            self.checkpoint.last_step = t
+            self.checkpoint.start_episode(self._needs_action_log(), logged_actions)
+
+        self._allocate_state_buffers()
+        state = self._get_global_state()
+        self._loop(t, num_steps, state)
@@ -0,0 +1,173 @@
+# File: qsagin/core/profiling.py
+import cProfile
+import csv
+import json
+import math
+import os
+import threading
+import time
+
+# Log-spaced latency buckets: BUCKETS_PER_DECADE per power of ten from 100 ns up to
+# ~1000 s. Each sample costs one log10 and one list increment.
+BUCKETS_PER_DECADE = 20
+MIN_LATENCY_NS = 100
+NUM_BUCKETS = 10 * BUCKETS_PER_DECADE
+
+
+class LatencyHistogram:
+    """
+    Fixed-size latency histogram with log-spaced buckets. Memory does not grow with
+    the number of samples; percentiles are accurate to one bucket (~12%).
+    """
+    def __init__(self):
+        self.counts = [0] * NUM_BUCKETS
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+
+    def record(self, duration_ns):
+        self.count += 1
+        self.total_ns += duration_ns
+        if self.min_ns is None or duration_ns < self.min_ns:
+            self.min_ns = duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+        if duration_ns <= MIN_LATENCY_NS:
+            index = 0
+        else:
+            index = min(int(math.log10(duration_ns / MIN_LATENCY_NS) * BUCKETS_PER_DECADE), NUM_BUCKETS - 1)
+        self.counts[index] += 1
+
+    def _bucket_upper_ns(self, index):
+        return MIN_LATENCY_NS * 10 ** ((index + 1) / BUCKETS_PER_DECADE)
+
+    def percentile(self, q):
+        """Returns the q-th percentile (0-100) in nanoseconds, clamped to the observed max."""
+        if self.count == 0:
+            return 0.0
+        rank = math.ceil(q / 100.0 * self.count)
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(self._bucket_upper_ns(index), self.max_ns)
+        return float(self.max_ns)
+
+    def summary(self):
+        """Returns count, mean, p50/p95/p99 and max in milliseconds."""
+        to_ms = 1e-6
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ns / self.count * to_ms if self.count else 0.0,
+            "p50_ms": self.percentile(50) * to_ms,
+            "p95_ms": self.percentile(95) * to_ms,
+            "p99_ms": self.percentile(99) * to_ms,
+            "max_ms": self.max_ns * to_ms,
+        }
+
+
+class _Phase:
+    """Context manager timing one phase with the monotonic perf counter."""
+    __slots__ = ("profiler", "name", "start_ns")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        profiler = self.profiler
+        for hook in profiler.hooks:
+            hook("start", self.name, profiler.step, 0)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration_ns = time.perf_counter_ns() - self.start_ns
+        profiler = self.profiler
+        profiler.record(self.name, duration_ns)
+        for hook in profiler.hooks:
+            hook("end", self.name, profiler.step, duration_ns)
+        return False
+
+
+class StepProfiler:
+    """
+    Collects per-phase latency histograms for the Orchestrator loop.
+
+    The Orchestrator times these phases: "step" (the whole iteration), "get_action",
+    "classical_step", "quantum_step", "get_state" and "learn". Hooks are callables
+    `hook(event, phase, step, duration_ns)` with event "start" or "end"; they run
+    synchronously, and in concurrent mode the simulator phases call them from
+    worker threads.
+    """
+    def __init__(self, hooks=None):
+        self.hooks = list(hooks or [])
+        self.histograms = {}
+        self.step = 0
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+        return hook
+
+    def remove_hook(self, hook):
+        self.hooks.remove(hook)
+
+    def phase(self, name):
+        """Returns a context manager that times `name` for the current step."""
+        return _Phase(self, name)
+
+    def record(self, name, duration_ns):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(name, LatencyHistogram())
+        histogram.record(duration_ns)
+
+    def summary(self):
+        """Returns {phase: {"count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"}}."""
+        return {name: histogram.summary() for name, histogram in self.histograms.items()}
+
+    def to_json(self, path):
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def to_csv(self, path):
+        summary = self.summary()
+        fields = ["phase", "count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"]
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            for name, row in summary.items():
+                writer.writerow(dict(row, phase=name))
+
+
+class CProfileHook:
+    """
+    Hook that runs cProfile around selected steps and dumps one .prof file per step
+    (readable with pstats or snakeviz). Attach it with `profiler.add_hook(...)`.
+    """
+    def __init__(self, steps, output_dir, phase="step"):
+        """
+        Args:
+            steps (iterable): Step numbers (1-based, as reported by the Orchestrator) to profile.
+            output_dir (str): Directory for the `step_<n>.prof` files.
+            phase (str): Phase to wrap; "step" covers the whole loop iteration.
+        """
+        self.steps = set(steps)
+        self.output_dir = output_dir
+        self.phase = phase
+        self._profile = None
+
+    def __call__(self, event, phase, step, duration_ns):
+        if phase != self.phase or step not in self.steps:
+            return
+        if event == "start":
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        elif self._profile is not None:
+            self._profile.disable()
+            os.makedirs(self.output_dir, exist_ok=True)
+            self._profile.dump_stats(os.path.join(self.output_dir, f"step_{step}.prof"))
+            self._profile = None
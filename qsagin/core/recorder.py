@@ -0,0 +1,184 @@
+# File: qsagin/core/recorder.py
+import json
+import os
+import shutil
+
+import numpy as np
+
+from .state import action_pair_row, action_width, as_flat_state
+
+COLUMNS = ("state", "action", "reward", "next_state", "done")
+MANIFEST = "manifest.json"
+
+
+class TrajectoryRecorder:
+    """
+    Streams (state, action, reward, next_state, done) transitions into preallocated
+    columnar chunks and flushes each full chunk to disk as one .npy file per column.
+    Memory is bounded by a single chunk regardless of the run length. Actions are
+    stored as (classical, quantum) pairs in a float64 column of 2 * action_dim
+    entries per row: the classical part, then the quantum part, each flattened and
+    NaN-padded, so link masks and Box actions are kept as well as scalars.
+
+    Layout of `directory`:
+        chunk_000000/state.npy, action.npy, reward.npy, next_state.npy, done.npy
+        chunk_000001/...
+        manifest.json   (updated after every flush)
+    """
+    def __init__(self, directory, chunk_size=4096, state_dtype=np.float32, action_dim=None):
+        """
+        Args:
+            directory (str): Output directory (created if needed). Recording into a
+                             directory that already holds chunks appends to them.
+            chunk_size (int): Number of transitions buffered in memory per chunk.
+            state_dtype: dtype used to store states.
+            action_dim (int): (Optional) Entries per action part, e.g. the number of
+                              links of a link mask. Defaults to the width of the
+                              first recorded action; set it when early actions can
+                              be narrower than later ones.
+        """
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.state_dtype = np.dtype(state_dtype)
+        self.action_dim = action_dim
+        os.makedirs(directory, exist_ok=True)
+        self.manifest = self._load_manifest()
+        self._buffers = None
+        self._fill = 0
+
+    def _load_manifest(self):
+        path = os.path.join(self.directory, MANIFEST)
+        if os.path.exists(path):
+            with open(path) as f:
+                manifest = json.load(f)
+            # Recordings made before vector actions were stored hold scalar pairs.
+            manifest.setdefault("action_dim", 1 if manifest["chunks"] else None)
+            return manifest
+        return {"state_dim": None, "action_dim": None, "state_dtype": self.state_dtype.str, "chunks": []}
+
+    def _allocate(self, state_dim, action_dim):
+        for key, dim in (("state_dim", state_dim), ("action_dim", action_dim)):
+            if self.manifest[key] is None:
+                self.manifest[key] = dim
+            elif self.manifest[key] != dim:
+                raise ValueError(f"{key} changed from {self.manifest[key]} to {dim}.")
+        self._buffers = {
+            "state": np.empty((self.chunk_size, state_dim), dtype=self.state_dtype),
+            "action": np.empty((self.chunk_size, 2 * action_dim), dtype=np.float64),
+            "reward": np.empty(self.chunk_size, dtype=np.float64),
+            "next_state": np.empty((self.chunk_size, state_dim), dtype=self.state_dtype),
+            "done": np.empty(self.chunk_size, dtype=bool),
+        }
+
+    def record(self, state, action, reward, next_state, done):
+        """Appends one transition; flushes automatically when the chunk is full."""
+        flat_state = as_flat_state(state)
+        if self._buffers is None:
+            action_dim = self.action_dim or self.manifest["action_dim"] or action_width(action)
+            self._allocate(flat_state.shape[0], action_dim)
+        i = self._fill
+        buffers = self._buffers
+        buffers["state"][i] = flat_state
+        buffers["next_state"][i] = as_flat_state(next_state)
+        buffers["action"][i] = action_pair_row(action, self.manifest["action_dim"])
+        buffers["reward"][i] = reward
+        buffers["done"][i] = done
+        self._fill += 1
+        if self._fill == self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """Writes the buffered transitions as a new chunk and updates the manifest."""
+        if self._fill == 0:
+            return
+        name = f"chunk_{len(self.manifest['chunks']):06d}"
+        tmp_dir = os.path.join(self.directory, name + ".tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+        for column in COLUMNS:
+            np.save(os.path.join(tmp_dir, f"{column}.npy"), self._buffers[column][:self._fill])
+        final_dir = os.path.join(self.directory, name)
+        if os.path.exists(final_dir):
+            # Left over from a crash between the rename and the manifest update.
+            shutil.rmtree(final_dir)
+        os.replace(tmp_dir, final_dir)
+        self.manifest["chunks"].append({"name": name, "length": self._fill})
+        self._write_manifest()
+        self._fill = 0
+
+    def _write_manifest(self):
+        tmp_path = os.path.join(self.directory, MANIFEST + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.manifest, f)
+        os.replace(tmp_path, os.path.join(self.directory, MANIFEST))
+
+    def close(self):
+        self.flush()
+        self._buffers = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class TrajectoryDataset:
+    """
+    Lazy reader for a TrajectoryRecorder directory. Chunks are opened as memory-mapped
+    arrays on first access, so only the pages that are actually read are loaded.
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, MANIFEST)) as f:
+            self.manifest = json.load(f)
+        lengths = [chunk["length"] for chunk in self.manifest["chunks"]]
+        self.offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        self._open = {}
+
+    def __len__(self):
+        return int(self.offsets[-1])
+
+    @property
+    def action_dim(self):
+        """Entries per action part; the action column has 2 * action_dim columns."""
+        return self.manifest.get("action_dim") or 1
+
+    @property
+    def num_chunks(self):
+        return len(self.manifest["chunks"])
+
+    def chunk(self, index):
+        """Returns {column: memory-mapped array} for one chunk."""
+        arrays = self._open.get(index)
+        if arrays is None:
+            path = os.path.join(self.directory, self.manifest["chunks"][index]["name"])
+            arrays = {column: np.load(os.path.join(path, f"{column}.npy"), mmap_mode="r")
+                      for column in COLUMNS}
+            self._open[index] = arrays
+        return arrays
+
+    def iter_chunks(self):
+        for index in range(self.num_chunks):
+            yield self.chunk(index)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        chunk_index = int(np.searchsorted(self.offsets, index, side="right") - 1)
+        row = index - self.offsets[chunk_index]
+        return {column: array[row] for column, array in self.chunk(chunk_index).items()}
+
+    def sample(self, batch_size, rng=None):
+        """Uniformly samples a batch of transitions; returns {column: ndarray}."""
+        rng = rng or np.random.default_rng()
+        indices = np.sort(rng.integers(0, len(self), size=batch_size))
+        chunk_ids = np.searchsorted(self.offsets, indices, side="right") - 1
+        batch = {column: [] for column in COLUMNS}
+        for chunk_index in np.unique(chunk_ids):
+            rows = indices[chunk_ids == chunk_index] - self.offsets[chunk_index]
+            for column, array in self.chunk(int(chunk_index)).items():
+                batch[column].append(array[rows])
+        return {column: np.concatenate(parts) for column, parts in batch.items()}
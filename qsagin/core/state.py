@@ -0,0 +1,224 @@
+# File: qsagin/core/state.py
+import numpy as np
+
+
+def flatten_observation(obs):
+    """
+    Flattens a single simulator observation into a 1-D float64 array.
+
+    Observations coming from the simulators are heterogeneous: ns3gym returns
+    lists or numpy arrays, SeQUeNCo returns a dict of scalars and mocks may return
+    None. Dict values are flattened in insertion order so that identical simulators
+    always produce the same layout.
+
+    Args:
+        obs: The observation to flatten (None, scalar, sequence, ndarray or dict).
+
+    Returns:
+        np.ndarray: A 1-D float64 array (empty for None).
+    """
+    if obs is None:
+        return np.empty(0, dtype=np.float64)
+    if isinstance(obs, dict):
+        parts = [flatten_observation(value) for value in obs.values()]
+        if not parts:
+            return np.empty(0, dtype=np.float64)
+        return np.concatenate(parts)
+    return np.ravel(np.asarray(obs, dtype=np.float64))
+
+
+def flatten_state(state):
+    """
+    Flattens a global state dict ({"classical": ..., "quantum": ...}) into one array.
+    The classical part always comes first, followed by the quantum part.
+    A StateBuffer is already flat and is returned as its (shared) `flat` view.
+    """
+    if isinstance(state, StateBuffer):
+        return state.flat
+    return np.concatenate([
+        flatten_observation(state.get("classical")),
+        flatten_observation(state.get("quantum")),
+    ])
+
+
+def split_action(action):
+    """
+    Splits an agent action into its (classical, quantum) parts, as done by the
+    orchestrators, recorders and replay buffers. Only dicts and explicit 2-tuples
+    are split; every other action (scalars, but also lists/arrays such as a multi-link
+    selection or mask for SequenceSimulator) is sent unchanged to both simulators.
+    """
+    if isinstance(action, dict):
+        return action.get("classical", action.get("quantum")), action.get("quantum")
+    if isinstance(action, tuple) and len(action) == 2:
+        return action
+    return action, action
+
+
+def as_flat_state(state):
+    """
+    Flattens a global state (dict or StateBuffer) or an already flat observation
+    array (e.g. one row of a VecOrchestrator batch) into a 1-D array.
+    """
+    if isinstance(state, (dict, StateBuffer)):
+        return flatten_state(state)
+    return np.ravel(np.asarray(state, dtype=np.float64))
+
+
+def action_row(action, width, dtype=np.float64):
+    """
+    Flattens one simulator action (a scalar, a link list or mask, a Box array...)
+    into a fixed-width row for columnar storage: `width` entries of `dtype`, padded
+    with NaN (or -1 for integer dtypes). None is an empty action.
+
+    Returns:
+        np.ndarray: The row, or None if the action does not fit (more than `width`
+                    entries, or values `dtype` cannot hold exactly).
+    """
+    dtype = np.dtype(dtype)
+    values = np.ravel(np.asarray([] if action is None else action))
+    if values.size > width:
+        return None
+    row = np.full(width, np.nan if dtype.kind == "f" else -1, dtype=dtype)
+    try:
+        row[:values.size] = values
+    except (TypeError, ValueError):
+        return None
+    if dtype.kind != "f" and not np.array_equal(row[:values.size], values):
+        return None
+    return row
+
+
+def action_width(action):
+    """Number of entries of the widest (classical, quantum) part of an agent action (at least 1)."""
+    return max([np.size(part) for part in split_action(action) if part is not None] + [1])
+
+
+def action_pair_row(action, width):
+    """
+    Stores an agent action as one float64 row of 2 * width entries: its classical
+    part, then its quantum part (see `split_action`), each NaN-padded to `width`.
+
+    Raises:
+        ValueError: If a part has more than `width` entries.
+    """
+    row = np.empty(2 * width, dtype=np.float64)
+    for i, part in enumerate(split_action(action)):
+        values = action_row(part, width)
+        if values is None:
+            raise ValueError(f"Action {part!r} does not fit an action column of width {width}.")
+        row[i * width:(i + 1) * width] = values
+    return row
+
+
+class StateSchema:
+    """
+    Shape/dtype declaration of one simulator observation, returned by
+    `BaseSimulator.state_spec()`.
+
+    A schema is either a single unnamed array (e.g. an ns3gym Box observation) or a
+    record of named fields (e.g. SeQUeNCo's {"key_rate_bps": ...}). Fields keep
+    their declaration order, which matches `flatten_observation`.
+    """
+    def __init__(self, fields):
+        """
+        Args:
+            fields (dict): {name: (shape, dtype)}; the name None denotes a single
+                           unnamed array (see `StateSchema.array`).
+        """
+        self.fields = {name: (tuple(shape), np.dtype(dtype)) for name, (shape, dtype) in fields.items()}
+
+    @classmethod
+    def array(cls, shape, dtype=np.float64):
+        """Schema of a single unnamed array; an integer shape means a 1-D array."""
+        return cls({None: ((int(shape),) if np.ndim(shape) == 0 else shape, dtype)})
+
+    @classmethod
+    def record(cls, **fields):
+        """StateSchema.record(key_rate_bps=((), np.float64), link_key_rate_bps=((3,), np.float64))."""
+        return cls(fields)
+
+    @property
+    def is_array(self):
+        return list(self.fields) == [None]
+
+    @property
+    def size(self):
+        """Number of scalars in one observation."""
+        return sum(int(np.prod(shape)) for shape, _ in self.fields.values())
+
+    @property
+    def dtype(self):
+        """Common dtype all fields can be stored in without loss."""
+        return np.result_type(*(dtype for _, dtype in self.fields.values()))
+
+    def __repr__(self):
+        return f"StateSchema({self.fields})"
+
+
+class StateBuffer:
+    """
+    Preallocated global state laid out as one contiguous flat array.
+
+    Every simulator part ("classical", "quantum") and every schema field is a
+    view into `flat`, so writing an observation is a single in-place copy and
+    agents can use `flat` directly without any per-step allocation. Indexing
+    mirrors the global state dict: `state["classical"]` is the array view of an
+    array schema, `state["quantum"]["key_rate_bps"]` a 0-d view of a record field.
+
+    The Orchestrator reuses two buffers alternately, so a buffer passed to the
+    agent is overwritten two steps later; agents that keep states must copy them.
+    """
+    __slots__ = ("schemas", "flat", "_parts")
+
+    def __init__(self, schemas, dtype=None):
+        """
+        Args:
+            schemas (dict): {part: StateSchema}, in flattening order.
+            dtype: Storage dtype; defaults to the common dtype of all fields.
+        """
+        self.schemas = schemas
+        if dtype is None:
+            dtype = np.result_type(*(schema.dtype for schema in schemas.values()))
+        self.flat = np.zeros(sum(schema.size for schema in schemas.values()), dtype=dtype)
+        self._parts = {}
+        offset = 0
+        for part, schema in schemas.items():
+            views = {}
+            for name, (shape, _) in schema.fields.items():
+                size = int(np.prod(shape))
+                views[name] = self.flat[offset:offset + size].reshape(shape)
+                offset += size
+            self._parts[part] = views[None] if schema.is_array else views
+
+    def write(self, part, obs):
+        """Copies one simulator observation into its views (None leaves them untouched)."""
+        if obs is None:
+            return
+        target = self._parts[part]
+        if isinstance(target, dict):
+            for name, view in target.items():
+                view[...] = obs[name]
+        else:
+            target[...] = obs
+
+    def __getitem__(self, part):
+        return self._parts[part]
+
+    def get(self, part, default=None):
+        return self._parts.get(part, default)
+
+    def keys(self):
+        return self._parts.keys()
+
+    def copy(self):
+        """Returns an independent buffer with the same contents."""
+        other = StateBuffer(self.schemas, self.flat.dtype)
+        other.flat[...] = self.flat
+        return other
+
+    def to_dict(self):
+        """Returns the state as a plain {"classical": ..., "quantum": ...} dict of copies."""
+        return {part: ({name: view.copy() for name, view in value.items()} if isinstance(value, dict)
+                       else value.copy())
+                for part, value in self._parts.items()}
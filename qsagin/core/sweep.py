@@ -0,0 +1,265 @@
+# File: qsagin/core/sweep.py
+import copy
+import hashlib
+import itertools
+import json
+import os
+import time
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from .log import get_logger
+
+logger = get_logger("sweep")
+
+
+def grid_design(space):
+    """
+    Expands a full factorial grid.
+
+    Args:
+        space (dict): {"dotted.config.path": [values, ...]}, e.g.
+                      {"quantum_network.topology.distance": [1e3, 1e4]}.
+
+    Returns:
+        list: One {path: value} dict per grid point, last path varying fastest.
+    """
+    paths = list(space)
+    return [dict(zip(paths, values)) for values in itertools.product(*(space[p] for p in paths))]
+
+
+def random_design(space, num_points, seed=None):
+    """
+    Draws `num_points` random points. Each entry of `space` is either a list (uniform
+    choice), a (low, high) tuple (uniform float) or {"low", "high", "log": True}
+    (log-uniform float).
+    """
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for path, spec in space.items():
+        if isinstance(spec, dict):
+            low, high = spec["low"], spec["high"]
+            if spec.get("log"):
+                columns[path] = np.exp(rng.uniform(np.log(low), np.log(high), num_points))
+            else:
+                columns[path] = rng.uniform(low, high, num_points)
+        elif isinstance(spec, tuple):
+            columns[path] = rng.uniform(spec[0], spec[1], num_points)
+        else:
+            columns[path] = [spec[i] for i in rng.integers(0, len(spec), num_points)]
+    return [{path: _plain(columns[path][i]) for path in space} for i in range(num_points)]
+
+
+def _plain(value):
+    """Converts numpy scalars to plain Python values so points serialise as JSON."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def apply_point(base_config, point):
+    """Returns a deep copy of `base_config` with every dotted path in `point` set."""
+    config = copy.deepcopy(base_config)
+    for path, value in point.items():
+        *parents, leaf = path.split(".")
+        node = config
+        for key in parents:
+            node = node.setdefault(key, {})
+        node[leaf] = value
+    return config
+
+
+def config_hash(config):
+    """Stable SHA-256 of a config (key order and float formatting independent)."""
+    blob = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class SweepStore:
+    """
+    Append-only JSONL result store. Each line is one finished point:
+    {"hash", "point", "result", "elapsed_s"} or {"hash", "point", "error"}.
+    Lines are flushed as they are written, so a killed sweep loses at most the
+    line being written; a truncated last line is ignored when reading.
+    """
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = None
+
+    def records(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning("Ignoring a truncated line in %s.", self.path)
+
+    def completed(self):
+        """Hashes of the points that finished without error."""
+        return {record["hash"] for record in self.records() if "error" not in record}
+
+    def append(self, record):
+        if self._file is None:
+            self._file = open(self.path, "a+")
+            # Terminate a line left truncated by a killed run before appending.
+            if self._file.tell() > 0:
+                self._file.seek(self._file.tell() - 1)
+                if self._file.read(1) != "\n":
+                    self._file.write("\n")
+        self._file.write(json.dumps(record, default=str) + "\n")
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+# quantum_network parameters a warm SequenceSimulator can change on reset (see
+# SequenceSimulator.reconfigure); every other key is part of the simulator's structure.
+SCALAR_PARAMETERS = ("key_size", "num_keys", "attenuation", "topology.distance")
+
+
+def structural_config(quantum_config):
+    """Returns a copy of `quantum_config` without the SCALAR_PARAMETERS."""
+    config = copy.deepcopy(quantum_config)
+    for path in SCALAR_PARAMETERS:
+        *parents, leaf = path.split(".")
+        node = config
+        for key in parents:
+            node = node.get(key, {})
+        node.pop(leaf, None)
+    return config
+
+
+class SweepWorker:
+    """
+    Per-process state of a sweep worker. It keeps the most recently used
+    SequenceSimulators, keyed by the structural part of their config, so points
+    that only differ in scalar parameters (key size, number of keys, attenuation,
+    distance) reconfigure and reset a warm simulator instead of rebuilding it, and
+    the SeQUeNCo import is paid once per process.
+    """
+    def __init__(self, max_simulators=4):
+        self.max_simulators = max_simulators
+        self._simulators = OrderedDict()
+
+    def quantum_simulator(self, quantum_config):
+        """Returns a simulator configured for `quantum_config`; call `reset()` before use."""
+        key = config_hash(structural_config(quantum_config))
+        sim = self._simulators.get(key)
+        if sim is not None:
+            self._simulators.move_to_end(key)
+            sim.reconfigure(copy.deepcopy(quantum_config))
+            return sim
+        from ..simulators.sim_quantum import SequenceSimulator
+        sim = SequenceSimulator(copy.deepcopy(quantum_config))
+        self._simulators[key] = sim
+        if len(self._simulators) > self.max_simulators:
+            self._simulators.popitem(last=False)
+        return sim
+
+
+def evaluate_qkd(config, worker, runs=1, action=0):
+    """
+    Default point evaluator: runs the quantum_network config `runs` times (reset +
+    one step with `action`) and reports the mean/std key rate and mean QBER.
+    """
+    sim = worker.quantum_simulator(config["quantum_network"])
+    key_rates, qbers = [], []
+    for _ in range(runs):
+        sim.reset()
+        sim.step(action)
+        key_rates.append(sim.key_rate_bps)
+        qbers.append(sim.qber)
+    return {
+        "key_rate_bps_mean": float(np.mean(key_rates)),
+        "key_rate_bps_std": float(np.std(key_rates)),
+        "qber_mean": float(np.mean(qbers)),
+        "runs": runs,
+    }
+
+
+_WORKER = None
+
+
+def _init_worker(max_simulators):
+    global _WORKER
+    _WORKER = SweepWorker(max_simulators)
+
+
+def _run_point(evaluate, config, kwargs):
+    """Evaluates one point in the current (worker) process; never raises."""
+    if _WORKER is None:
+        _init_worker(4)
+    start = time.perf_counter()
+    try:
+        result = evaluate(config, _WORKER, **kwargs)
+    except Exception:
+        return {"error": traceback.format_exc()}
+    return {"result": result, "elapsed_s": time.perf_counter() - start}
+
+
+def run_sweep(base_config, design, store_path, evaluate=evaluate_qkd, workers=None,
+              max_simulators=4, **evaluate_kwargs):
+    """
+    Runs every point of `design` and streams the results to `store_path`.
+
+    Points whose config hash is already recorded as completed in the store are
+    skipped, so re-running the same command after a crash resumes the sweep.
+    Failed points are recorded with their traceback and retried on the next run.
+
+    Args:
+        base_config (dict): Scenario config (with "quantum_network" / "classical_network").
+        design (list): {dotted path: value} points (see grid_design / random_design).
+        store_path (str): JSONL results file (appended to).
+        evaluate (callable): `evaluate(config, worker, **evaluate_kwargs)` returning a
+                             JSON-serialisable dict; must be picklable (top-level).
+        workers (int): Number of worker processes; 0 runs in this process.
+        max_simulators (int): Warm SequenceSimulators kept per worker.
+
+    Returns:
+        dict: {"total", "skipped", "completed", "failed"} counts for this run.
+    """
+    store = SweepStore(store_path)
+    done = store.completed()
+    pending = []
+    for point in design:
+        config = apply_point(base_config, point)
+        point_key = config_hash(config)
+        if point_key not in done:
+            done.add(point_key)  # also drops duplicate points within the design
+            pending.append((point_key, point, config))
+    summary = {"total": len(design), "skipped": len(design) - len(pending), "completed": 0, "failed": 0}
+    logger.info("Sweep: %d points, %d already done, %d to run.", len(design), summary["skipped"], len(pending))
+
+    def record(point_key, point, outcome):
+        store.append(dict(outcome, hash=point_key, point=point))
+        if "error" in outcome:
+            summary["failed"] += 1
+            logger.error("Point %s failed:\n%s", point, outcome["error"])
+        else:
+            summary["completed"] += 1
+            logger.info("[%d/%d] %s -> %s", summary["completed"] + summary["failed"], len(pending),
+                        point, outcome["result"])
+
+    try:
+        if workers == 0:
+            _init_worker(max_simulators)
+            for point_key, point, config in pending:
+                record(point_key, point, _run_point(evaluate, config, evaluate_kwargs))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(max_simulators,)) as executor:
+                futures = {executor.submit(_run_point, evaluate, config, evaluate_kwargs): (point_key, point)
+                           for point_key, point, config in pending}
+                for future in as_completed(futures):
+                    record(*futures[future], future.result())
+    finally:
+        store.close()
+    return summary
@@ -0,0 +1,216 @@
+# File: qsagin/core/vec_orchestrator.py
+import multiprocessing as mp
+import traceback
+
+import numpy as np
+
+from .state import flatten_state, split_action
+from .log import get_logger
+
+logger = get_logger("orchestrator.vec")
+
+
+def _reset_pair(classical_sim, quantum_sim):
+    classical_sim.reset()
+    quantum_sim.reset()
+    return {
+        "classical": classical_sim.get_state(),
+        "quantum": quantum_sim.get_state(),
+    }
+
+
+def _worker(remote, parent_remote, env_fn):
+    """
+    Worker process loop. Owns one (classical, quantum) simulator pair and serves
+    commands sent by the VecOrchestrator over a pipe.
+    """
+    parent_remote.close()
+    classical_sim = quantum_sim = None
+    try:
+        classical_sim, quantum_sim = env_fn()
+        while True:
+            cmd, data = remote.recv()
+            if cmd == "step":
+                classical_action, quantum_action = split_action(data)
+                _, c_reward, c_done, c_info = classical_sim.step(classical_action)
+                _, q_reward, q_done, q_info = quantum_sim.step(quantum_action)
+                state = {
+                    "classical": classical_sim.get_state(),
+                    "quantum": quantum_sim.get_state(),
+                }
+                done = bool(c_done or q_done)
+                info = {"classical": c_info, "quantum": q_info}
+                if done:
+                    # Auto-reset: hand back the terminal observation in the info dict
+                    # and the first observation of the next episode as `obs`.
+                    info["terminal_observation"] = flatten_state(state)
+                    state = _reset_pair(classical_sim, quantum_sim)
+                remote.send(("ok", (flatten_state(state), float(c_reward + q_reward), done, info)))
+            elif cmd == "reset":
+                remote.send(("ok", flatten_state(_reset_pair(classical_sim, quantum_sim))))
+            elif cmd == "close":
+                break
+            else:
+                remote.send(("error", f"Unknown command: {cmd}"))
+    except KeyboardInterrupt:
+        pass
+    except Exception:
+        try:
+            remote.send(("error", traceback.format_exc()))
+        except (BrokenPipeError, EOFError):
+            pass
+    finally:
+        for sim in (classical_sim, quantum_sim):
+            if sim is not None and hasattr(sim, "close"):
+                sim.close()
+        remote.close()
+
+
+class VecOrchestrator:
+    """
+    Vectorized counterpart of the Orchestrator.
+    Runs N independent (classical, quantum) simulator pairs in worker processes,
+    steps them in lockstep and returns batched numpy arrays. Environments whose
+    episode ends are reset automatically inside their worker.
+    """
+    def __init__(self, env_fns, agent=None, start_method=None):
+        """
+        Initializes the worker processes.
+
+        Args:
+            env_fns (list): One callable per environment returning a
+                            (classical_sim, quantum_sim) tuple. It is called inside the
+                            worker, so it must be picklable with the 'spawn' method.
+            agent (BaseAgent): (Optional) The agent used by `run`.
+            start_method (str): (Optional) multiprocessing start method
+                                ('fork', 'spawn', 'forkserver').
+        """
+        if not env_fns:
+            raise ValueError("VecOrchestrator requires at least one environment.")
+        logger.info("VecOrchestrator is being created with %d environments...", len(env_fns))
+        self.agent = agent
+        self.num_envs = len(env_fns)
+        self.closed = False
+        self._waiting = False
+
+        ctx = mp.get_context(start_method)
+        self.remotes, work_remotes = zip(*[ctx.Pipe() for _ in range(self.num_envs)])
+        self.processes = []
+        for work_remote, remote, env_fn in zip(work_remotes, self.remotes, env_fns):
+            process = ctx.Process(target=_worker, args=(work_remote, remote, env_fn), daemon=True)
+            process.start()
+            self.processes.append(process)
+            work_remote.close()
+
+    def _recv_all(self):
+        results = []
+        errors = []
+        for i, remote in enumerate(self.remotes):
+            try:
+                status, payload = remote.recv()
+            except EOFError:
+                status, payload = "error", "Worker process exited unexpectedly."
+            if status == "error":
+                errors.append(f"Environment {i}:\n{payload}")
+            results.append(payload)
+        if errors:
+            raise RuntimeError("VecOrchestrator worker failure.\n" + "\n".join(errors))
+        return results
+
+    def reset(self):
+        """
+        Resets every environment.
+
+        Returns:
+            np.ndarray: Batched observations with shape (num_envs, obs_dim).
+        """
+        for remote in self.remotes:
+            remote.send(("reset", None))
+        return np.stack(self._recv_all())
+
+    def step_async(self, actions):
+        """Sends one action to every environment without waiting for the results."""
+        if len(actions) != self.num_envs:
+            raise ValueError(f"Expected {self.num_envs} actions, got {len(actions)}.")
+        for remote, action in zip(self.remotes, actions):
+            remote.send(("step", action))
+        self._waiting = True
+
+    def step_wait(self):
+        """
+        Waits for the results of the last `step_async` call.
+
+        Returns:
+            tuple: (obs, rewards, dones, infos) where obs has shape (num_envs, obs_dim),
+                   rewards is float64 (num_envs,), dones is bool (num_envs,) and infos
+                   is a list of per-environment info dicts.
+        """
+        results = self._recv_all()
+        self._waiting = False
+        obs, rewards, dones, infos = zip(*results)
+        return (np.stack(obs), np.asarray(rewards, dtype=np.float64),
+                np.asarray(dones, dtype=bool), list(infos))
+
+    def step(self, actions):
+        """Steps all environments in lockstep. See `step_wait` for the return value."""
+        self.step_async(actions)
+        return self.step_wait()
+
+    def run(self, num_steps):
+        """
+        Runs the agent against all environments for `num_steps` lockstep iterations.
+        Each iteration makes one `get_actions` and one `learn_batch` call for the
+        whole batch of environments.
+
+        Returns:
+            dict: Summary with the number of transitions, finished episodes and the
+                  mean reward per transition.
+        """
+        if self.agent is None:
+            raise RuntimeError("VecOrchestrator.run requires an agent.")
+        obs = self.reset()
+        total_reward = 0.0
+        episodes = 0
+        for _ in range(num_steps):
+            actions = self.agent.get_actions(obs)
+            next_obs, rewards, dones, infos = self.step(actions)
+            final_obs = next_obs
+            if dones.any():
+                final_obs = next_obs.copy()
+                for i in np.flatnonzero(dones):
+                    final_obs[i] = infos[i]["terminal_observation"]
+            self.agent.learn_batch(obs, actions, rewards, final_obs, dones)
+            total_reward += float(rewards.sum())
+            episodes += int(dones.sum())
+            obs = next_obs
+        transitions = num_steps * self.num_envs
+        return {
+            "transitions": transitions,
+            "episodes": episodes,
+            "mean_reward": total_reward / transitions if transitions else 0.0,
+        }
+
+    def close(self):
+        """Stops the worker processes and closes the simulators they own."""
+        if self.closed:
+            return
+        if self._waiting:
+            for remote in self.remotes:
+                try:
+                    remote.recv()
+                except EOFError:
+                    pass
+        for remote in self.remotes:
+            try:
+                remote.send(("close", None))
+            except BrokenPipeError:
+                pass
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self.closed = True
+
+    def __del__(self):
+        if not getattr(self, "closed", True):
+            self.close()
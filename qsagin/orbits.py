@@ -0,0 +1,330 @@
+# File: qsagin/orbits.py
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+MU_EARTH = 3.986004418e14       # Earth's gravitational parameter (m^3/s^2)
+OMEGA_EARTH = 7.2921159e-5      # Earth's rotation rate (rad/s)
+WGS84_A = 6378137.0             # WGS84 semi-major axis (m)
+WGS84_E2 = 6.69437999014e-3     # WGS84 first eccentricity squared
+
+ELEMENT_KEYS = ("semi_major_axis", "eccentricity", "inclination", "raan", "arg_perigee", "mean_anomaly")
+JD_UNIX_EPOCH = 2440587.5       # Julian date of 1970-01-01T00:00:00 UTC
+JD_J2000 = 2451545.0            # Julian date of 2000-01-01T12:00:00 (J2000.0)
+
+
+def julian_date(epoch):
+    """
+    Julian date (UTC) of a datetime (naive datetimes are taken as UTC), an
+    ISO-8601 string such as "2024-03-01T12:00:00Z", or a Julian date (number).
+    """
+    if isinstance(epoch, (int, float)):
+        return float(epoch)
+    if isinstance(epoch, str):
+        epoch = datetime.fromisoformat(epoch)
+    if epoch.tzinfo is None:
+        epoch = epoch.replace(tzinfo=timezone.utc)
+    return epoch.timestamp() / 86400.0 + JD_UNIX_EPOCH
+
+
+def gmst(jd):
+    """Greenwich mean sidereal angle (rad) at a Julian date (IAU 1982, linear terms)."""
+    degrees = 280.46061837 + 360.98564736629 * (jd - JD_J2000)
+    return np.radians(np.mod(degrees, 360.0))
+
+
+def tle_epoch(line1):
+    """Julian date of the epoch of a TLE (line 1, columns 19-32)."""
+    year = int(line1[18:20])
+    year += 2000 if year < 57 else 1900
+    day_of_year = float(line1[20:32])
+    return julian_date(datetime(year, 1, 1, tzinfo=timezone.utc) + timedelta(days=day_of_year - 1.0))
+
+
+def elements_from_tle(line1, line2):
+    """
+    Reads the Keplerian elements from a two-line element set.
+    Only the mean elements of line 2 and the epoch of line 1 are used (no SGP4
+    perturbations).
+
+    Returns:
+        dict: Elements in SI units and radians, keyed by ELEMENT_KEYS, plus the
+              element set's epoch as a Julian date ("epoch_jd").
+    """
+    mean_motion = float(line2[52:63]) * 2.0 * np.pi / 86400.0     # rev/day -> rad/s
+    return {
+        "epoch_jd": tle_epoch(line1),
+        "semi_major_axis": (MU_EARTH / mean_motion ** 2) ** (1.0 / 3.0),
+        "eccentricity": float("0." + line2[26:33].strip()),
+        "inclination": np.radians(float(line2[8:16])),
+        "raan": np.radians(float(line2[17:25])),
+        "arg_perigee": np.radians(float(line2[34:42])),
+        "mean_anomaly": np.radians(float(line2[43:51])),
+    }
+
+
+def elements_from_config(satellite):
+    """
+    Reads the elements of one satellite config entry. The entry holds either a
+    "tle" pair of lines, or "altitude_m" / "semi_major_axis_m" plus optional angles
+    in degrees ("inclination_deg", "raan_deg", "arg_perigee_deg", "mean_anomaly_deg"),
+    "eccentricity" and the "epoch" the elements refer to (see `julian_date`;
+    without it they refer to the start of the time grid).
+    """
+    if "tle" in satellite:
+        return elements_from_tle(*satellite["tle"])
+    if "semi_major_axis_m" in satellite:
+        semi_major_axis = satellite["semi_major_axis_m"]
+    else:
+        semi_major_axis = WGS84_A + satellite["altitude_m"]
+    return {
+        "epoch_jd": julian_date(satellite["epoch"]) if "epoch" in satellite else None,
+        "semi_major_axis": float(semi_major_axis),
+        "eccentricity": float(satellite.get("eccentricity", 0.0)),
+        "inclination": np.radians(satellite.get("inclination_deg", 0.0)),
+        "raan": np.radians(satellite.get("raan_deg", 0.0)),
+        "arg_perigee": np.radians(satellite.get("arg_perigee_deg", 0.0)),
+        "mean_anomaly": np.radians(satellite.get("mean_anomaly_deg", 0.0)),
+    }
+
+
+def elements_at_epoch(elements, epoch_jd):
+    """
+    Two-body propagation of one element set to another epoch: only the mean anomaly
+    changes. Element sets without an "epoch_jd" are returned unchanged.
+    """
+    if elements.get("epoch_jd") is None:
+        return elements
+    mean_motion = np.sqrt(MU_EARTH / elements["semi_major_axis"] ** 3)
+    elapsed = (epoch_jd - elements["epoch_jd"]) * 86400.0
+    return dict(elements, epoch_jd=epoch_jd,
+                mean_anomaly=float(np.mod(elements["mean_anomaly"] + mean_motion * elapsed, 2.0 * np.pi)))
+
+
+def _solve_kepler(mean_anomaly, eccentricity, iterations=8):
+    """Vectorized Newton solver for E - e sin(E) = M."""
+    eccentric_anomaly = np.where(eccentricity < 0.8, mean_anomaly, np.pi)
+    for _ in range(iterations):
+        f = eccentric_anomaly - eccentricity * np.sin(eccentric_anomaly) - mean_anomaly
+        eccentric_anomaly = eccentric_anomaly - f / (1.0 - eccentricity * np.cos(eccentric_anomaly))
+    return eccentric_anomaly
+
+
+def propagate(elements, times):
+    """
+    Two-body propagation of many satellites over a time grid.
+
+    Args:
+        elements (dict): Arrays of shape (S,) keyed by ELEMENT_KEYS.
+        times (np.ndarray): Seconds since epoch, shape (T,).
+
+    Returns:
+        np.ndarray: Inertial (ECI) positions in meters, shape (S, T, 3).
+    """
+    a, e, inc, raan, argp, m0 = (np.asarray(elements[key], dtype=np.float64)[:, None]
+                                 for key in ELEMENT_KEYS)
+    times = np.asarray(times, dtype=np.float64)[None, :]
+
+    mean_motion = np.sqrt(MU_EARTH / a ** 3)
+    eccentric_anomaly = _solve_kepler(np.mod(m0 + mean_motion * times, 2.0 * np.pi), e)
+    # Position in the orbital plane.
+    x_orb = a * (np.cos(eccentric_anomaly) - e)
+    y_orb = a * np.sqrt(1.0 - e ** 2) * np.sin(eccentric_anomaly)
+
+    cos_raan, sin_raan = np.cos(raan), np.sin(raan)
+    cos_argp, sin_argp = np.cos(argp), np.sin(argp)
+    cos_inc, sin_inc = np.cos(inc), np.sin(inc)
+    # Rotation from the perifocal frame to ECI (columns P and Q).
+    px = cos_raan * cos_argp - sin_raan * sin_argp * cos_inc
+    py = sin_raan * cos_argp + cos_raan * sin_argp * cos_inc
+    pz = sin_argp * sin_inc
+    qx = -cos_raan * sin_argp - sin_raan * cos_argp * cos_inc
+    qy = -sin_raan * sin_argp + cos_raan * cos_argp * cos_inc
+    qz = cos_argp * sin_inc
+    return np.stack([px * x_orb + qx * y_orb,
+                     py * x_orb + qy * y_orb,
+                     pz * x_orb + qz * y_orb], axis=-1)
+
+
+def eci_to_ecef(positions, times, gmst0=0.0):
+    """
+    Rotates ECI positions (S, T, 3) into the Earth-fixed frame, where `gmst0` is
+    the Greenwich sidereal angle at t=0 (see `gmst`).
+    """
+    theta = gmst0 + OMEGA_EARTH * np.asarray(times, dtype=np.float64)
+    cos_t, sin_t = np.cos(theta), np.sin(theta)
+    x, y, z = positions[..., 0], positions[..., 1], positions[..., 2]
+    return np.stack([cos_t * x + sin_t * y, -sin_t * x + cos_t * y, z], axis=-1)
+
+
+def geodetic_to_ecef(lat_deg, lon_deg, alt_m):
+    """Converts WGS84 geodetic coordinates (arrays of shape (G,)) into ECEF positions (G, 3)."""
+    lat = np.radians(np.asarray(lat_deg, dtype=np.float64))
+    lon = np.radians(np.asarray(lon_deg, dtype=np.float64))
+    alt = np.asarray(alt_m, dtype=np.float64)
+    n = WGS84_A / np.sqrt(1.0 - WGS84_E2 * np.sin(lat) ** 2)
+    return np.stack([(n + alt) * np.cos(lat) * np.cos(lon),
+                     (n + alt) * np.cos(lat) * np.sin(lon),
+                     (n * (1.0 - WGS84_E2) + alt) * np.sin(lat)], axis=-1)
+
+
+def slant_geometry(ground_ecef, satellite_ecef, lat_deg, lon_deg):
+    """
+    Slant range and elevation of every satellite seen from every ground station.
+
+    Args:
+        ground_ecef (np.ndarray): Ground station positions, shape (G, 3).
+        satellite_ecef (np.ndarray): Satellite positions, shape (S, T, 3).
+        lat_deg, lon_deg: Ground station coordinates, shape (G,).
+
+    Returns:
+        tuple: (slant_range, elevation_deg), both float32 arrays of shape (G, S, T).
+    """
+    lat = np.radians(np.asarray(lat_deg, dtype=np.float64))[:, None, None]
+    lon = np.radians(np.asarray(lon_deg, dtype=np.float64))[:, None, None]
+    delta = satellite_ecef[None, :, :, :] - ground_ecef[:, None, None, :]
+    slant_range = np.linalg.norm(delta, axis=-1)
+    # Local "up" unit vector of each ground station.
+    up = (np.cos(lat) * np.cos(lon) * delta[..., 0]
+          + np.cos(lat) * np.sin(lon) * delta[..., 1]
+          + np.sin(lat) * delta[..., 2])
+    elevation = np.degrees(np.arcsin(np.clip(up / slant_range, -1.0, 1.0)))
+    return slant_range.astype(np.float32), elevation.astype(np.float32)
+
+
+def visibility_windows(visible, times):
+    """
+    Extracts contiguous visibility windows from a (G, S, T) boolean array.
+
+    Returns:
+        list: (ground_index, satellite_index, start_time, end_time) tuples.
+    """
+    visible = np.asarray(visible, dtype=bool)
+    padded = np.pad(visible, ((0, 0), (0, 0), (1, 1))).astype(np.int8)
+    edges = np.diff(padded, axis=-1)
+    starts = np.argwhere(edges == 1)
+    ends = np.argwhere(edges == -1)
+    # argwhere is row-major, so the k-th start and k-th end belong to the same window.
+    return [(int(g), int(s), float(times[t0]), float(times[t1 - 1]))
+            for (g, s, t0), (_, _, t1) in zip(starts, ends)]
+
+
+class OrbitGeometry:
+    """
+    Precomputed ground-station/satellite geometry on a fixed time grid.
+
+    `slant_range` and `elevation` are (G, S, T) arrays, memory-mapped from the cache
+    directory when one is used, so a lookup for a given step is a plain index
+    operation and workers share the same pages. Visibility is derived from the
+    elevation of the requested samples only; `visible` builds the full mask on demand.
+    """
+    def __init__(self, ground_stations, satellites, times, slant_range, elevation, min_elevation_deg):
+        self.ground_stations = list(ground_stations)
+        self.satellites = list(satellites)
+        self.times = times
+        self.slant_range = slant_range
+        self.elevation = elevation
+        self.min_elevation_deg = min_elevation_deg
+        self._gs_index = {name: i for i, name in enumerate(self.ground_stations)}
+        self._sat_index = {name: i for i, name in enumerate(self.satellites)}
+
+    @classmethod
+    def from_config(cls, orbit_config):
+        """
+        Builds (or loads from `cache_dir`) the geometry described by an orbit config:
+        "satellites" (see `elements_from_config`, plus "name"), "ground_stations"
+        ({"name", "lat_deg", "lon_deg", "alt_m"}), "duration_s", "step_s",
+        "min_elevation_deg" and the optional "cache_dir" and "start_epoch".
+
+        t=0 of the time grid is `start_epoch` (see `julian_date`); it defaults to the
+        latest epoch of the satellites' element sets. Every element set is
+        propagated from its own epoch to the start, and the Earth is rotated by the
+        sidereal angle of the start, so TLEs of different epochs are placed
+        consistently. Without any epoch the elements refer to t=0 and Greenwich is
+        aligned with the ECI x axis at t=0.
+        """
+        satellites = orbit_config["satellites"]
+        ground_stations = orbit_config["ground_stations"]
+        min_elevation = orbit_config.get("min_elevation_deg", 10.0)
+        times = np.arange(0.0, orbit_config.get("duration_s", 5400.0), orbit_config.get("step_s", 10.0))
+        sat_names = [sat["name"] for sat in satellites]
+        gs_names = [gs["name"] for gs in ground_stations]
+
+        per_sat = [elements_from_config(sat) for sat in satellites]
+        epochs = [el["epoch_jd"] for el in per_sat if el["epoch_jd"] is not None]
+        start_epoch = orbit_config.get("start_epoch")
+        start_jd = julian_date(start_epoch) if start_epoch is not None else max(epochs, default=None)
+
+        cache_dir = orbit_config.get("cache_dir")
+        if cache_dir is not None:
+            digest = hashlib.sha256(json.dumps(
+                {"satellites": satellites, "ground_stations": ground_stations,
+                 "times": [float(times[0]), float(times[-1]), len(times)], "start_jd": start_jd},
+                sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+            path = os.path.join(cache_dir, digest)
+            if os.path.exists(os.path.join(path, "elevation.npy")):
+                return cls(gs_names, sat_names,
+                           np.load(os.path.join(path, "times.npy"), mmap_mode="r"),
+                           np.load(os.path.join(path, "slant_range.npy"), mmap_mode="r"),
+                           np.load(os.path.join(path, "elevation.npy"), mmap_mode="r"),
+                           min_elevation)
+
+        gmst0 = 0.0
+        if start_jd is not None:
+            per_sat = [elements_at_epoch(el, start_jd) for el in per_sat]
+            gmst0 = gmst(start_jd)
+        elements = {key: np.array([el[key] for el in per_sat]) for key in ELEMENT_KEYS}
+        lat = np.array([gs["lat_deg"] for gs in ground_stations], dtype=np.float64)
+        lon = np.array([gs["lon_deg"] for gs in ground_stations], dtype=np.float64)
+        alt = np.array([gs.get("alt_m", 0.0) for gs in ground_stations], dtype=np.float64)
+
+        satellite_ecef = eci_to_ecef(propagate(elements, times), times, gmst0)
+        slant_range, elevation = slant_geometry(geodetic_to_ecef(lat, lon, alt), satellite_ecef, lat, lon)
+
+        if cache_dir is not None:
+            os.makedirs(path, exist_ok=True)
+            # Write the elevation last: its presence marks a complete cache entry.
+            for name, array in (("times", times), ("slant_range", slant_range), ("elevation", elevation)):
+                tmp_path = os.path.join(path, f"{name}.tmp.npy")
+                np.save(tmp_path, array)
+                os.replace(tmp_path, os.path.join(path, f"{name}.npy"))
+            return cls.from_config(orbit_config)
+        return cls(gs_names, sat_names, times, slant_range, elevation, min_elevation)
+
+    @property
+    def visible(self):
+        """Full (G, S, T) visibility mask; reads the whole elevation array."""
+        return np.asarray(self.elevation) >= self.min_elevation_deg
+
+    @property
+    def num_steps(self):
+        return len(self.times)
+
+    def index_of(self, ground_station, satellite):
+        """Returns (ground_index, satellite_index) for a pair of names, or None if unknown."""
+        g = self._gs_index.get(ground_station)
+        s = self._sat_index.get(satellite)
+        if g is None or s is None:
+            return None
+        return g, s
+
+    def link_distances(self, step, ground_indices, satellite_indices):
+        """
+        O(1)-per-link lookup of slant ranges and visibility at a time-grid step.
+        Steps past the end of the grid are clamped to the last sample.
+
+        Returns:
+            tuple: (distance_m, visible) arrays aligned with the given indices.
+        """
+        k = min(int(step), self.num_steps - 1)
+        elevation = np.asarray(self.elevation[ground_indices, satellite_indices, k])
+        return (np.asarray(self.slant_range[ground_indices, satellite_indices, k], dtype=np.float64),
+                elevation >= self.min_elevation_deg)
+
+    def windows(self):
+        """Visibility windows as (ground_station, satellite, start_s, end_s) tuples."""
+        return [(self.ground_stations[g], self.satellites[s], start, end)
+                for g, s, start, end in visibility_windows(self.visible, self.times)]
@@ -1,5 +1,13 @@
 # File: qsagin/simulators/base_simulator.py
+import asyncio
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from ..core.log import get_logger
+
+logger = get_logger("simulators")
 
 class BaseSimulator(ABC):
     """
@@ -11,7 +19,7 @@ class BaseSimulator(ABC):
     def __init__(self, sim_config):
         """Khởi tạo simulator với một file cấu hình."""
         self.config = sim_config
-        print(f"Initializing {self.__class__.__name__}...")
+        logger.info("Initializing %s...", self.__class__.__name__)
 
     @abstractmethod
     def setup(self):
@@ -26,6 +34,23 @@ class BaseSimulator(ABC):
         """
         pass
 
+    def step_chunk(self, actions):
+        """
+        Thực hiện một chuỗi action liên tiếp (action chunking) và dừng sớm nếu episode kết thúc.
+        Mặc định gọi `step` tuần tự; các simulator có thể ghi đè để gửi cả chuỗi trong một lần trao đổi.
+        Trả về: (observations, rewards, dones, infos), mỗi phần có một phần tử cho mỗi bước đã thực hiện.
+        """
+        observations, rewards, dones, infos = [], [], [], []
+        for action in actions:
+            obs, reward, done, info = self.step(action)
+            observations.append(obs)
+            rewards.append(reward)
+            dones.append(done)
+            infos.append(info)
+            if done:
+                break
+        return observations, np.asarray(rewards, dtype=np.float64), np.asarray(dones, dtype=bool), infos
+
     @abstractmethod
     def get_state(self):
         """Trả về trạng thái hiện tại của mô phỏng."""
@@ -35,3 +60,102 @@ class BaseSimulator(ABC):
     def reset(self):
         """Reset mô phỏng về trạng thái ban đầu."""
         pass
+
+    def state_spec(self):
+        """
+        (Tùy chọn) Khai báo shape/dtype của trạng thái trả về bởi `get_state` dưới dạng
+        một StateSchema, để Orchestrator ghi trạng thái vào các buffer cấp phát sẵn.
+        Trả về None nếu không biết trước (mặc định); khi đó Orchestrator dùng dict như cũ.
+        Chỉ được gọi sau `reset()`.
+        """
+        return None
+
+    def snapshot(self):
+        """
+        (Tùy chọn) Trả về trạng thái đầy đủ của mô phỏng (có thể pickle) để lưu vào checkpoint.
+        Trả về None nếu backend không hỗ trợ (mặc định, ví dụ tiến trình ns-3); khi resume,
+        Orchestrator sẽ reset simulator và chạy lại các action của episode hiện tại.
+        """
+        return None
+
+    def supports_snapshot(self):
+        """True nếu simulator ghi đè `snapshot`; nếu không, checkpoint phải lưu lại các action."""
+        return type(self).snapshot is not BaseSimulator.snapshot
+
+    def restore(self, snapshot):
+        """
+        Khôi phục trạng thái trả về bởi `snapshot`. Mặc định không làm gì với None
+        (simulator không có snapshot); báo lỗi nếu nhận một snapshot thật.
+        """
+        if snapshot is None:
+            return
+        raise NotImplementedError(
+            f"{type(self).__name__} cannot restore a snapshot: it does not implement restore(). "
+            "Implement snapshot() and restore() together, or return None from snapshot().")
+
+
+class AsyncBaseSimulator(ABC):
+    """
+    Phiên bản bất đồng bộ (asyncio) của BaseSimulator, dùng với AsyncOrchestrator.
+    Các simulator thực hiện I/O bất đồng bộ trực tiếp có thể kế thừa lớp này;
+    simulator đồng bộ được bọc tự động bằng SyncSimulatorAdapter.
+    """
+
+    @abstractmethod
+    async def setup(self):
+        pass
+
+    @abstractmethod
+    async def step(self, action):
+        """Trả về (observation, reward, done, info) như BaseSimulator.step."""
+        pass
+
+    @abstractmethod
+    async def get_state(self):
+        pass
+
+    @abstractmethod
+    async def reset(self):
+        """Trả về (observation, info) như BaseSimulator.reset."""
+        pass
+
+    async def close(self):
+        pass
+
+
+class SyncSimulatorAdapter(AsyncBaseSimulator):
+    """
+    Bọc một BaseSimulator đồng bộ: mỗi lời gọi chạy trong một executor riêng có một
+    luồng duy nhất, nên các lời gọi tới cùng một simulator (ví dụ một kết nối ns-3)
+    luôn tuần tự, trong khi nhiều simulator chạy song song trên cùng một event loop.
+    """
+    def __init__(self, simulator):
+        self.simulator = simulator
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="qsagin-async-sim")
+
+    async def _call(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def setup(self):
+        return await self._call(self.simulator.setup)
+
+    async def step(self, action):
+        return await self._call(self.simulator.step, action)
+
+    async def get_state(self):
+        return await self._call(self.simulator.get_state)
+
+    async def reset(self):
+        return await self._call(self.simulator.reset)
+
+    async def close(self):
+        if hasattr(self.simulator, "close"):
+            await self._call(self.simulator.close)
+        self._executor.shutdown(wait=False)
+
+
+def as_async_simulator(simulator):
+    """Trả về chính simulator nếu nó đã là bất đồng bộ, nếu không thì bọc nó lại."""
+    if isinstance(simulator, AsyncBaseSimulator):
+        return simulator
+    return SyncSimulatorAdapter(simulator)
@@ -0,0 +1,317 @@
+# File: qsagin/simulators/ns3_pool.py
+import functools
+import os
+import shlex
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+import zmq
+
+from .sim_classical import NS3Simulator
+from ..core.log import get_logger
+
+logger = get_logger("simulators.ns3_pool")
+
+# Command for the opengym example scenario shipped with the Docker image.
+OPENGYM_COMMAND = '/workspace/ns-allinone-3.40/ns-3.40/ns3 run "opengym --openGymPort={port}"'
+
+
+@functools.lru_cache(maxsize=None)
+def _timed_env_class():
+    """
+    Ns3Env subclass whose ZMQ sockets time out instead of blocking forever.
+
+    Ns3Env binds a new Ns3ZmqBridge in its constructor and again in every reset()
+    after a step, and both wait for ns-3's SimInitMsg before RCVTIMEO could be set
+    from outside. This subclass creates its bridges itself, with the timeout applied
+    as soon as the socket exists; it mirrors Ns3Env.__init__/reset of ns3gym 0.1.0
+    (the ns-3.40 opengym module). It is only used by PooledNS3Simulator, so other
+    Ns3Env instances are unaffected.
+    """
+    from ns3gym import ns3env
+
+    class TimedBridge(ns3env.Ns3ZmqBridge):
+        def __init__(self, timeout_s, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            if timeout_s:
+                self.socket.setsockopt(zmq.RCVTIMEO, int(timeout_s * 1000))
+
+    class TimedNs3Env(ns3env.Ns3Env):
+        def __init__(self, port, timeout_s):
+            self.timeout_s = timeout_s
+            self.stepTime = 0
+            self.port = port
+            self.startSim = False
+            self.simSeed = 0
+            self.simArgs = {}
+            self.debug = False
+            self.ns3ZmqBridge = None
+            self._connect()
+            self.seed()
+
+        def _connect(self):
+            """Binds a fresh bridge and waits for ns-3's handshake and first state."""
+            bridge = TimedBridge(self.timeout_s, self.port, self.startSim, self.simSeed, self.simArgs, self.debug)
+            try:
+                bridge.initialize_env(self.stepTime)
+                self.action_space = bridge.get_action_space()
+                self.observation_space = bridge.get_observation_space()
+                bridge.rx_env_state()
+            except zmq.ZMQError:
+                # Release the port so the next attempt can bind it again.
+                bridge.socket.close(linger=0)
+                raise
+            self.ns3ZmqBridge = bridge
+            self.envDirty = False
+
+        def reset(self):
+            if not self.envDirty:
+                return self.ns3ZmqBridge.get_obs()
+            if self.ns3ZmqBridge:
+                self.ns3ZmqBridge.close()
+                self.ns3ZmqBridge = None
+            self._connect()
+            return self.ns3ZmqBridge.get_obs()
+
+    return TimedNs3Env
+
+
+class NS3Server:
+    """One ns-3 (or stand-in) process bound to a fixed port."""
+    def __init__(self, port):
+        self.port = port
+        self.process = None
+        self.in_use = False
+        self.starts = 0
+
+    @property
+    def alive(self):
+        return self.process is not None and self.process.poll() is None
+
+
+class NS3ServerPool:
+    """
+    Launches `size` ns-3 processes on consecutive ports starting at `base_port`,
+    keeps them alive and hands them out to simulators.
+
+    ns3-gym inverts the usual roles: the Python client binds the port and the ns-3
+    script connects to it, so a process can be started before any client exists.
+    Processes are reused across episodes and simulators; a process is only
+    restarted when it has exited (a crash, or a scenario that runs a single
+    simulation and quits) or when a client reports it as unresponsive.
+    """
+    def __init__(self, command=OPENGYM_COMMAND, size=1, base_port=5555, cwd=None,
+                 startup_grace_s=0.5, health_interval_s=None, log_file=None):
+        """
+        Args:
+            command (str or list): Command line; "{port}" is replaced by the server's port.
+            size (int): Number of processes (K).
+            base_port (int): Port of the first process; the others follow consecutively.
+            cwd (str): Working directory for the processes.
+            startup_grace_s (float): Time a fresh process gets before it is handed out.
+            health_interval_s (float): If set, a background thread restarts dead
+                                       processes at this interval.
+            log_file (str): File receiving the processes' stdout/stderr (default: discarded).
+        """
+        self.command = command
+        self.cwd = cwd
+        self.startup_grace_s = startup_grace_s
+        self.health_interval_s = health_interval_s
+        self.servers = [NS3Server(base_port + i) for i in range(size)]
+        self._log = open(log_file, "ab") if log_file else subprocess.DEVNULL
+        self._available = threading.Condition()
+        self._restart_lock = threading.RLock()
+        self._stop = threading.Event()
+        self._health_thread = None
+
+    @classmethod
+    def standin(cls, size=1, base_port=5555, **options):
+        """
+        Pool of ns3-gym stand-in servers (see ns3_standin.py). Keyword options map
+        to its command-line flags, e.g. obs_size=64, step_latency_ms=1.
+        """
+        command = [sys.executable, "-m", "qsagin.simulators.ns3_standin", "--port", "{port}"]
+        for key, value in options.items():
+            command += [f"--{key.replace('_', '-')}", str(value)]
+        project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        return cls(command, size=size, base_port=base_port, cwd=project_root)
+
+    def _argv(self, port):
+        if isinstance(self.command, str):
+            return shlex.split(self.command.format(port=port))
+        return [part.format(port=port) for part in self.command]
+
+    def _launch(self, server):
+        server.process = subprocess.Popen(self._argv(server.port), cwd=self.cwd,
+                                          stdout=self._log, stderr=subprocess.STDOUT)
+        server.starts += 1
+        logger.info("Started ns-3 process %d on port %d (start #%d).",
+                    server.process.pid, server.port, server.starts)
+
+    def _terminate(self, server, timeout=5.0):
+        if server.process is None:
+            return
+        if server.process.poll() is None:
+            server.process.terminate()
+            try:
+                server.process.wait(timeout)
+            except subprocess.TimeoutExpired:
+                server.process.kill()
+                server.process.wait()
+        server.process = None
+
+    def start(self):
+        for server in self.servers:
+            if not server.alive:
+                self._launch(server)
+        time.sleep(self.startup_grace_s)
+        if self.health_interval_s and self._health_thread is None:
+            self._health_thread = threading.Thread(target=self._health_loop, daemon=True)
+            self._health_thread.start()
+        return self
+
+    def restart(self, server):
+        """Kills (if needed) and relaunches one server on the same port."""
+        with self._restart_lock:
+            logger.warning("Restarting ns-3 process on port %d.", server.port)
+            self._terminate(server)
+            self._launch(server)
+            time.sleep(self.startup_grace_s)
+
+    def check_health(self):
+        """Restarts every exited process; returns the ports that were restarted."""
+        restarted = []
+        with self._restart_lock:
+            for server in self.servers:
+                if not server.alive:
+                    self.restart(server)
+                    restarted.append(server.port)
+        return restarted
+
+    def _health_loop(self):
+        while not self._stop.wait(self.health_interval_s):
+            self.check_health()
+
+    def ensure_alive(self, server):
+        with self._restart_lock:
+            if not server.alive:
+                self.restart(server)
+
+    def acquire(self, timeout=None):
+        """Returns a free, running server; blocks until one is released."""
+        with self._available:
+            if not self._available.wait_for(lambda: any(not s.in_use for s in self.servers), timeout):
+                raise TimeoutError("No ns-3 server became available.")
+            server = next(s for s in self.servers if not s.in_use)
+            server.in_use = True
+        self.ensure_alive(server)
+        return server
+
+    def release(self, server):
+        with self._available:
+            server.in_use = False
+            self._available.notify()
+
+    def close(self):
+        self._stop.set()
+        if self._health_thread is not None:
+            self._health_thread.join()
+            self._health_thread = None
+        for server in self.servers:
+            self._terminate(server)
+        if self._log is not subprocess.DEVNULL:
+            self._log.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class PooledNS3Simulator(NS3Simulator):
+    """
+    NS3Simulator that takes its ns-3 process from an NS3ServerPool.
+
+    A step or reset that fails (the process died or did not answer within
+    `response_timeout_s`) restarts the process and reconnects. A failed step ends
+    the episode with `info["server_restarted"] = True` and the last observation;
+    a failed reset is retried up to `max_retries` times. The timeout also bounds
+    every connection handshake, including the one of a reset after a step (where
+    ns3-gym rebinds its socket), so a process that is alive but stalled is
+    restarted instead of hanging the run.
+    """
+    def __init__(self, sim_config, pool):
+        self.pool = pool
+        self.server = pool.acquire(sim_config.get("acquire_timeout_s"))
+        self.response_timeout_s = sim_config.get("response_timeout_s", 10.0)
+        self.max_retries = sim_config.get("max_retries", 3)
+        try:
+            super().__init__(dict(sim_config, port=self.server.port))
+        except BaseException:
+            pool.release(self.server)
+            self.server = None
+            raise
+
+    def _create_env(self, port):
+        return _timed_env_class()(port, self.response_timeout_s)
+
+    def _reconnect(self):
+        """Restarts the process and reconnects, retrying handshakes that time out."""
+        try:
+            self.env.ns3ZmqBridge.socket.close(linger=0)
+        except Exception:
+            logger.debug("Ignoring error while dropping the broken ns3-gym socket.", exc_info=True)
+        for attempt in range(self.max_retries + 1):
+            self.pool.restart(self.server)
+            try:
+                self.env = self._create_env(self.server.port)
+                return
+            except zmq.ZMQError as e:
+                if attempt == self.max_retries:
+                    raise
+                logger.error("ns-3 on port %d did not complete the handshake (%s); restarting it.",
+                             self.server.port, e)
+
+    def step(self, action):
+        try:
+            return super().step(action)
+        except zmq.ZMQError as e:
+            logger.error("ns-3 on port %d failed during step (%s); restarting it.", self.server.port, e)
+            last_observation = self.last_observation
+            self._reconnect()
+            self.last_observation = last_observation
+            return last_observation, 0.0, True, {"server_restarted": True}
+
+    def step_chunk(self, actions):
+        try:
+            return super().step_chunk(actions)
+        except zmq.ZMQError as e:
+            logger.error("ns-3 on port %d failed during a chunked step (%s); restarting it.", self.server.port, e)
+            last_observation = self.last_observation
+            self._reconnect()
+            self.last_observation = last_observation
+            return [last_observation], np.zeros(1), np.ones(1, dtype=bool), [{"server_restarted": True}]
+
+    def reset(self):
+        for attempt in range(self.max_retries + 1):
+            self.pool.ensure_alive(self.server)
+            try:
+                return super().reset()
+            except zmq.ZMQError as e:
+                if attempt == self.max_retries:
+                    raise
+                logger.error("ns-3 on port %d failed during reset (%s); restarting it.", self.server.port, e)
+                self._reconnect()
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            if self.server is not None:
+                self.pool.release(self.server)
+                self.server = None
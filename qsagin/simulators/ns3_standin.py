@@ -0,0 +1,262 @@
+# File: qsagin/simulators/ns3_standin.py
+"""
+Lightweight stand-in for an ns-3 script driven by ns3-gym.
+
+It speaks the ns3-gym wire protocol (ZMQ REQ socket + ns3gym protobuf messages)
+from the simulation side, so NS3Simulator / ns3env.Ns3Env(port=..., startSim=False)
+can connect to it exactly as to a real ns-3 process:
+
+    python -m qsagin.simulators.ns3_standin --port 5555 --obs-size 64 --step-latency-ms 1
+
+Each "simulation" sends a SimInitMsg, then one EnvStateMsg per step and waits for the
+EnvActMsg reply. An episode ends with isGameOver after `episode_length` steps; when
+the client asks to stop (or stops answering, e.g. because it rebound its socket on
+reset) the server starts a new simulation, like restarting the ns-3 script.
+
+Besides single Discrete actions it accepts chunked actions (an INT Box of k actions,
+see NS3Simulator.step_chunk), executing them in one exchange.
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import zmq
+from ns3gym import messages_pb2 as pb
+
+from ..core.log import get_logger, configure_logging
+
+logger = get_logger("simulators.ns3_standin")
+
+DEFAULT_CONFIG = {
+    "port": 5555,
+    "obs_size": 5,
+    "num_actions": 2,
+    "episode_length": 100,
+    "step_latency_s": 0.0,
+    "init_latency_s": 0.0,
+    "reconnect_timeout_s": 2.0,
+    "max_simulations": None,
+    "seed": None,
+    # Failure injection, evaluated once per step.
+    "failure": {
+        "crash_prob": 0.0,      # exit the process without replying
+        "stall_prob": 0.0,      # sleep `stall_s` before sending the state
+        "stall_s": 1.0,
+        "game_over_prob": 0.0,  # end the episode early with reason GameOver
+    },
+}
+
+
+def _box_space(size):
+    space = pb.BoxSpace()
+    space.low = 0.0
+    space.high = 1.0
+    space.dtype = pb.FLOAT
+    space.shape.extend([size])
+    description = pb.SpaceDescription()
+    description.type = pb.Box
+    description.space.Pack(space)
+    return description
+
+
+def _discrete_space(n):
+    space = pb.DiscreteSpace()
+    space.n = n
+    description = pb.SpaceDescription()
+    description.type = pb.Discrete
+    description.space.Pack(space)
+    return description
+
+
+def _box_data(values, rows=None):
+    """Packs a flat float list; with `rows` it is described as a (rows, n) matrix."""
+    box = pb.BoxDataContainer()
+    box.dtype = pb.FLOAT
+    box.shape.extend([len(values)] if rows is None else [rows, len(values) // rows])
+    box.floatData.extend(values)
+    container = pb.DataContainer()
+    container.type = pb.Box
+    container.data.Pack(box)
+    return container
+
+
+def _decode_actions(act_msg):
+    """
+    Decodes an EnvActMsg into (actions, chunked). A Discrete action is a single
+    step; an INT Box of shape [k] is a chunk of k actions (see NS3Simulator.step_chunk).
+    """
+    if act_msg.actData.type == pb.Box:
+        box = pb.BoxDataContainer()
+        act_msg.actData.data.Unpack(box)
+        return list(box.intData), True
+    data = pb.DiscreteDataContainer()
+    act_msg.actData.data.Unpack(data)
+    return [data.data], False
+
+
+class NS3StandInServer:
+    """
+    Simulation-side ns3-gym endpoint with configurable observation size, step
+    latency and failure injection. See DEFAULT_CONFIG for the recognised keys.
+    """
+    def __init__(self, config=None):
+        config = dict(DEFAULT_CONFIG, **(config or {}))
+        config["failure"] = dict(DEFAULT_CONFIG["failure"], **(config.get("failure") or {}))
+        self.config = config
+        self.rng = np.random.default_rng(config["seed"])
+        self.context = zmq.Context.instance()
+        self.socket = None
+        self.simulations = 0
+        self.steps = 0
+        self.last_action = None
+
+    def _connect(self):
+        if self.socket is not None:
+            self.socket.close(linger=0)
+        self.socket = self.context.socket(zmq.REQ)
+        self.socket.setsockopt(zmq.LINGER, 0)
+        self.socket.setsockopt(zmq.RCVTIMEO, int(self.config["reconnect_timeout_s"] * 1000))
+        self.socket.connect(f"tcp://localhost:{self.config['port']}")
+
+    def _request(self, message, reply):
+        """Sends `message` and parses the reply into `reply`; returns False on timeout."""
+        self.socket.send(message.SerializeToString())
+        try:
+            reply.ParseFromString(self.socket.recv())
+        except zmq.Again:
+            return False
+        return True
+
+    def _init_simulation(self):
+        if self.config["init_latency_s"]:
+            time.sleep(self.config["init_latency_s"])
+        init_msg = pb.SimInitMsg()
+        init_msg.simProcessId = os.getpid()
+        init_msg.wafShellProcessId = os.getpid()
+        init_msg.actSpace.CopyFrom(_discrete_space(self.config["num_actions"]))
+        init_msg.obsSpace.CopyFrom(_box_space(self.config["obs_size"]))
+        ack = pb.SimInitAck()
+        return self._request(init_msg, ack) and not ack.stopSimReq
+
+    def _simulate_step(self, episode_step):
+        """Produces (obs, reward, game_over, info) for one step, applying failure injection."""
+        failure = self.config["failure"]
+        draws = self.rng.random(3)
+        if draws[0] < failure["crash_prob"]:
+            logger.warning("Injected crash at step %d.", self.steps)
+            os._exit(1)
+        if draws[1] < failure["stall_prob"]:
+            logger.warning("Injected stall of %.3f s at step %d.", failure["stall_s"], self.steps)
+            time.sleep(failure["stall_s"])
+        obs = self.rng.random(self.config["obs_size"], dtype=np.float32)
+        if draws[2] < failure["game_over_prob"]:
+            return obs, float(obs.mean()), True, "injected game over"
+        return obs, float(obs.mean()), episode_step >= self.config["episode_length"], ""
+
+    def _state_message(self, rows, chunked):
+        """
+        Builds the EnvStateMsg for the executed steps. A chunked reply stacks the
+        observations row-wise, sums the rewards and lists them in the info field.
+        """
+        state = pb.EnvStateMsg()
+        observations, rewards, game_over, info = zip(*rows)
+        if chunked:
+            state.obsData.CopyFrom(_box_data(np.concatenate(observations).tolist(), rows=len(rows)))
+            state.reward = float(sum(rewards))
+            state.info = json.dumps({"rewards": list(rewards)})
+        else:
+            state.obsData.CopyFrom(_box_data(observations[0].tolist()))
+            state.reward = rewards[0]
+            state.info = info[0]
+        if game_over[-1]:
+            state.isGameOver = True
+            state.reason = pb.EnvStateMsg.GameOver
+        return state
+
+    def run_simulation(self):
+        """Runs one simulation until the client stops it or stops answering."""
+        self._connect()
+        if not self._init_simulation():
+            return
+        episode_step = 0
+        rows, chunked = [self._simulate_step(episode_step)], False
+        while True:
+            act = pb.EnvActMsg()
+            if not self._request(self._state_message(rows, chunked), act):
+                logger.debug("Client stopped answering after %d steps.", episode_step)
+                return
+            if act.stopSimReq:
+                return
+            actions, chunked = _decode_actions(act)
+            rows = []
+            for action in actions:
+                self.last_action = action
+                if self.config["step_latency_s"]:
+                    time.sleep(self.config["step_latency_s"])
+                episode_step += 1
+                self.steps += 1
+                rows.append(self._simulate_step(episode_step))
+                if rows[-1][2]:
+                    break
+
+    def serve_forever(self):
+        max_simulations = self.config["max_simulations"]
+        logger.info("Stand-in ns-3 simulation connecting to port %s.", self.config["port"])
+        try:
+            while max_simulations is None or self.simulations < max_simulations:
+                self.run_simulation()
+                self.simulations += 1
+        finally:
+            self.close()
+
+    def close(self):
+        if self.socket is not None:
+            self.socket.close(linger=0)
+            self.socket = None
+
+
+def serve(config=None):
+    """Entry point usable as a multiprocessing target."""
+    NS3StandInServer(config).serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ns3-gym protocol stand-in for load-testing NS3Simulator.")
+    parser.add_argument("--port", type=int, default=DEFAULT_CONFIG["port"])
+    parser.add_argument("--obs-size", type=int, default=DEFAULT_CONFIG["obs_size"])
+    parser.add_argument("--num-actions", type=int, default=DEFAULT_CONFIG["num_actions"])
+    parser.add_argument("--episode-length", type=int, default=DEFAULT_CONFIG["episode_length"])
+    parser.add_argument("--step-latency-ms", type=float, default=0.0)
+    parser.add_argument("--init-latency-ms", type=float, default=0.0)
+    parser.add_argument("--max-simulations", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--crash-prob", type=float, default=0.0)
+    parser.add_argument("--stall-prob", type=float, default=0.0)
+    parser.add_argument("--stall-s", type=float, default=1.0)
+    parser.add_argument("--game-over-prob", type=float, default=0.0)
+    parser.add_argument("--log-level", default="INFO")
+    args = parser.parse_args()
+
+    configure_logging(level=args.log_level)
+    serve({
+        "port": args.port,
+        "obs_size": args.obs_size,
+        "num_actions": args.num_actions,
+        "episode_length": args.episode_length,
+        "step_latency_s": args.step_latency_ms / 1e3,
+        "init_latency_s": args.init_latency_ms / 1e3,
+        "max_simulations": args.max_simulations,
+        "seed": args.seed,
+        "failure": {
+            "crash_prob": args.crash_prob,
+            "stall_prob": args.stall_prob,
+            "stall_s": args.stall_s,
+            "game_over_prob": args.game_over_prob,
+        },
+    })
+
+
+if __name__ == "__main__":
+    main()
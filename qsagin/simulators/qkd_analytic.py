@@ -0,0 +1,190 @@
+# File: qsagin/simulators/qkd_analytic.py
+"""
+Closed-form surrogate for the SeQUeNCo BB84 key rate.
+
+The model follows the round structure of SeQUeNCo's BB84 protocol: in every round
+the sender emits `key_size / (frequency * mean_photon_num)` seconds of weak coherent
+pulses, the receiver detects a fraction of them, half of the detections survive basis
+sifting, and the round is closed by a few classical messages over the fiber. All
+functions broadcast over numpy arrays, so many links can be evaluated in one call.
+"""
+import numpy as np
+
+from .qkd_topology import fiber_loss
+
+# Speed of light in fiber used by SeQUeNCo channels (m/s).
+LIGHT_SPEED = 2e8
+# SeQUeNCo timelines count time in picoseconds.
+TIMELINE_UNIT_S = 1e-12
+
+DEFAULT_PARAMS = {
+    "frequency": 8e7,             # light source pulse rate (Hz)
+    "mean_photon_num": 0.1,       # mean photons per pulse
+    "detector_efficiency": 0.9,
+    "dark_count": 0.0,            # dark counts per second, per detector
+    "optical_error": 0.0,         # intrinsic polarization error probability
+    "classical_messages": 3,      # one-way classical messages per BB84 round
+}
+
+
+def params_from_config(config):
+    """
+    Extracts the surrogate parameters from a SequenceSimulator config dict, using the
+    same keys as the timeline mode.
+
+    Returns:
+        dict: Keyword arguments for `bb84_key_rate`.
+    """
+    topology_config = config.get("topology", {})
+    source = config.get("light_source", {})
+    detector = config.get("detector", {})
+    return {
+        "distance": topology_config.get("distance", 1e3),
+        "attenuation": config.get("attenuation", 1e-5),
+        "key_size": config.get("key_size", 256),
+        "sim_time": config.get("sim_time_ns", 5e9),
+        "frequency": source.get("frequency", DEFAULT_PARAMS["frequency"]),
+        "mean_photon_num": source.get("mean_photon_num", DEFAULT_PARAMS["mean_photon_num"]),
+        "detector_efficiency": detector.get("efficiency", DEFAULT_PARAMS["detector_efficiency"]),
+        "dark_count": detector.get("dark_count", DEFAULT_PARAMS["dark_count"]),
+        "optical_error": config.get("optical_error", DEFAULT_PARAMS["optical_error"]),
+        "scale": config.get("analytic_scale", 1.0),
+    }
+
+
+def bb84_key_rate(distance, attenuation, key_size=256, sim_time=np.inf,
+                  frequency=DEFAULT_PARAMS["frequency"],
+                  mean_photon_num=DEFAULT_PARAMS["mean_photon_num"],
+                  detector_efficiency=DEFAULT_PARAMS["detector_efficiency"],
+                  dark_count=DEFAULT_PARAMS["dark_count"],
+                  optical_error=DEFAULT_PARAMS["optical_error"],
+                  classical_messages=DEFAULT_PARAMS["classical_messages"],
+                  scale=1.0, transmissivity=None):
+    """
+    Computes the BB84 key rate and QBER in closed form.
+
+    Every argument may be a scalar or a numpy array; arrays are broadcast against
+    each other, so passing arrays of distances/attenuations evaluates a batch of links.
+
+    Args:
+        distance: Link length (m).
+        attenuation: Fiber attenuation (dB/m), as used by SeQUeNCo's QuantumChannel.
+        key_size: Length of each generated key (bits).
+        sim_time: Simulated time budget in timeline units (ps). Links that cannot
+                  finish a single key within the budget get a rate of 0.
+        scale: Multiplicative calibration factor (see `calibrate`).
+        transmissivity: (Optional) Precomputed channel transmissivity, e.g. from
+                        `LinkTable.link_budget`; derived from `attenuation` and
+                        `distance` when omitted.
+
+    Returns:
+        tuple: (key_rate_bps, qber) as float64 arrays of the broadcast shape.
+    """
+    distance, attenuation, key_size, sim_time, frequency, mu, eta_d, dark, e_opt, msgs, scale = (
+        np.asarray(x, dtype=np.float64) for x in np.broadcast_arrays(
+            distance, attenuation, key_size, sim_time, frequency, mean_photon_num,
+            detector_efficiency, dark_count, optical_error, classical_messages, scale))
+
+    if transmissivity is None:
+        _, transmissivity = fiber_loss(distance, attenuation)
+    else:
+        transmissivity = np.broadcast_to(np.asarray(transmissivity, dtype=np.float64), distance.shape)
+    p_signal = 1.0 - np.exp(-mu * transmissivity * eta_d)
+    # Two detectors, each open for one pulse period.
+    p_dark = 1.0 - np.exp(-2.0 * dark / frequency)
+    p_click = p_signal + p_dark - p_signal * p_dark
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        light_time = key_size / (frequency * mu)
+        round_time = light_time + msgs * distance / LIGHT_SPEED
+        # Sifted bits per round = pulses * p_click / 2, so a key needs this many rounds.
+        rounds_per_key = 2.0 * mu / p_click
+        time_per_key = rounds_per_key * round_time
+        key_rate = np.where(p_click > 0, scale * key_size / time_per_key, 0.0)
+        qber = np.where(p_click > 0, (e_opt * p_signal + 0.5 * p_dark) / p_click, 0.5)
+
+    key_rate = np.where(time_per_key <= sim_time * TIMELINE_UNIT_S, key_rate, 0.0)
+    return key_rate, qber
+
+
+def _relative_errors(scale, predicted, measured):
+    rel_error = np.abs(scale * predicted - measured) / measured
+    if not rel_error.size:
+        return {"mean_rel_error": None, "p95_rel_error": None, "max_rel_error": None, "samples": 0}
+    return {
+        "mean_rel_error": float(rel_error.mean()),
+        "p95_rel_error": float(np.percentile(rel_error, 95)),
+        "max_rel_error": float(rel_error.max()),
+        "samples": int(rel_error.size),
+    }
+
+
+def calibrate(configs, runs_per_config=1, holdout=0.25, seed=0):
+    """
+    Fits the surrogate's `analytic_scale` against real SeQUeNCo timeline runs and
+    reports the residual error bounds.
+
+    Each config is run `runs_per_config` times through SequenceSimulator in
+    timeline mode with every link of its topology active, and every link is one
+    sample: its measured key rate against the surrogate's prediction from the
+    link's own loss budget (`LinkTable.link_budget`). A `holdout` fraction of the
+    configs (with all their runs) is set aside; the scale is the geometric mean of
+    measured/predicted over the remaining samples with a non-zero measured rate,
+    and the held-out samples give the validation error.
+
+    Args:
+        configs (list): SequenceSimulator config dicts to evaluate.
+        runs_per_config (int): Number of timeline runs per config.
+        holdout (float): Fraction of the configs used for validation only (at
+                         least one config when > 0 and there are several configs).
+        seed (int): Seed of the train/validation split.
+
+    Returns:
+        dict: {"scale", "mean_rel_error", "p95_rel_error", "max_rel_error",
+               "samples", "validation", "measured", "predicted", "is_validation"}.
+               The top-level errors are relative errors of the scaled surrogate
+               on the fitted samples; "validation" holds the same statistics on
+               the held-out samples (None values without a holdout).
+    """
+    from .sim_quantum import SequenceSimulator
+
+    num_validation = 0
+    if holdout > 0 and len(configs) > 1:
+        num_validation = min(max(1, int(round(holdout * len(configs)))), len(configs) - 1)
+    validation_configs = set(np.random.default_rng(seed).permutation(len(configs))[:num_validation].tolist())
+
+    measured = []
+    predicted = []
+    is_validation = []
+    for index, config in enumerate(configs):
+        params = params_from_config(config)
+        params["scale"] = 1.0
+        for _ in range(runs_per_config):
+            sim = SequenceSimulator(dict(config, mode="timeline"))
+            sim.reset()
+            links = np.arange(len(sim.links))
+            sim.step(links)
+            # Distances as used by this step (satellite links move between steps).
+            params["distance"] = sim.links.distance
+            params["attenuation"] = sim.links.attenuation
+            params["transmissivity"] = sim.links.link_budget()["transmissivity"]
+            expected, _ = bb84_key_rate(**params)
+            measured.extend(sim.link_key_rates[links].tolist())
+            predicted.extend(expected.tolist())
+            is_validation.extend([index in validation_configs] * len(links))
+
+    measured = np.asarray(measured, dtype=np.float64)
+    predicted = np.asarray(predicted, dtype=np.float64)
+    is_validation = np.asarray(is_validation, dtype=bool)
+    valid = (measured > 0) & (predicted > 0)
+    train = valid & ~is_validation
+    if not train.any():
+        raise ValueError("Calibration needs at least one fitted run with a non-zero key rate.")
+
+    scale = float(np.exp(np.mean(np.log(measured[train] / predicted[train]))))
+    held_out = valid & is_validation
+    result = {"scale": scale}
+    result.update(_relative_errors(scale, predicted[train], measured[train]))
+    result["validation"] = _relative_errors(scale, predicted[held_out], measured[held_out])
+    result.update(measured=measured, predicted=predicted, is_validation=is_validation)
+    return result
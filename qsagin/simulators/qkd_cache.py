@@ -0,0 +1,159 @@
+# File: qsagin/simulators/qkd_cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+
+# Config entries that fully determine the outcome of a seeded SeQUeNCo QKD run.
+# keep_raw_keys and metrics_window change what is stored (full sample history vs.
+# latest sample, windowed mean), so they are part of the key as well.
+CACHE_KEY_FIELDS = ("sim_time_ns", "attenuation", "key_size", "num_keys", "seed",
+                    "light_source", "detector", "keep_raw_keys", "metrics_window")
+# Defaults of SequenceSimulator, so an omitted entry and its default share a key.
+_FIELD_DEFAULTS = {"keep_raw_keys": False, "metrics_window": 10}
+
+
+class QKDResultCache:
+    """
+    Content-addressed, two-tier cache for SeQUeNCo QKD results.
+
+    Results are keyed by a SHA-256 digest of the configuration that produced them.
+    The first tier is an in-memory LRU; the optional second tier is a sqlite file
+    that survives across processes and runs, with size-based (least recently used)
+    eviction. Instances can be pickled (e.g. into VecOrchestrator workers); the
+    sqlite connection is reopened lazily in the new process.
+    """
+    def __init__(self, max_memory_entries=256, path=None, max_disk_bytes=256 * 1024 * 1024):
+        """
+        Args:
+            max_memory_entries (int): Capacity of the in-memory LRU tier.
+            path (str): (Optional) sqlite file for the on-disk tier.
+            max_disk_bytes (int): Payload budget of the on-disk tier.
+        """
+        self.max_memory_entries = max_memory_entries
+        self.path = path
+        self.max_disk_bytes = max_disk_bytes
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._conn = None
+
+    @staticmethod
+    def make_key(config, active_links=None, distances=None):
+        """
+        Builds the cache key for a SequenceSimulator config dict and the set of links
+        activated by the step (indices into the topology's link table). Links whose
+        length changes over time (satellite passes) pass their current `distances`.
+        """
+        topology_config = config.get("topology", {})
+        material = {field: config.get(field, _FIELD_DEFAULTS.get(field)) for field in CACHE_KEY_FIELDS}
+        material["nodes"] = topology_config.get("nodes")
+        material["distance"] = topology_config.get("distance")
+        material["links"] = topology_config.get("links")
+        material["active_links"] = list(active_links) if active_links is not None else None
+        material["distances"] = distances
+        blob = json.dumps(material, sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _connect(self):
+        if self._conn is None and self.path is not None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=30)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, payload TEXT NOT NULL, "
+                "size INTEGER NOT NULL, last_access REAL NOT NULL)")
+            self._conn.commit()
+        return self._conn
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        """
+        Looks a result up in memory, then on disk.
+
+        Returns:
+            dict: The cached entry, or None on a miss.
+        """
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return entry
+
+        conn = self._connect()
+        if conn is not None:
+            row = conn.execute("SELECT payload FROM results WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                conn.execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+                conn.commit()
+                entry = json.loads(row[0])
+                self._remember(key, entry)
+                self.disk_hits += 1
+                return entry
+
+        self.misses += 1
+        return None
+
+    def put(self, key, entry):
+        """Stores a JSON-serializable result in both tiers."""
+        self._remember(key, entry)
+        conn = self._connect()
+        if conn is None:
+            return
+        payload = json.dumps(entry)
+        conn.execute(
+            "INSERT OR REPLACE INTO results (key, payload, size, last_access) VALUES (?, ?, ?, ?)",
+            (key, payload, len(payload), time.time()))
+        self._evict(conn)
+        conn.commit()
+
+    def _evict(self, conn):
+        """Drops the least recently used rows until the disk tier fits its budget."""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+        for key, size in conn.execute("SELECT key, size FROM results ORDER BY last_access ASC").fetchall():
+            conn.execute("DELETE FROM results WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_disk_bytes:
+                break
+
+    @property
+    def stats(self):
+        """Hit/miss counters of this cache instance."""
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        """Empties both tiers and resets the counters."""
+        self._memory.clear()
+        conn = self._connect()
+        if conn is not None:
+            conn.execute("DELETE FROM results")
+            conn.commit()
+        self.memory_hits = self.disk_hits = self.misses = 0
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_conn"] = None
+        return state
@@ -0,0 +1,160 @@
+# File: qsagin/simulators/qkd_metrics.py
+"""
+Streaming statistics of QKD runs (key rate and QBER samples). SequenceSimulator
+attaches a QKDMetricsCollector to every BB84 sender, so its metrics need O(1)
+memory in the number of generated keys, and the adaptive mode uses the running
+statistics to stop a timeline once its estimates have converged.
+"""
+import math
+from collections import deque
+from statistics import NormalDist
+
+import numpy as np
+
+
+def normal_quantile(confidence):
+    """Two-sided critical value z such that P(|Z| <= z) = confidence."""
+    return NormalDist().inv_cdf(0.5 + confidence / 2.0)
+
+
+class RunningStats:
+    """
+    Running mean and variance (Welford's algorithm). Batches are merged with the
+    parallel update of Chan et al., so adding k samples costs one numpy pass.
+    """
+    __slots__ = ("count", "mean", "_m2")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def update_many(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        n = values.size
+        if n == 0:
+            return
+        batch_mean = float(values.mean())
+        batch_m2 = float(((values - batch_mean) ** 2).sum())
+        total = self.count + n
+        delta = batch_mean - self.mean
+        self.mean += delta * n / total
+        self._m2 += batch_m2 + delta * delta * self.count * n / total
+        self.count = total
+
+    @property
+    def variance(self):
+        """Sample variance (ddof=1); 0 with fewer than two samples."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    def half_width(self, confidence=0.95):
+        """
+        Half-width of the normal-approximation confidence interval of the mean
+        (infinite with fewer than two samples).
+        """
+        if self.count < 2:
+            return math.inf
+        return normal_quantile(confidence) * self.std / math.sqrt(self.count)
+
+    def __repr__(self):
+        return f"RunningStats(count={self.count}, mean={self.mean:.6g}, std={self.std:.6g})"
+
+
+class QKDMetricsCollector:
+    """
+    Streaming metrics of one BB84 sender protocol.
+
+    The collector registers itself as an upper protocol of the BB84 instance, so
+    SeQUeNCo calls its `pop` for every finished key. Each call drains the
+    protocol's `throughputs` / `error_rates` samples into running statistics (mean,
+    variance, the mean over the last `window` keys and the latest value) and then
+    empties those lists, so memory stays constant however many keys a timeline
+    generates. With `keep_raw_keys` the keys and the protocol's sample lists are
+    kept as well, for analyses that need the full history.
+    """
+    def __init__(self, protocol, window=10, keep_raw_keys=False):
+        """
+        Args:
+            protocol: SeQUeNCo BB84 protocol of the sending node.
+            window (int): Number of recent keys averaged by `windowed_key_rate_bps`.
+            keep_raw_keys (bool): Keep every key and leave the protocol's lists intact.
+        """
+        self.protocol = protocol
+        self.keep_raw_keys = keep_raw_keys
+        self.key_rate = RunningStats()
+        self.qber = RunningStats()
+        self.keys_popped = 0
+        self.keys = [] if keep_raw_keys else None
+        self.last_key_rate_bps = 0.0
+        self.last_qber = 0.0
+        self._window = deque(maxlen=window)
+        self._window_sum = 0.0
+        # Samples already consumed when the protocol's lists are not emptied.
+        self._rates_seen = 0
+        self._errors_seen = 0
+        protocol.upper_protocols.append(self)
+
+    def pop(self, *args, **kwargs):
+        """Called by BB84 (`_pop(info=key)`) whenever a key is finished."""
+        self.keys_popped += 1
+        if self.keys is not None:
+            self.keys.append(kwargs.get("info", args[0] if args else None))
+        self.drain()
+
+    def push(self, *args, **kwargs):
+        pass
+
+    def drain(self):
+        """Consumes the samples the protocol has appended since the last call."""
+        throughputs = self.protocol.throughputs
+        new_rates = throughputs[self._rates_seen:]
+        if new_rates:
+            self.key_rate.update_many(new_rates)
+            self.last_key_rate_bps = float(new_rates[-1])
+            for value in new_rates:
+                if len(self._window) == self._window.maxlen:
+                    self._window_sum -= self._window[0]
+                self._window.append(value)
+                self._window_sum += value
+        error_rates = self.protocol.error_rates
+        new_errors = error_rates[self._errors_seen:]
+        if new_errors:
+            self.qber.update_many(new_errors)
+            self.last_qber = float(new_errors[-1])
+        if self.keep_raw_keys:
+            self._rates_seen = len(throughputs)
+            self._errors_seen = len(error_rates)
+        else:
+            del throughputs[:]
+            del error_rates[:]
+
+    @property
+    def keys_generated(self):
+        """Number of key throughput samples seen so far."""
+        return self.key_rate.count
+
+    @property
+    def windowed_key_rate_bps(self):
+        return self._window_sum / len(self._window) if self._window else 0.0
+
+    def summary(self):
+        """Plain-dict view of the statistics (JSON-serialisable, e.g. for the result cache)."""
+        return {
+            "keys": self.key_rate.count,
+            "key_rate_bps": self.last_key_rate_bps,
+            "mean_key_rate_bps": self.key_rate.mean,
+            "key_rate_std_bps": self.key_rate.std,
+            "windowed_key_rate_bps": self.windowed_key_rate_bps,
+            "qber": self.last_qber,
+            "mean_qber": self.qber.mean,
+        }
@@ -0,0 +1,132 @@
+# File: qsagin/simulators/registry.py
+import importlib
+
+from .base_simulator import BaseSimulator
+from ..core.log import get_logger
+
+logger = get_logger("simulators")
+
+# Backend name -> "module:Class", or {role: "module:Class"} when the backend has a
+# classical and a quantum variant. Modules are only imported when a simulator of
+# that backend is instantiated, so heavy dependencies (ns3gym, SeQUeNCo) stay
+# unloaded for runs that do not use them.
+SIMULATORS = {
+    "ns3": "qsagin.simulators.sim_classical:NS3Simulator",
+    "sequence": "qsagin.simulators.sim_quantum:SequenceSimulator",
+    "replay": "qsagin.simulators.sim_replay:ReplayNS3Simulator",
+    "mock": {
+        "classical": "qsagin.simulators.sim_mock:MockClassicalSimulator",
+        "quantum": "qsagin.simulators.sim_mock:MockQuantumSimulator",
+    },
+}
+
+# Backend used for each role when the config does not name one.
+DEFAULT_BACKENDS = {"classical": "ns3", "quantum": "sequence"}
+
+
+def register(name, target, role=None):
+    """
+    Registers a simulator backend.
+
+    Args:
+        name (str): Backend name used in configs ("backend" key).
+        target (str): "package.module:ClassName"; imported on first use.
+        role (str): (Optional) "classical" or "quantum" for role-specific variants.
+    """
+    if role is None:
+        SIMULATORS[name] = target
+    else:
+        entry = SIMULATORS.get(name)
+        if not isinstance(entry, dict):
+            entry = SIMULATORS[name] = {}
+        entry[role] = target
+
+
+def available():
+    return sorted(SIMULATORS)
+
+
+def _target(name, role):
+    try:
+        entry = SIMULATORS[name]
+    except KeyError:
+        raise ValueError(f"Unknown simulator backend '{name}'. Available: {available()}") from None
+    if isinstance(entry, dict):
+        if role not in entry:
+            raise ValueError(f"Simulator backend '{name}' has no '{role}' variant.")
+        return entry[role]
+    return entry
+
+
+def get_simulator_class(name, role=None):
+    """Imports (on first use) and returns the simulator class of a backend."""
+    module_name, class_name = _target(name, role).split(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def create_simulator(name, sim_config, role=None, lazy=False):
+    """
+    Instantiates a registered simulator; with `lazy=True` returns a LazySimulator
+    that defers the import and construction until the simulator is first used.
+    """
+    if lazy:
+        _target(name, role)  # fail fast on unknown backends without importing them
+        return LazySimulator(name, sim_config, role)
+    return get_simulator_class(name, role)(sim_config)
+
+
+class LazySimulator(BaseSimulator):
+    """
+    Proxy that imports and constructs the real simulator on first use. Constructing
+    an Orchestrator from a config therefore neither imports ns3gym/SeQUeNCo nor
+    connects to ns-3; that happens when the run starts.
+    """
+    def __init__(self, name, sim_config, role=None):
+        super().__init__(sim_config)
+        self.name = name
+        self.role = role
+        self._simulator = None
+
+    @property
+    def simulator(self):
+        if self._simulator is None:
+            logger.debug("Instantiating '%s' simulator backend.", self.name)
+            self._simulator = get_simulator_class(self.name, self.role)(self.config)
+        return self._simulator
+
+    def setup(self):
+        return self.simulator.setup()
+
+    def step(self, action):
+        return self.simulator.step(action)
+
+    def step_chunk(self, actions):
+        return self.simulator.step_chunk(actions)
+
+    def get_state(self):
+        return self.simulator.get_state()
+
+    def state_spec(self):
+        return self.simulator.state_spec()
+
+    def reset(self):
+        return self.simulator.reset()
+
+    def snapshot(self):
+        return self.simulator.snapshot()
+
+    def supports_snapshot(self):
+        return self.simulator.supports_snapshot()
+
+    def restore(self, snapshot):
+        return self.simulator.restore(snapshot)
+
+    def close(self):
+        if self._simulator is not None and hasattr(self._simulator, "close"):
+            self._simulator.close()
+
+    def __getattr__(self, name):
+        # Only called for attributes not found on the proxy (e.g. key_rate_bps).
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.simulator, name)
@@ -1,6 +1,12 @@
 # File: qsagin/simulators/sim_classical.py
-from ns3gym import ns3env
+import json
+
+import numpy as np
 from .base_simulator import BaseSimulator
+from ..core.state import StateSchema
+from ..core.log import get_logger
+
+logger = get_logger("simulators.ns3")
 
 class NS3Simulator(BaseSimulator):
     """
@@ -13,11 +19,17 @@ class NS3Simulator(BaseSimulator):
         self.env = None
         self.last_observation = None
         port = self.config.get("port", 5555)
-        print(f"NS3Simulator: Initializing client to connect to ns-3 on port {port}...")
-        self.env = ns3env.Ns3Env(port=port, startSim=False)
+        logger.info("Initializing client to connect to ns-3 on port %s...", port)
+        self.env = self._create_env(port)
+
+    def _create_env(self, port):
+        """Creates the ns3-gym env; its constructor waits for the ns-3 handshake."""
+        # ns3gym (and its zmq/protobuf dependencies) is only imported when a client is created.
+        from ns3gym import ns3env
+        return ns3env.Ns3Env(port=port, startSim=False)
         
     def setup(self):
-        print("NS3Simulator: Setup complete. Ready to connect and reset.")
+        logger.info("Setup complete. Ready to connect and reset.")
         pass
 
     def step(self, action):
@@ -40,10 +52,69 @@ class NS3Simulator(BaseSimulator):
         return obs, reward, done, info
         # ========================================================
 
+    def step_chunk(self, actions):
+        """
+        Sends a sequence of actions in a single ZMQ exchange and returns the stacked
+        results as (observations (k, obs_dim), rewards (k,), dones (k,), infos).
+
+        Requires an ns-3 scenario that understands chunked actions (enable it with
+        `"chunked_actions": True` in the config): the actions arrive as an INT Box of
+        shape [k]; the scenario executes them in order, stops early at the end of the
+        episode and replies with a Box of the executed observations stacked row-wise,
+        the summed reward and `{"rewards": [...]}` as JSON in the info field.
+        The stand-in server (ns3_standin.py) implements this. Without the flag the
+        actions are stepped one by one.
+        """
+        if not self.config.get("chunked_actions", False) or len(actions) <= 1:
+            return super().step_chunk(actions)
+        if self.env is None:
+            raise RuntimeError("Environment is not initialized.")
+        from ns3gym import messages_pb2 as pb
+
+        box = pb.BoxDataContainer()
+        box.dtype = pb.INT
+        box.shape.extend([len(actions)])
+        box.intData.extend(int(action) for action in actions)
+        message = pb.EnvActMsg()
+        message.actData.type = pb.Box
+        message.actData.data.Pack(box)
+
+        observations, extra_info, game_over = self._exchange(message)
+        rewards = np.asarray(json.loads(extra_info)["rewards"], dtype=np.float64)
+        observations = np.asarray(observations).reshape(len(rewards), -1)
+        dones = np.zeros(len(rewards), dtype=bool)
+        dones[-1] = game_over
+        self.last_observation = observations[-1]
+        return observations, rewards, dones, [{} for _ in rewards]
+
+    def _exchange(self, message):
+        """
+        Sends a prebuilt EnvActMsg and waits for ns-3's reply, bypassing the action
+        encoding of Ns3Env.step. Returns (observation, extra_info, game_over).
+        """
+        # Mirrors Ns3ZmqBridge.send_actions/rx_env_state and Ns3Env.step of ns3gym
+        # 0.1.0 (the ns-3.40 opengym module); the only place that touches the bridge.
+        bridge = self.env.ns3ZmqBridge
+        bridge.socket.send(message.SerializeToString())
+        bridge.newStateRx = False
+        self.env.envDirty = True
+        bridge.rx_env_state()
+        return bridge.get_obs(), bridge.get_extra_info(), bridge.is_game_over()
+
     def get_state(self):
         """Returns the last known observation."""
         return self.last_observation
 
+    def state_spec(self):
+        """
+        Schema of the ns3gym observation space. Box observations arrive from ns3gym
+        as numpy arrays and are copied straight into the Orchestrator's state buffer.
+        """
+        space = getattr(self.env, "observation_space", None)
+        if getattr(space, "shape", None) is None:
+            return None
+        return StateSchema.array(space.shape, space.dtype)
+
     def reset(self):
         """
         Resets the ns-3 simulation.
@@ -53,14 +124,14 @@ class NS3Simulator(BaseSimulator):
         if self.env is None:
             raise RuntimeError("Environment is not initialized.")
             
-        print("NS3Simulator: Sending reset signal...")
+        logger.debug("Sending reset signal...")
         obs = self.env.reset()
         self.last_observation = obs
         return obs, {} # Return dummy info dict
 
     def close(self):
         """Closes the connection."""
-        print("NS3Simulator: Closing connection.")
+        logger.info("Closing connection.")
         if self.env:
             self.env.close()
             self.env = None
@@ -0,0 +1,93 @@
+# File: qsagin/simulators/sim_mock.py
+import time
+
+import numpy as np
+
+from .base_simulator import BaseSimulator
+from ..core.state import StateSchema
+
+
+class MockClassicalSimulator(BaseSimulator):
+    """
+    Stand-in for NS3Simulator that needs no ns-3 process.
+    Produces random Box-like observations of `obs_size` floats, an optional fixed
+    per-step latency (to emulate the ZMQ round trip) and ends an episode after
+    `episode_length` steps.
+    """
+    def __init__(self, sim_config):
+        super().__init__(sim_config)
+        self.obs_size = self.config.get("obs_size", 5)
+        self.step_latency_s = self.config.get("step_latency_s", 0.0)
+        self.episode_length = self.config.get("episode_length", 100)
+        self.rng = np.random.default_rng(self.config.get("seed"))
+        self.steps = 0
+        self.last_observation = None
+
+    def setup(self):
+        pass
+
+    def step(self, action):
+        if self.step_latency_s:
+            time.sleep(self.step_latency_s)
+        self.steps += 1
+        self.last_observation = self.rng.random(self.obs_size)
+        reward = float(self.last_observation.mean())
+        return self.last_observation, reward, self.steps >= self.episode_length, {}
+
+    def get_state(self):
+        return self.last_observation
+
+    def state_spec(self):
+        return StateSchema.array(self.obs_size)
+
+    def snapshot(self):
+        return {"steps": self.steps, "rng": self.rng.bit_generator.state,
+                "last_observation": self.last_observation}
+
+    def restore(self, snapshot):
+        self.steps = snapshot["steps"]
+        self.rng.bit_generator.state = snapshot["rng"]
+        self.last_observation = snapshot["last_observation"]
+
+    def reset(self):
+        self.steps = 0
+        self.last_observation = self.rng.random(self.obs_size)
+        return self.last_observation, {}
+
+
+class MockQuantumSimulator(BaseSimulator):
+    """
+    Stand-in for SequenceSimulator returning a constant key rate when action 0 is
+    taken, without importing SeQUeNCo. Like the real simulator in timeline and
+    analytic mode, every step ends the episode by default; set `done_on_step` to
+    False for open-ended episodes (closer to sliced mode).
+    """
+    def __init__(self, sim_config):
+        super().__init__(sim_config)
+        self.key_rate = self.config.get("key_rate_bps", 1000.0)
+        self.done_on_step = self.config.get("done_on_step", True)
+        self.key_rate_bps = 0.0
+
+    def setup(self):
+        pass
+
+    def step(self, action):
+        if action is not None and action == 0:
+            self.key_rate_bps = self.key_rate
+        return self.get_state(), self.key_rate_bps, self.done_on_step, {}
+
+    def get_state(self):
+        return {"key_rate_bps": self.key_rate_bps}
+
+    def state_spec(self):
+        return StateSchema.record(key_rate_bps=((), np.float64))
+
+    def snapshot(self):
+        return {"key_rate_bps": self.key_rate_bps}
+
+    def restore(self, snapshot):
+        self.key_rate_bps = snapshot["key_rate_bps"]
+
+    def reset(self):
+        self.key_rate_bps = 0.0
+        return self.get_state(), {}
@@ -1,108 +1,653 @@
 # File: qsagin/simulators/sim_quantum.py
 import numpy as np
+import pickle
 import time
 from .base_simulator import BaseSimulator
+from .qkd_analytic import TIMELINE_UNIT_S, bb84_key_rate, params_from_config
+from .qkd_cache import QKDResultCache
+from .qkd_metrics import QKDMetricsCollector
+from .qkd_topology import LinkTable
+from ..orbits import OrbitGeometry
+from ..core.log import get_logger
+from ..core.state import StateSchema
 
-from sequence.kernel.timeline import Timeline
-from sequence.topology.node import QKDNode
-from sequence.components.optical_channel import QuantumChannel, ClassicalChannel
-from sequence.qkd.BB84 import pair_bb84_protocols
+# SeQUeNCo is imported lazily inside the methods that build timeline objects, so
+# importing this module (or running in analytic mode) does not pay its import cost.
+
+logger = get_logger("simulators.sequence")
 
 class SequenceSimulator(BaseSimulator):
     """
     Simulator for the quantum network, using the BB84 protocol.
     Logic is based on the official SeQUeNCo example notebook.
+
+    The topology is a set of nodes plus a link table (see `LinkTable`). The action
+    selects which links run QKD in a step: an integer activates one link, a boolean
+    mask or a list of indices activates several. SeQUeNCo objects are only built for
+    links that have been activated, so setup cost follows the active links.
+
+    The `mode` config key selects the backend:
+        - "timeline" (default): runs the full SeQUeNCo discrete-event simulation.
+        - "analytic": evaluates the closed-form BB84 surrogate from `qkd_analytic`,
+          using the same config keys. Calibrate it with `qkd_analytic.calibrate` and
+          pass the fitted factor as `analytic_scale`.
+        - "sliced": runs the SeQUeNCo timeline incrementally. Each step advances it by
+          `time_slice_ns` timeline units and the observation carries the key rate and
+          QBER of the keys generated during that slice, so the quantum side can take
+          part in multi-step episodes.
+        - "adaptive": runs the timeline like "timeline" mode, but in slices of
+          `convergence.check_interval_ns`, and stops as soon as the mean per-key
+          throughput of every active link is known to within the requested tolerance
+          (see `_converged`). The observation reports the mean key rate with its
+          confidence interval half-width (`key_rate_ci_bps`), the QBER (`qber`,
+          `qber_ci`) and whether the tolerance was met (`converged`). Adaptive runs
+          are not cached.
+
+    Satellite links can follow precomputed orbits: the `orbits` config key holds an
+    `OrbitGeometry` (or the config to build one). Every link between a ground station
+    and a satellite known to the geometry then takes its distance from the slant
+    range at the current step, and cannot be activated while the satellite is below
+    the elevation mask. The orbit clock starts at `orbit_start_step` and advances by
+    one grid sample per step; it keeps running across resets, since most modes end
+    the episode after every step. Set `orbit_restart_on_reset: True` to rewind it to
+    `orbit_start_step` at every reset instead.
+
+    Timeline results can be memoized with the `cache` config key (a QKDResultCache
+    or a path to its sqlite file). Only seeded runs (`seed` set) are cached, since
+    unseeded runs are not reproducible; set `use_cache: False` to bypass the cache
+    for a given run.
+
+    Link metrics are streamed: every BB84 sender gets a QKDMetricsCollector that
+    folds each key's throughput and error rate into running statistics and empties
+    the protocol's sample lists, so memory does not grow with `num_keys` or
+    `sim_time_ns`. Consequently `throughput_history` only holds the latest sample of
+    each link; set `keep_raw_keys: True` to keep the generated keys and the full
+    sample history. `metrics_window` sets the number of keys averaged by the
+    collectors' windowed rate.
+
+    Resets reuse the built topology by default (`reset_mode: "snapshot"`): the
+    freshly initialized timeline, nodes and protocols are pickled before the first
+    run of an episode, and later resets restore that snapshot instead of constructing
+    every SeQUeNCo object again. Use `reset_mode: "rebuild"` to always call `setup()`.
     """
+    MODES = ("timeline", "analytic", "sliced", "adaptive")
+
+    # Defaults of the `convergence` config section used by the adaptive mode.
+    DEFAULT_CONVERGENCE = {
+        "confidence": 0.95,          # confidence level of the interval
+        "rel_tol": 0.05,             # stop when half-width <= rel_tol * mean key rate ...
+        "abs_tol_bps": None,         # ... or <= abs_tol_bps
+        "qber_abs_tol": None,        # optionally also require the QBER half-width <= this
+        "min_keys": 5,               # never stop before this many keys per link
+        "check_interval_ns": 1e8,    # timeline units between convergence checks
+    }
+
+    # Everything `snapshot` captures: the live SeQUeNCo objects (including the timeline's
+    # event queue and RNG) and the episode bookkeeping.
+    SNAPSHOT_ATTRIBUTES = (
+        "timeline", "nodes", "links", "link_objects", "sender_protocol", "_node_degree",
+        "key_rate_bps", "qber", "link_key_rates", "throughput_history", "_timeline_started",
+        "orbit_step", "link_visible", "sim_clock", "requested_links", "keys_generated",
+        "slice_key_rate_bps", "slice_qber", "_keys_seen",
+        "key_rate_ci_bps", "qber_ci", "converged",
+    )
+
     def __init__(self, sim_config):
         super().__init__(sim_config)
+        self.mode = self.config.get("mode", "timeline")
+        if self.mode not in self.MODES:
+            raise ValueError(f"Unknown SequenceSimulator mode '{self.mode}'. Expected one of {self.MODES}.")
         self.timeline = None
         self.nodes = {}
+        self.links = None
+        self.link_objects = {}
         self.sender_protocol = None
         self.key_rate_bps = 0.0
+        self.qber = 0.0
+        self.link_key_rates = None
+        self.throughput_history = {}
+        self.key_rate_ci_bps = 0.0
+        self.qber_ci = 0.0
+        self.converged = False
+        self.convergence = dict(self.DEFAULT_CONVERGENCE, **self.config.get("convergence", {}))
+        self.cache = self._resolve_cache(self.config.get("cache"))
+        self.reset_mode = self.config.get("reset_mode", "snapshot")
+        self._template = None
+        self._timeline_started = False
+        self._links_changed = False
+        self.last_run_seconds = 0.0
+        self.geometry = self._resolve_geometry(self.config.get("orbits"))
+        self.orbit_step = self.config.get("orbit_start_step", 0)
+        self._orbit_links = None
+        self._reset_slice_state()
+
+    @staticmethod
+    def _resolve_geometry(orbits):
+        if orbits is None or isinstance(orbits, OrbitGeometry):
+            return orbits
+        return OrbitGeometry.from_config(orbits)
+
+    def _reset_slice_state(self):
+        self.sim_clock = 0
+        self.requested_links = set()
+        self.keys_generated = 0
+        self.slice_key_rate_bps = 0.0
+        self.slice_qber = 0.0
+        self._keys_seen = {}
+
+    @staticmethod
+    def _resolve_cache(cache):
+        if cache is None or isinstance(cache, QKDResultCache):
+            return cache
+        return QKDResultCache(path=cache)
+
+    def _cache_key(self, active):
+        """Returns the cache key for this run, or None if the run must not be cached."""
+        if self.cache is None or not self.config.get("use_cache", True):
+            return None
+        if self.config.get("seed") is None:
+            return None
+        distances = self.links.distance[active].tolist() if self.geometry is not None else None
+        return QKDResultCache.make_key(self.config, active, distances)
 
     def setup(self):
-        """Setup 2-node topology and BB84 protocol based on the official example."""
-        print("Setting up SeQUeNCo based on official QKD example...")
+        """
+        Parses the topology into a link table and creates an empty timeline.
+        Nodes, BB84 protocols and channels are built lazily by `_build_links` when the
+        first action activates their link.
+        """
+        self.links = LinkTable.from_config(self.config)
+        self.link_key_rates = np.zeros(len(self.links), dtype=np.float64)
+        self._map_orbit_links()
+        if self.mode == "analytic":
+            # Nothing to build: the surrogate only needs the link table.
+            return
+
+        logger.debug("Setting up SeQUeNCo topology: %d nodes, %d links...", len(self.links.nodes), len(self.links))
+        from sequence.kernel.timeline import Timeline
 
         sim_time_ns = self.config.get("sim_time_ns", 5e9)
         self.timeline = Timeline(sim_time_ns)
+        seed = self.config.get("seed")
+        if seed is not None:
+            self.timeline.seed(seed)
+        self.timeline.init()
 
-        topology_config = self.config.get("topology", {})
-        node_names = topology_config.get("nodes", [])
-        assert len(node_names) == 2, "This scenario requires exactly 2 nodes."
+        # A node taking part in a single link keeps its own name; nodes shared by
+        # several links get one QKD endpoint per link, since each SeQUeNCo QKDNode
+        # owns exactly one light source and detector.
+        self._node_degree = self.links.degree()
 
-        node1_name, node2_name = node_names
+    def _map_orbit_links(self):
+        """Finds the links whose endpoints are a (ground station, satellite) pair of the geometry."""
+        self._orbit_links = None
+        if self.geometry is None:
+            return
+        link_ids, gs_ids, sat_ids = [], [], []
+        for i, (s, d) in enumerate(zip(self.links.src, self.links.dst)):
+            a, b = self.links.nodes[s], self.links.nodes[d]
+            pair = self.geometry.index_of(a, b) or self.geometry.index_of(b, a)
+            if pair is not None:
+                link_ids.append(i)
+                gs_ids.append(pair[0])
+                sat_ids.append(pair[1])
+        self._orbit_links = (np.array(link_ids, dtype=np.int64),
+                             np.array(gs_ids, dtype=np.int64),
+                             np.array(sat_ids, dtype=np.int64))
+        self.link_visible = np.ones(len(self.links), dtype=bool)
 
-        node1 = QKDNode(node1_name, self.timeline, stack_size=1)
-        node2 = QKDNode(node2_name, self.timeline, stack_size=1)
-        self.nodes[node1_name] = node1
-        self.nodes[node2_name] = node2
+    def _apply_orbit_geometry(self):
+        """Updates satellite link distances (and built channels) for the current orbit step."""
+        if self._orbit_links is None or len(self._orbit_links[0]) == 0:
+            return
+        link_ids, gs_ids, sat_ids = self._orbit_links
+        distances, visible = self.geometry.link_distances(self.orbit_step, gs_ids, sat_ids)
+        self.links.distance[link_ids] = distances
+        self.link_visible[link_ids] = visible
+        for i in link_ids.tolist():
+            if i in self.link_objects:
+                self._set_link_channels(i)
 
-        pair_bb84_protocols(node1.protocol_stack[0], node2.protocol_stack[0])
-        self.sender_protocol = node1.protocol_stack[0]
+    def _set_link_channels(self, link_index):
+        """
+        Applies the link table's distance and attenuation to the channels of a built
+        link, recomputing loss and delay.
+        """
+        from sequence.components.optical_channel import QuantumChannel
+        distance = float(self.links.distance[link_index])
+        for channel in self.link_objects[link_index]["channels"]:
+            channel.distance = distance
+            if isinstance(channel, QuantumChannel):
+                channel.attenuation = float(self.links.attenuation[link_index])
+                channel.init()
+            else:
+                channel.delay = distance / channel.light_speed
 
-        distance = topology_config.get("distance", 1e3)
-        attenuation = self.config.get("attenuation", 1e-5)
+    def _endpoint_name(self, node_index, link_index):
+        name = self.links.nodes[node_index]
+        if self._node_degree[node_index] > 1:
+            return f"{name}.{self.links.names[link_index]}"
+        return name
 
-        qc12 = QuantumChannel(f"qc_{node1_name}_{node2_name}", self.timeline,
-                              attenuation=attenuation, distance=distance)
-        cc12 = ClassicalChannel(f"cc_{node1_name}_{node2_name}", self.timeline, distance=distance)
-        qc12.set_ends(node1, node2_name)
-        cc12.set_ends(node1, node2_name)
+    def _build_links(self, indices):
+        """Builds the SeQUeNCo objects (two QKD nodes, BB84 pair, four channels) of new links."""
+        new_links = [i for i in indices if i not in self.link_objects]
+        if not new_links:
+            return
+        from sequence.topology.node import QKDNode
+        from sequence.components.optical_channel import QuantumChannel, ClassicalChannel
+        from sequence.qkd.BB84 import pair_bb84_protocols
+        existing_entities = set(self.timeline.entities)
+        for i in new_links:
+            name1 = self._endpoint_name(self.links.src[i], i)
+            name2 = self._endpoint_name(self.links.dst[i], i)
+            distance = float(self.links.distance[i])
+            attenuation = float(self.links.attenuation[i])
 
-        qc21 = QuantumChannel(f"qc_{node2_name}_{node1_name}", self.timeline,
-                              attenuation=attenuation, distance=distance)
-        cc21 = ClassicalChannel(f"cc_{node2_name}_{node1_name}", self.timeline, distance=distance)
-        qc21.set_ends(node2, node1_name)
-        cc21.set_ends(node2, node1_name)
+            node1 = QKDNode(name1, self.timeline, stack_size=1)
+            node2 = QKDNode(name2, self.timeline, stack_size=1)
+            self.nodes[name1] = node1
+            self.nodes[name2] = node2
+            self._apply_hardware_params(node1, node2)
 
-        self.timeline.init()
+            pair_bb84_protocols(node1.protocol_stack[0], node2.protocol_stack[0])
+
+            qc12 = QuantumChannel(f"qc_{name1}_{name2}", self.timeline,
+                                  attenuation=attenuation, distance=distance)
+            cc12 = ClassicalChannel(f"cc_{name1}_{name2}", self.timeline, distance=distance)
+            qc12.set_ends(node1, name2)
+            cc12.set_ends(node1, name2)
+
+            qc21 = QuantumChannel(f"qc_{name2}_{name1}", self.timeline,
+                                  attenuation=attenuation, distance=distance)
+            cc21 = ClassicalChannel(f"cc_{name2}_{name1}", self.timeline, distance=distance)
+            qc21.set_ends(node2, name1)
+            cc21.set_ends(node2, name1)
+
+            self.link_objects[i] = {
+                "sender": node1.protocol_stack[0],
+                "channels": (qc12, cc12, qc21, cc21),
+                "metrics": QKDMetricsCollector(node1.protocol_stack[0],
+                                               window=self.config.get("metrics_window", 10),
+                                               keep_raw_keys=self.config.get("keep_raw_keys", False)),
+            }
+            if i == 0:
+                self.sender_protocol = node1.protocol_stack[0]
+
+        # Only initialize the entities created here; older ones may already be running.
+        for entity_name, entity in self.timeline.entities.items():
+            if entity_name not in existing_entities:
+                entity.init()
+
+        if self.reset_mode == "snapshot" and not self._timeline_started:
+            self._take_template()
+
+    def _take_template(self):
+        """Pickles the freshly initialized topology so that `reset` can restore it."""
+        try:
+            self._template = pickle.dumps(
+                (self.timeline, self.nodes, self.link_objects, self.sender_protocol),
+                protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.warning("Topology snapshot not supported (%s); falling back to rebuild on reset.", e)
+            self.reset_mode = "rebuild"
+            self._template = None
+
+    def _restore_template(self):
+        """Restores the topology snapshot (including every link built so far)."""
+        self.timeline, self.nodes, self.link_objects, self.sender_protocol = pickle.loads(self._template)
+        if self.config.get("seed") is None:
+            # The snapshot also holds the RNG state; draw fresh entropy so unseeded
+            # episodes do not all replay the same random stream.
+            self.timeline.seed(int(np.random.SeedSequence().entropy % (2 ** 32)))
+
+    def _apply_hardware_params(self, *nodes):
+        """Applies the optional `light_source` / `detector` config overrides to QKD nodes."""
+        source_params = self.config.get("light_source", {})
+        detector_params = self.config.get("detector", {})
+        for node in nodes:
+            for name, value in source_params.items():
+                node.update_lightsource_params(name, value)
+            for name, value in detector_params.items():
+                # The polarization QSDetector of a QKDNode has two detectors.
+                for detector_id in (0, 1):
+                    node.update_detector_params(detector_id, name, value)
+
+    def _push_keys(self, indices):
+        key_size = self.config.get("key_size", 256)
+        num_keys = self.config.get("num_keys", 10) # Reduce for faster testing
+        for i in indices:
+            self.link_objects[i]["sender"].push(length=key_size, key_num=num_keys)
+            self.requested_links.add(i)
+            # (keys, QBER samples, QBER sum) already reported by previous slices.
+            self._keys_seen.setdefault(i, (0, 0, 0.0))
 
     def step(self, action):
         """
         Triggers the SeQUeNCo simulation to run to completion and returns results.
         This simulator is not designed for step-by-step control in the same way as ns-3.
         """
-        # We only need to trigger this once.
-        if action is not None and action == 0:
-            print(f"[SeQUeNCo] Action: Pushing key generation request...")
-            key_size = self.config.get("key_size", 256)
-            num_keys = self.config.get("num_keys", 10) # Reduce for faster testing
-            self.sender_protocol.push(length=key_size, key_num=num_keys)
+        info = {}
+        self._apply_orbit_geometry()
+        active = self.links.active_links(action)
+        if self._orbit_links is not None:
+            active = [i for i in active if self.link_visible[i]]
+        self.orbit_step += 1
+        if self.mode == "sliced":
+            return self._step_slice(active)
+        if active and self.mode == "adaptive":
+            info.update(self._run_adaptive(active))
+            return self.get_state(), self.key_rate_bps, True, info
+        if active and self.mode == "analytic":
+            params = params_from_config(self.config)
+            params["distance"] = self.links.distance[active]
+            params["attenuation"] = self.links.attenuation[active]
+            params["transmissivity"] = self.links.link_budget(active)["transmissivity"]
+            key_rates, qbers = bb84_key_rate(**params)
+            self.link_key_rates[active] = key_rates
+            self.key_rate_bps = float(self.link_key_rates.sum())
+            self.qber = float(np.mean(qbers))
+        elif active:
+            cache_key = self._cache_key(active)
+            cached = self.cache.get(cache_key) if cache_key is not None else None
+            if cached is not None:
+                logger.debug("Cache hit: reusing stored throughput history.")
+                results = cached["links"]
+            else:
+                results = self._run_timeline(active)
+                if cache_key is not None:
+                    self.cache.put(cache_key, {"links": results})
+            info["cache_hit"] = cached is not None
+            info["timeline_run_s"] = 0.0 if cached is not None else self.last_run_seconds
 
-            print("[SeQUeNCo] Running timeline to completion...")
-            start_real_time = time.time()
-            self.timeline.run()
-            end_real_time = time.time()
-            print(f"Execution time: {(end_real_time - start_real_time):.2f} s")
-
-            self._update_state()
+            self._update_state(active, results)
 
         reward = self.key_rate_bps
         # Since this runs to completion, we return done=True.
         # The observation is the final state.
-        return self.get_state(), reward, True, {}
+        return self.get_state(), reward, True, info
 
-    def _update_state(self):
-        """Get final metrics from the sender's protocol."""
-        if self.sender_protocol.throughputs and self.sender_protocol.throughputs[-1] > 0:
-            self.key_rate_bps = self.sender_protocol.throughputs[-1]
-            print(f"\nSUCCESS: SeQUeNCo BB84 finished. Final throughput: {self.key_rate_bps:.2f} bps\n")
+    def _step_slice(self, active):
+        """
+        Advances the timeline by one time slice and reports the keys generated in it.
+        Activating a link pushes its key generation request (once per episode); later
+        actions only advance time.
+        """
+        key_size = self.config.get("key_size", 256)
+        num_keys = self.config.get("num_keys", 10)
+        sim_time = self.config.get("sim_time_ns", 5e9)
+        time_slice = self.config.get("time_slice_ns", 1e8)
+
+        new_requests = [i for i in active if i not in self.requested_links]
+        if new_requests:
+            self._build_links(new_requests)
+            self._push_keys(new_requests)
+
+        slice_start = self.sim_clock
+        # Events at or after stop_time stay queued, so the next slice resumes from them.
+        self.sim_clock = min(slice_start + time_slice, sim_time)
+        self.timeline.stop_time = self.sim_clock
+        self._timeline_started = True
+        self.timeline.run()
+
+        new_keys = 0
+        new_error_count = 0
+        new_error_sum = 0.0
+        for i in sorted(self.requested_links):
+            metrics = self.link_objects[i]["metrics"]
+            metrics.drain()
+            seen_keys, seen_error_count, seen_error_sum = self._keys_seen[i]
+            error_sum = metrics.qber.mean * metrics.qber.count
+            new_keys += metrics.keys_generated - seen_keys
+            new_error_count += metrics.qber.count - seen_error_count
+            new_error_sum += error_sum - seen_error_sum
+            self._keys_seen[i] = (metrics.keys_generated, metrics.qber.count, error_sum)
+            if metrics.keys_generated:
+                self.link_key_rates[i] = metrics.last_key_rate_bps
+            if metrics.qber.count > seen_error_count:
+                self.qber = metrics.last_qber
+
+        slice_seconds = (self.sim_clock - slice_start) * TIMELINE_UNIT_S
+        if new_keys > 0 and slice_seconds > 0:
+            self.slice_key_rate_bps = new_keys * key_size / slice_seconds
+            self.slice_qber = new_error_sum / new_error_count if new_error_count else 0.0
+        else:
+            self.slice_key_rate_bps = 0.0
+            self.slice_qber = 0.0
+        self.keys_generated += new_keys
+        self.key_rate_bps = float(self.link_key_rates.sum())
+
+        all_keys_done = bool(self.requested_links) and all(
+            self._keys_seen[i][0] >= num_keys for i in self.requested_links)
+        done = self.sim_clock >= sim_time or all_keys_done
+        info = {"new_keys": new_keys, "sim_clock": self.sim_clock}
+        return self.get_state(), self.slice_key_rate_bps, done, info
+
+    def _run_timeline(self, active):
+        """
+        Pushes the key requests of the active links, runs the timeline to completion
+        and returns their metrics keyed by link name.
+        """
+        self._build_links(active)
+        logger.debug("Action: Pushing key generation request on %d link(s)...", len(active))
+        self._push_keys(active)
+
+        logger.debug("Running timeline to completion...")
+        self._timeline_started = True
+        start_real_time = time.perf_counter()
+        self.timeline.run()
+        self.last_run_seconds = time.perf_counter() - start_real_time
+        logger.debug("Execution time: %.2f s", self.last_run_seconds)
+
+        results = {}
+        for i in active:
+            sender = self.link_objects[i]["sender"]
+            metrics = self.link_objects[i]["metrics"]
+            metrics.drain()
+            if metrics.keep_raw_keys:
+                throughputs, error_rates = sender.throughputs, sender.error_rates
+            else:
+                # Only the latest samples are kept; the summary carries the running statistics.
+                throughputs = [metrics.last_key_rate_bps] if metrics.key_rate.count else []
+                error_rates = [metrics.last_qber] if metrics.qber.count else []
+            results[self.links.names[i]] = {
+                "throughputs": [float(x) for x in throughputs],
+                "error_rates": [float(x) for x in error_rates],
+                "summary": metrics.summary(),
+            }
+        return results
+
+    def _run_adaptive(self, active):
+        """
+        Pushes the key requests of the active links and runs the timeline slice by
+        slice, reading the running statistics of each link's metrics collector,
+        until the estimates converge, every key is done or `sim_time_ns` is reached.
+        Sets the state from the running means and returns the step info.
+        """
+        self._build_links(active)
+        self._push_keys(active)
+        num_keys = self.config.get("num_keys", 10)
+        sim_time = self.config.get("sim_time_ns", 5e9)
+        check_interval = self.convergence["check_interval_ns"]
+
+        collectors = {i: self.link_objects[i]["metrics"] for i in active}
+        stats = {i: (metrics.key_rate, metrics.qber) for i, metrics in collectors.items()}
+        first_key = {i: metrics.keys_generated for i, metrics in collectors.items()}
+        clock = 0
+        self._timeline_started = True
+        start_real_time = time.perf_counter()
+        while True:
+            clock = min(clock + check_interval, sim_time)
+            self.timeline.stop_time = clock
+            self.timeline.run()
+            for metrics in collectors.values():
+                metrics.drain()
+            self.converged = self._converged(stats)
+            if self.converged or clock >= sim_time or all(
+                    metrics.keys_generated - first_key[i] >= num_keys for i, metrics in collectors.items()):
+                break
+        self.last_run_seconds = time.perf_counter() - start_real_time
+        logger.debug("Adaptive run stopped at %d ns after %.2f s (converged: %s).",
+                     clock, self.last_run_seconds, self.converged)
+
+        confidence = self.convergence["confidence"]
+        rate_half_widths, qber_means, qber_half_widths = [], [], []
+        for i in active:
+            rate_stats, qber_stats = stats[i]
+            metrics = collectors[i]
+            if metrics.keep_raw_keys:
+                history = metrics.protocol.throughputs
+            else:
+                history = [metrics.last_key_rate_bps] if rate_stats.count else []
+            self.throughput_history[self.links.names[i]] = [float(x) for x in history]
+            if rate_stats.count:
+                self.link_key_rates[i] = rate_stats.mean
+                rate_half_widths.append(rate_stats.half_width(confidence))
+            if qber_stats.count:
+                qber_means.append(qber_stats.mean)
+                qber_half_widths.append(qber_stats.half_width(confidence))
+        self.key_rate_bps = float(self.link_key_rates.sum())
+        # Links are independent, so the half-widths of the sums/means add in quadrature.
+        self.key_rate_ci_bps = float(np.sqrt(np.sum(np.square(rate_half_widths)))) if rate_half_widths else 0.0
+        if qber_means:
+            self.qber = float(np.mean(qber_means))
+            self.qber_ci = float(np.sqrt(np.sum(np.square(qber_half_widths))) / len(qber_half_widths))
+        return {"timeline_run_s": self.last_run_seconds, "sim_time_ns": clock,
+                "keys": sum(metrics.keys_generated - first_key[i] for i, metrics in collectors.items()),
+                "converged": self.converged}
+
+    def _converged(self, stats):
+        """
+        True when every link has `min_keys` samples and the half-width of its mean key
+        rate is within `rel_tol` (relative) or `abs_tol_bps`, and, if `qber_abs_tol`
+        is set, the half-width of its mean QBER is within it.
+        """
+        conv = self.convergence
+        confidence = conv["confidence"]
+        for rate_stats, qber_stats in stats.values():
+            if rate_stats.count < max(conv["min_keys"], 2):
+                return False
+            half_width = rate_stats.half_width(confidence)
+            within = half_width <= conv["rel_tol"] * abs(rate_stats.mean)
+            if conv["abs_tol_bps"] is not None:
+                within = within or half_width <= conv["abs_tol_bps"]
+            if not within:
+                return False
+            if conv["qber_abs_tol"] is not None and qber_stats.half_width(confidence) > conv["qber_abs_tol"]:
+                return False
+        return True
+
+    def _update_state(self, active, results):
+        """Get final metrics from each active link's throughput and error-rate history."""
+        qbers = []
+        for i in active:
+            history = results[self.links.names[i]]
+            self.throughput_history[self.links.names[i]] = history["throughputs"]
+            if history["throughputs"] and history["throughputs"][-1] > 0:
+                self.link_key_rates[i] = history["throughputs"][-1]
+            if history["error_rates"]:
+                qbers.append(history["error_rates"][-1])
+        self.key_rate_bps = float(self.link_key_rates.sum())
+        if qbers:
+            self.qber = float(np.mean(qbers))
+        if self.key_rate_bps > 0:
+            logger.debug("SeQUeNCo BB84 finished. Final throughput: %.2f bps", self.key_rate_bps)
 
     def get_state(self):
-        """Returns the final state of the quantum simulation."""
-        return {"key_rate_bps": self.key_rate_bps}
+        """
+        Returns the current state of the quantum simulation.
+        Topologies with more than one link also report the per-link key rates.
+        """
+        state = {"key_rate_bps": self.key_rate_bps}
+        if self.mode == "sliced":
+            state["slice_key_rate_bps"] = self.slice_key_rate_bps
+            state["slice_qber"] = self.slice_qber
+            state["keys_generated"] = self.keys_generated
+        elif self.mode == "adaptive":
+            state["key_rate_ci_bps"] = self.key_rate_ci_bps
+            state["qber"] = self.qber
+            state["qber_ci"] = self.qber_ci
+            state["converged"] = self.converged
+        if self.links is not None and len(self.links) > 1:
+            state["link_key_rate_bps"] = self.link_key_rates.copy()
+        return state
+
+    def state_spec(self):
+        """Schema matching `get_state` (same fields, same order)."""
+        fields = {"key_rate_bps": ((), np.float64)}
+        if self.mode == "sliced":
+            fields["slice_key_rate_bps"] = ((), np.float64)
+            fields["slice_qber"] = ((), np.float64)
+            fields["keys_generated"] = ((), np.int64)
+        elif self.mode == "adaptive":
+            fields["key_rate_ci_bps"] = ((), np.float64)
+            fields["qber"] = ((), np.float64)
+            fields["qber_ci"] = ((), np.float64)
+            fields["converged"] = ((), np.bool_)
+        if self.links is not None and len(self.links) > 1:
+            fields["link_key_rate_bps"] = ((len(self.links),), np.float64)
+        return StateSchema(fields)
+
+    def snapshot(self):
+        """
+        Pickles the current simulation, mid-episode timeline included, for orchestrator
+        checkpoints. Returns None (replay on resume) if the timeline cannot be pickled.
+        """
+        attributes = vars(self)
+        state = {name: attributes[name] for name in self.SNAPSHOT_ATTRIBUTES if name in attributes}
+        try:
+            return pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.warning("Simulator snapshot not supported (%s); checkpoints will replay actions.", e)
+            return None
+
+    def restore(self, snapshot):
+        vars(self).update(pickle.loads(snapshot))
+
+    def reconfigure(self, sim_config):
+        """
+        Replaces the config of a built simulator with one that has the same topology
+        and only differs in scalar parameters (`key_size`, `num_keys`, `attenuation`,
+        `topology.distance`), e.g. the next point of a parameter sweep. The new values
+        take effect at the next `reset()`, which applies the new link distances and
+        attenuations to the already built channels instead of rebuilding them.
+        """
+        self.config = sim_config
+        self.convergence = dict(self.DEFAULT_CONVERGENCE, **self.config.get("convergence", {}))
+        self._links_changed = True
 
     def reset(self):
         """
-        Resets and re-setups the SeQUeNCo simulation.
+        Resets the SeQUeNCo simulation, restoring the topology snapshot when one is
+        available and re-running `setup()` otherwise.
         Returns the initial state and an empty info dictionary.
         """
-        self.timeline = None
-        self.nodes = {}
-        self.sender_protocol = None
         self.key_rate_bps = 0.0
-        self.setup()
+        self.qber = 0.0
+        self.throughput_history = {}
+        self.key_rate_ci_bps = 0.0
+        self.qber_ci = 0.0
+        self.converged = False
+        self._timeline_started = False
+        self._reset_slice_state()
+        if self.reset_mode == "snapshot" and self._template is not None:
+            self._restore_template()
+            if self._links_changed:
+                self.links = LinkTable.from_config(self.config)
+                self._map_orbit_links()
+                for i in self.link_objects:
+                    self._set_link_channels(i)
+            self.link_key_rates = np.zeros(len(self.links), dtype=np.float64)
+        else:
+            self.timeline = None
+            self.nodes = {}
+            self.link_objects = {}
+            self.sender_protocol = None
+            self.setup()
+        self._links_changed = False
+        if self.config.get("orbit_restart_on_reset", False):
+            self.orbit_step = self.config.get("orbit_start_step", 0)
+        self._apply_orbit_geometry()
 
         # Return initial state (observation) and an empty info dict
         return self.get_state(), {}
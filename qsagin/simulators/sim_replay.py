@@ -0,0 +1,330 @@
+# File: qsagin/simulators/sim_replay.py
+import json
+import os
+import shutil
+
+import numpy as np
+
+from .base_simulator import BaseSimulator
+from ..core.log import get_logger
+from ..core.state import StateSchema, action_row, split_action
+
+logger = get_logger("simulators.replay")
+
+TRACE_COLUMNS = ("step", "action", "obs", "reward", "done")
+RESET_ACTION = -1
+MANIFEST = "trace.json"
+
+
+def _trace_chunks(trace_dir):
+    """Chunk directories of a trace, in recording order."""
+    with open(os.path.join(trace_dir, MANIFEST)) as f:
+        manifest = json.load(f)
+    if "chunks" not in manifest:
+        # Traces written before chunked recording hold a single set of columns.
+        return [trace_dir]
+    return [os.path.join(trace_dir, chunk["name"]) for chunk in manifest["chunks"]]
+
+
+def _merge_action_chunks(chunks):
+    """
+    Concatenates the action columns of several chunks, which may have been saved
+    with different layouts (see TraceRecorder), into one column.
+    """
+    if all(chunk.ndim == 1 for chunk in chunks):
+        return np.concatenate(chunks)
+    chunks = [chunk.reshape(-1, 1) if chunk.ndim == 1 else chunk for chunk in chunks]
+    widths = {chunk.shape[1] for chunk in chunks}
+    integral = len(widths) == 1 and all(chunk.dtype.kind == "i" for chunk in chunks)
+    dtype = np.dtype(np.int64 if integral else np.float64)
+    width = max(widths)
+    merged = np.full((sum(len(chunk) for chunk in chunks), width),
+                     np.nan if dtype.kind == "f" else RESET_ACTION, dtype=dtype)
+    offset = 0
+    for chunk in chunks:
+        # Integer chunks only pad reset rows (looked up by step), so -1 is kept as is.
+        merged[offset:offset + len(chunk), :chunk.shape[1]] = chunk
+        offset += len(chunk)
+    return merged
+
+
+class TraceRecorder(BaseSimulator):
+    """
+    Transparent wrapper that records every reset/step of a classical simulator
+    (normally NS3Simulator) into a trace directory readable by ReplayNS3Simulator.
+
+    Each row holds the step index within its episode (0 for the reset observation),
+    the action that produced it, the observation, reward and done flag. Like
+    TrajectoryRecorder, rows are buffered in a preallocated chunk that is flushed
+    to disk (one .npy file per column) whenever it is full, so memory is bounded
+    by one chunk and a crash only loses the rows of the current chunk.
+
+    Integer actions are saved as an int64 column (-1 for resets). Any other action
+    (Box arrays, MultiDiscrete vectors, None) is saved flattened as one row of a
+    2-D column, int64 when every action of the chunk is an integer vector of one
+    length and NaN-padded float64 otherwise.
+
+    Layout of `directory`:
+        chunk_000000/step.npy, action.npy, obs.npy, reward.npy, done.npy
+        chunk_000001/...
+        trace.json   (updated after every flush)
+    """
+    def __init__(self, simulator, directory, chunk_size=4096):
+        """
+        Args:
+            simulator: The classical simulator to record.
+            directory (str): Output directory (created if needed; an existing
+                             trace in it is replaced).
+            chunk_size (int): Number of rows buffered in memory per chunk.
+        """
+        super().__init__(simulator.config)
+        self.simulator = simulator
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.chunks = []
+        self.episode_step = 0
+        self._buffers = None
+        self._actions = []
+        self._fill = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _allocate(self, obs_dim):
+        self._buffers = {
+            "step": np.empty(self.chunk_size, dtype=np.int64),
+            "obs": np.empty((self.chunk_size, obs_dim), dtype=np.float64),
+            "reward": np.empty(self.chunk_size, dtype=np.float64),
+            "done": np.empty(self.chunk_size, dtype=bool),
+        }
+
+    def _append(self, step, action, obs, reward, done):
+        obs = np.ravel(np.asarray(obs, dtype=np.float64))
+        if self._buffers is None:
+            self._allocate(obs.shape[0])
+        i = self._fill
+        buffers = self._buffers
+        buffers["step"][i] = step
+        buffers["obs"][i] = obs
+        buffers["reward"][i] = reward
+        buffers["done"][i] = done
+        self._actions.append(action)
+        self._fill += 1
+        if self._fill == self.chunk_size:
+            self.flush()
+
+    def setup(self):
+        return self.simulator.setup()
+
+    def step(self, action):
+        obs, reward, done, info = self.simulator.step(action)
+        self.episode_step += 1
+        classical_action, _ = split_action(action)
+        # Copied, so a caller reusing its action buffer does not rewrite the trace.
+        recorded = np.empty(0) if classical_action is None else np.array(classical_action)
+        self._append(self.episode_step, recorded, obs, float(reward), bool(done))
+        return obs, reward, done, info
+
+    def get_state(self):
+        return self.simulator.get_state()
+
+    def state_spec(self):
+        return self.simulator.state_spec()
+
+    def reset(self):
+        obs, info = self.simulator.reset()
+        self.episode_step = 0
+        self._append(0, None, obs, 0.0, False)
+        return obs, info
+
+    def _action_column(self):
+        actions = self._actions
+        step_actions = [action for action in actions if action is not None]
+        if all(action.ndim == 0 and action.dtype.kind in "iub" for action in step_actions):
+            return np.asarray([RESET_ACTION if action is None else int(action) for action in actions],
+                              dtype=np.int64)
+        widths = {action.size for action in step_actions}
+        integral = len(widths) == 1 and all(action.dtype.kind in "iub" for action in step_actions)
+        dtype = np.dtype(np.int64 if integral else np.float64)
+        width = max(widths | {1})
+        return np.stack([action_row(action, width, dtype) for action in actions])
+
+    def flush(self):
+        """Writes the buffered rows as a new chunk and updates trace.json."""
+        if self._fill == 0:
+            return
+        name = f"chunk_{len(self.chunks):06d}"
+        tmp_dir = os.path.join(self.directory, name + ".tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+        arrays = {column: buffer[:self._fill] for column, buffer in self._buffers.items()}
+        arrays["action"] = self._action_column()
+        for column, array in arrays.items():
+            np.save(os.path.join(tmp_dir, f"{column}.npy"), array)
+        final_dir = os.path.join(self.directory, name)
+        if os.path.exists(final_dir):
+            # Left over from an earlier trace in the same directory.
+            shutil.rmtree(final_dir)
+        os.replace(tmp_dir, final_dir)
+        self.chunks.append({"name": name, "rows": self._fill})
+        self._write_manifest()
+        self._actions = []
+        self._fill = 0
+
+    # Kept for callers of the pre-chunking API.
+    save = flush
+
+    def _write_manifest(self):
+        manifest = {
+            "rows": sum(chunk["rows"] for chunk in self.chunks),
+            "obs_dim": int(self._buffers["obs"].shape[1]),
+            "chunks": self.chunks,
+        }
+        tmp_path = os.path.join(self.directory, MANIFEST + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, os.path.join(self.directory, MANIFEST))
+
+    def close(self):
+        self.flush()
+        if hasattr(self.simulator, "close"):
+            self.simulator.close()
+
+
+class ReplayNS3Simulator(BaseSimulator):
+    """
+    Classical simulator that serves recorded ns-3 observations and rewards from a
+    memory-mapped trace (see TraceRecorder) instead of talking to ns-3.
+
+    Lookups are indexed by (step within episode, action): the trace rows are sorted
+    once by that composite key, so each step is a binary search over the index plus
+    one row read from the memory map. Non-integer actions are indexed by the id of
+    their distinct recorded value. When several recorded rows match, they are
+    served round-robin, with a separate cursor per (step, action) key. Config keys:
+        - "trace_dir": directory written by TraceRecorder (required).
+        - "fallback": what to do when the exact (step, action) pair was never
+          recorded: "any_action" (default) serves a row of the same step recorded
+          with a different action, "done" ends the episode.
+    """
+    def __init__(self, sim_config):
+        super().__init__(sim_config)
+        trace_dir = self.config["trace_dir"]
+        self.fallback = self.config.get("fallback", "any_action")
+        chunk_dirs = _trace_chunks(trace_dir)
+        if not chunk_dirs:
+            raise ValueError(f"The trace in {trace_dir} contains no rows.")
+        parts = {column: [np.load(os.path.join(path, f"{column}.npy"), mmap_mode="r") for path in chunk_dirs]
+                 for column in TRACE_COLUMNS}
+        # Observations stay memory-mapped per chunk; the small columns are merged.
+        self._obs_chunks = parts.pop("obs")
+        self._chunk_offsets = np.cumsum([0] + [len(chunk) for chunk in self._obs_chunks])
+        self.columns = {column: chunks[0] if len(chunks) == 1 else np.concatenate(chunks)
+                        for column, chunks in parts.items() if column != "action"}
+        self.columns["action"] = _merge_action_chunks(parts["action"])
+        self._build_index()
+        self.episode_step = 0
+        self.last_observation = None
+        self._cursors = {}
+        self.misses = 0
+
+    def _build_index(self):
+        steps = np.asarray(self.columns["step"])
+        actions = np.asarray(self.columns["action"])
+        if actions.ndim == 1:
+            # Integer actions; shift them so that the reset marker (-1) becomes 0.
+            codes = actions - RESET_ACTION
+            self._action_ids = None
+        else:
+            # One id per distinct action row, compared bytewise (so NaN padding matches).
+            rows = np.ascontiguousarray(actions).view(
+                np.dtype((np.void, actions.dtype.itemsize * actions.shape[1]))).ravel()
+            unique, codes = np.unique(rows, return_inverse=True)
+            codes = codes.ravel()
+            self._action_ids = {value.tobytes(): i for i, value in enumerate(unique)}
+        self._num_action_keys = int(codes.max()) + 1 if len(codes) else 1
+        keys = steps * self._num_action_keys + codes
+        self._order = np.argsort(keys, kind="stable")
+        self._sorted_keys = keys[self._order]
+        self._sorted_steps = steps[self._order]
+
+    def _action_code(self, action):
+        """Index key of an action, or None if it was never recorded."""
+        if self._action_ids is None:
+            if action is None:
+                return None
+            value = np.asarray(action)
+            if value.ndim != 0 or value.dtype.kind not in "iubf":
+                return None
+            if value.dtype.kind == "f" and not float(value).is_integer():
+                return None
+            code = int(value) - RESET_ACTION
+            return code if 0 <= code < self._num_action_keys else None
+        column = self.columns["action"]
+        row = action_row(action, column.shape[1], column.dtype)
+        return None if row is None else self._action_ids.get(row.tobytes())
+
+    def _step_rows(self, step):
+        # Resets are only recorded at step 0, so these are the rows of any action.
+        lo, hi = np.searchsorted(self._sorted_steps, [step, step + 1])
+        return (lo, hi) if hi > lo else None
+
+    def _rows_for(self, step, action):
+        code = self._action_code(action)
+        if code is not None:
+            key = step * self._num_action_keys + code
+            lo, hi = np.searchsorted(self._sorted_keys, [key, key + 1])
+            if hi > lo:
+                return lo, hi
+        if self.fallback == "any_action":
+            rows = self._step_rows(step)
+            if rows is not None:
+                self.misses += 1
+            return rows
+        return None
+
+    def _serve(self, lo, hi):
+        cursor = self._cursors.get((lo, hi), 0)
+        row = self._order[lo + cursor % (hi - lo)]
+        self._cursors[(lo, hi)] = cursor + 1
+        chunk = int(np.searchsorted(self._chunk_offsets, row, side="right") - 1)
+        obs = self._obs_chunks[chunk][row - self._chunk_offsets[chunk]]
+        return np.asarray(obs), float(self.columns["reward"][row]), bool(self.columns["done"][row])
+
+    def setup(self):
+        pass
+
+    def step(self, action):
+        action, _ = split_action(action)
+        self.episode_step += 1
+        rows = self._rows_for(self.episode_step, action)
+        if rows is None:
+            logger.debug("No recorded row for step %d / action %s; ending episode.", self.episode_step, action)
+            return self.last_observation, 0.0, True, {"replay_miss": True}
+        obs, reward, done = self._serve(*rows)
+        self.last_observation = obs
+        return obs, reward, done, {}
+
+    def get_state(self):
+        return self.last_observation
+
+    def state_spec(self):
+        obs = self._obs_chunks[0]
+        return StateSchema.array(obs.shape[1:], obs.dtype)
+
+    def snapshot(self):
+        return {"episode_step": self.episode_step, "last_observation": self.last_observation,
+                "cursors": dict(self._cursors), "misses": self.misses}
+
+    def restore(self, snapshot):
+        self.episode_step = snapshot["episode_step"]
+        self.last_observation = snapshot["last_observation"]
+        self._cursors = dict(snapshot["cursors"])
+        self.misses = snapshot["misses"]
+
+    def reset(self):
+        self.episode_step = 0
+        rows = self._step_rows(0)
+        if rows is None:
+            raise RuntimeError("The trace does not contain any reset observation.")
+        self.last_observation, _, _ = self._serve(*rows)
+        return self.last_observation, {}
+
+    def close(self):
+        pass
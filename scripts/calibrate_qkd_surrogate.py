@@ -0,0 +1,42 @@
+# File: scripts/calibrate_qkd_surrogate.py
+import sys
+
+# Add the project root to the Python path
+sys.path.append('/app')
+
+from qsagin.simulators.qkd_analytic import calibrate
+
+def define_calibration_configs():
+    """A small grid of SequenceSimulator configs spanning the distances we train on."""
+    configs = []
+    for distance in (1e3, 5e3, 10e3, 20e3):
+        configs.append({
+            "sim_time_ns": 10e9,
+            "topology": {
+                "nodes": ["Alice", "Bob"],
+                "distance": distance,
+            },
+            "key_size": 256,
+            "num_keys": 10,
+        })
+    return configs
+
+def main():
+    print("=" * 60)
+    print("      CALIBRATING ANALYTIC BB84 SURROGATE AGAINST SeQUeNCo")
+    print("=" * 60)
+
+    result = calibrate(define_calibration_configs(), runs_per_config=3, holdout=0.25)
+
+    print(f"\nFitted analytic_scale : {result['scale']:.4f}")
+    for label, errors in (("Fit", result), ("Validation", result["validation"])):
+        print(f"\n{label} samples{' ' * (14 - len(label))}: {errors['samples']}")
+        if errors["samples"]:
+            print(f"Mean relative error   : {errors['mean_rel_error']:.2%}")
+            print(f"P95 relative error    : {errors['p95_rel_error']:.2%}")
+            print(f"Max relative error    : {errors['max_rel_error']:.2%}")
+    print("\nUse it with: quantum_network config -> {\"mode\": \"analytic\", "
+          f"\"analytic_scale\": {result['scale']:.4f}}}")
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ import numpy as np # <--- THÊM DÒNG NÀY
 sys.path.append('/app')
 
 from qsagin.core.orchestrator import Orchestrator
+from qsagin.core.log import configure_logging
 from qsagin.simulators.sim_classical import NS3Simulator
 from qsagin.agents.base_agent import RandomAgent
 from qsagin.simulators.base_simulator import BaseSimulator
@@ -26,6 +27,9 @@ def main():
     Main function to run the Python side of the ns-3 integration test.
     This script should be run AFTER the ns-3 simulation has been started in another terminal.
     """
+    # Show framework messages, including the per-step orchestrator trace.
+    configure_logging(level="INFO", components={"orchestrator": "DEBUG"})
+
     print("=" * 60)
     print("      Q-SAGINsim: NS3-GYM PYTHON AGENT (CLIENT MODE)")
     print("=" * 60)
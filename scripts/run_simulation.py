@@ -8,6 +8,7 @@ import numpy as np
 sys.path.append('/app')
 
 from qsagin.core.orchestrator import Orchestrator
+from qsagin.core.log import configure_logging
 from qsagin.simulators.sim_classical import NS3Simulator
 from qsagin.simulators.sim_quantum import SequenceSimulator
 from qsagin.agents.base_agent import RandomAgent
@@ -41,6 +42,9 @@ def define_scenario_config():
     return config
 
 def main():
+    # Show framework messages, including the per-step orchestrator trace.
+    configure_logging(level="INFO", components={"orchestrator": "DEBUG"})
+
     print("=" * 60)
     print("      RUNNING FULL Q-SAGINSIM FRAMEWORK (NS-3 + SeQUeNCo)")
     print("=" * 60)
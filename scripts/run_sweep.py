@@ -0,0 +1,62 @@
+# File: scripts/run_sweep.py
+import argparse
+import json
+import sys
+
+# Add the project root to the Python path
+sys.path.append('/app')
+
+from qsagin.core.log import configure_logging
+from qsagin.core.sweep import grid_design, random_design, run_sweep
+
+def define_sweep_spec():
+    """Default study: BB84 key rate over distance, attenuation, key size and number of keys."""
+    return {
+        "base": {
+            "quantum_network": {
+                "sim_time_ns": 10e9,
+                "topology": {
+                    "nodes": ["Alice", "Bob"],
+                    "distance": 1e3,
+                },
+                "key_size": 256,
+                "num_keys": 10,
+            },
+        },
+        "grid": {
+            "quantum_network.topology.distance": [1e3, 5e3, 10e3, 20e3, 50e3],
+            "quantum_network.attenuation": [0.0002, 0.0003],
+            "quantum_network.key_size": [128, 256, 512],
+            "quantum_network.num_keys": [5, 10, 20],
+        },
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel, resumable QKD parameter sweep.")
+    parser.add_argument("--spec", help="JSON file with 'base' and either 'grid' or "
+                                       "'random' (+ 'num_points', 'seed'). Default: built-in study.")
+    parser.add_argument("--output", default="sweep_results.jsonl",
+                        help="Append-only JSONL store; re-running with the same file resumes.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count, 0 = run in-process).")
+    parser.add_argument("--runs", type=int, default=1, help="Timeline runs per point.")
+    args = parser.parse_args()
+
+    configure_logging(level="INFO")
+
+    spec = define_sweep_spec()
+    if args.spec:
+        with open(args.spec) as f:
+            spec = json.load(f)
+    if "grid" in spec:
+        design = grid_design(spec["grid"])
+    else:
+        # Lists are choices; {"low", "high", "log"} objects are continuous ranges.
+        design = random_design(spec["random"], spec["num_points"], spec.get("seed"))
+
+    summary = run_sweep(spec["base"], design, args.output, workers=args.workers, runs=args.runs)
+    print(f"\nSweep finished: {summary['completed']} completed, {summary['failed']} failed, "
+          f"{summary['skipped']} skipped (already in {args.output}).")
+
+if __name__ == "__main__":
+    main()
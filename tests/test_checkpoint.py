@@ -0,0 +1,72 @@
+# File: tests/test_checkpoint.py
+import numpy as np
+import pytest
+
+from qsagin.agents.base_agent import RandomAgent
+from qsagin.core.checkpoint import CheckpointManager, list_checkpoints
+from qsagin.core.orchestrator import Orchestrator
+from qsagin.simulators.sim_mock import MockClassicalSimulator, MockQuantumSimulator
+
+NUM_STEPS = 100
+CRASH_AT = 70
+
+
+class Crash(Exception):
+    pass
+
+
+class LoggingAgent(RandomAgent):
+    """Logs every transition (plus a draw from numpy's global RNG) and can crash."""
+    crash_at = None
+
+    def __init__(self, **kwargs):
+        super().__init__(num_quantum_links=3, **kwargs)
+        self.transitions = []
+
+    def learn(self, state, action, reward, next_state, done):
+        if len(self.transitions) == LoggingAgent.crash_at:
+            LoggingAgent.crash_at = None
+            raise Crash()
+        self.transitions.append((int(action), round(float(reward), 12), bool(done),
+                                 float(np.random.random())))
+
+
+class NoSnapshotSimulator(MockClassicalSimulator):
+    """Classical mock without snapshots, restored by replaying the action log."""
+    def snapshot(self):
+        return None
+
+    def supports_snapshot(self):
+        return False
+
+
+def _orchestrator(classical_cls, action_repeat, checkpoint=None):
+    agent = LoggingAgent(seed=1)
+    agent.action_repeat = action_repeat
+    classical_sim = classical_cls({"seed": 5, "episode_length": 10 ** 6})
+    return Orchestrator(classical_sim, MockQuantumSimulator({"done_on_step": False}), agent, checkpoint=checkpoint)
+
+
+@pytest.mark.parametrize("classical_cls", [MockClassicalSimulator, NoSnapshotSimulator],
+                         ids=["snapshot", "action_log"])
+@pytest.mark.parametrize("action_repeat", [1, 3])
+def test_resume_reproduces_the_uninterrupted_run(tmp_path, classical_cls, action_repeat):
+    np.random.seed(0)
+    reference = _orchestrator(classical_cls, action_repeat)
+    reference.run(NUM_STEPS)
+    expected = reference.agent.transitions
+    assert len(expected) >= NUM_STEPS
+
+    np.random.seed(0)
+    crashed = _orchestrator(classical_cls, action_repeat, CheckpointManager(str(tmp_path), every=20, keep=2))
+    LoggingAgent.crash_at = CRASH_AT
+    with pytest.raises(Crash):
+        crashed.run(NUM_STEPS)
+    crashed.checkpoint.close()
+    assert list_checkpoints(str(tmp_path))
+
+    np.random.seed(123)     # resume_from restores the global RNG state itself
+    resumed = _orchestrator(classical_cls, action_repeat, CheckpointManager(str(tmp_path), every=20))
+    resumed.resume_from(str(tmp_path))
+    resumed.checkpoint.close()
+    assert resumed.agent.transitions == expected
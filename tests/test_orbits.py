@@ -0,0 +1,69 @@
+# File: tests/test_orbits.py
+import numpy as np
+import pytest
+
+from qsagin.orbits import JD_J2000, OrbitGeometry, gmst, julian_date, tle_epoch
+
+ALTITUDE = 500e3
+
+
+def _overhead_config(min_elevation=10.0):
+    # Equatorial circular orbit starting straight above a station at (0, 0).
+    return {
+        "satellites": [{"name": "sat", "altitude_m": ALTITUDE}],
+        "ground_stations": [{"name": "gs", "lat_deg": 0.0, "lon_deg": 0.0}],
+        "duration_s": 1200.0, "step_s": 1.0, "min_elevation_deg": min_elevation,
+    }
+
+
+def _tle(epoch_day, mean_anomaly_deg, mean_motion_rev_day, inclination_deg=51.6, raan_deg=40.0):
+    line1 = f"1 00001U 24001A   24{epoch_day:012.8f}  .00000000  00000-0  00000-0 0  9990"
+    line2 = (f"2 00001 {inclination_deg:8.4f} {raan_deg:8.4f} 0000000 {0.0:8.4f} "
+             f"{mean_anomaly_deg:8.4f} {mean_motion_rev_day:11.8f}    10")
+    return [line1, line2]
+
+
+def test_overhead_pass_has_minimum_slant_range_equal_to_altitude():
+    geometry = OrbitGeometry.from_config(_overhead_config())
+    slant_range = np.asarray(geometry.slant_range[0, 0])
+    assert slant_range.min() == pytest.approx(ALTITUDE, abs=1.0)
+    assert geometry.elevation[0, 0, 0] == pytest.approx(90.0, abs=1e-3)
+
+
+def test_window_edges_follow_the_elevation_mask():
+    geometry = OrbitGeometry.from_config(_overhead_config(min_elevation=10.0))
+    elevation = np.asarray(geometry.elevation[0, 0])
+    (_, _, start, end), = geometry.windows()
+    assert start == 0.0
+    last = int(end / geometry.times[1])
+    assert elevation[last] >= 10.0 > elevation[last + 1]
+    # The satellite sets where the elevation crosses the mask (1 s grid).
+    assert elevation[last] - elevation[last + 1] > elevation[last] - 10.0
+
+
+def test_gmst_and_tle_epoch():
+    assert np.degrees(gmst(JD_J2000)) == pytest.approx(280.46061837)
+    assert julian_date("2000-01-01T12:00:00Z") == pytest.approx(JD_J2000)
+    assert tle_epoch(_tle(1.5, 0.0, 15.5)[0]) == pytest.approx(julian_date("2024-01-01T12:00:00Z"))
+
+
+def test_tles_of_different_epochs_describe_the_same_orbit():
+    mean_motion_rev_day = 15.5
+    mean_motion = mean_motion_rev_day * 2.0 * np.pi / 86400.0
+    hours = 3.0
+    advanced = np.degrees(mean_motion * hours * 3600.0) % 360.0
+    ground_stations = [{"name": "gs", "lat_deg": 45.0, "lon_deg": 10.0}]
+    common = {"ground_stations": ground_stations, "duration_s": 6000.0, "step_s": 10.0,
+              "start_epoch": "2024-01-02T00:00:00Z"}
+    early = OrbitGeometry.from_config(dict(common, satellites=[
+        {"name": "sat", "tle": _tle(1.5, 0.0, mean_motion_rev_day)}]))
+    late = OrbitGeometry.from_config(dict(common, satellites=[
+        {"name": "sat", "tle": _tle(1.5 + hours / 24.0, advanced, mean_motion_rev_day)}]))
+    np.testing.assert_allclose(early.slant_range, late.slant_range, rtol=1e-5)
+
+
+def test_start_epoch_rotates_the_earth():
+    satellite = {"name": "sat", "altitude_m": ALTITUDE, "epoch": "2000-01-01T12:00:00Z"}
+    geometry = OrbitGeometry.from_config(dict(_overhead_config(), satellites=[satellite]))
+    # At J2000 Greenwich is 280.46 deg from the ECI x axis, so the satellite is not overhead.
+    assert geometry.slant_range[0, 0, 0] > 5 * ALTITUDE
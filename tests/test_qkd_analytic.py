@@ -0,0 +1,39 @@
+# File: tests/test_qkd_analytic.py
+import numpy as np
+import pytest
+
+from qsagin.simulators.qkd_analytic import bb84_key_rate, calibrate, params_from_config
+from qsagin.simulators.qkd_topology import LinkTable
+
+
+def _chain_config(distance):
+    return {
+        "sim_time_ns": 1e10, "key_size": 64, "num_keys": 2, "seed": 0,
+        "topology": {
+            "nodes": ["A", "B", "C"],
+            "links": [{"src": "A", "dst": "B", "distance": distance},
+                      {"src": "B", "dst": "C", "distance": 2 * distance}],
+        },
+    }
+
+
+def test_link_budget_matches_the_surrogate_loss():
+    config = _chain_config(1e4)
+    links = LinkTable.from_config(config)
+    params = params_from_config(config)
+    params.update(distance=links.distance, attenuation=links.attenuation)
+    derived, _ = bb84_key_rate(**params)
+    budgeted, _ = bb84_key_rate(**dict(params, transmissivity=links.link_budget()["transmissivity"]))
+    np.testing.assert_allclose(budgeted, derived)
+    assert budgeted[0] > budgeted[1]
+
+
+def test_calibrate_predicts_per_link_and_holds_out_configs():
+    pytest.importorskip("sequence")
+    configs = [_chain_config(distance) for distance in (1e3, 2e3, 4e3, 8e3)]
+    result = calibrate(configs, holdout=0.25, seed=0)
+    # Two links per config; one of the four configs is held out.
+    assert len(result["measured"]) == 8
+    assert result["is_validation"].sum() == 2
+    assert result["validation"]["samples"] <= 2
+    assert result["samples"] <= 6
@@ -0,0 +1,76 @@
+# File: tests/test_qkd_cache.py
+import json
+
+import pytest
+
+from qsagin.simulators.qkd_cache import CACHE_KEY_FIELDS, QKDResultCache
+
+BASE = {
+    "sim_time_ns": 1e10, "attenuation": 1e-5, "key_size": 256, "num_keys": 10, "seed": 0,
+    "light_source": {"frequency": 8e7}, "detector": {"efficiency": 0.9},
+    "keep_raw_keys": False, "metrics_window": 10,
+    "topology": {"nodes": ["Alice", "Bob"], "distance": 1e3},
+}
+CHANGED = {
+    "sim_time_ns": 2e10, "attenuation": 2e-5, "key_size": 512, "num_keys": 5, "seed": 1,
+    "light_source": {"frequency": 1e8}, "detector": {"efficiency": 0.8},
+    "keep_raw_keys": True, "metrics_window": 5,
+}
+
+
+@pytest.mark.parametrize("field", CACHE_KEY_FIELDS)
+def test_key_depends_on_every_key_field(field):
+    assert set(CHANGED) == set(CACHE_KEY_FIELDS)
+    assert QKDResultCache.make_key(dict(BASE, **{field: CHANGED[field]})) != QKDResultCache.make_key(BASE)
+
+
+def test_key_depends_on_topology_links_and_distances():
+    key = QKDResultCache.make_key(BASE, [0], [1e3])
+    assert key == QKDResultCache.make_key(json.loads(json.dumps(BASE)), [0], [1e3])
+    assert key != QKDResultCache.make_key(BASE, [0], [2e3])
+    assert key != QKDResultCache.make_key(BASE, [1], [1e3])
+    moved = dict(BASE, topology={"nodes": ["Alice", "Bob"], "distance": 2e3})
+    assert key != QKDResultCache.make_key(moved, [0], [1e3])
+
+
+def test_omitted_fields_share_the_key_of_their_defaults():
+    explicit = {"seed": 0, "keep_raw_keys": False, "metrics_window": 10}
+    assert QKDResultCache.make_key({"seed": 0}) == QKDResultCache.make_key(explicit)
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = QKDResultCache(max_memory_entries=2)
+    cache.put("a", {"v": 1})
+    cache.put("b", {"v": 2})
+    assert cache.get("a") == {"v": 1}    # "b" is now the least recently used
+    cache.put("c", {"v": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": 1} and cache.get("c") == {"v": 3}
+    assert cache.stats["memory_hits"] == 3 and cache.stats["misses"] == 1
+
+
+def test_disk_tier_promotes_entries_to_memory(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    writer = QKDResultCache(path=path)
+    writer.put("k", {"links": {"Alice-Bob": [1.0]}})
+    writer.close()
+
+    reader = QKDResultCache(path=path)
+    assert reader.get("k") == {"links": {"Alice-Bob": [1.0]}}
+    assert reader.get("k") is not None
+    assert reader.stats["disk_hits"] == 1 and reader.stats["memory_hits"] == 1
+    reader.close()
+
+
+def test_disk_tier_evicts_by_size(tmp_path):
+    entry = {"payload": "x" * 100}
+    size = len(json.dumps(entry))
+    cache = QKDResultCache(max_memory_entries=1, path=str(tmp_path / "cache.sqlite"), max_disk_bytes=2 * size)
+    cache.put("a", entry)
+    cache.put("b", entry)
+    cache.get("a")                      # refreshes "a" on disk ("b" is in memory)
+    cache.put("c", entry)               # over budget: the least recently accessed row goes
+    cache._memory.clear()
+    assert cache.get("b") is None
+    assert cache.get("a") == entry and cache.get("c") == entry
+    cache.close()
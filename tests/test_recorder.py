@@ -0,0 +1,42 @@
+# File: tests/test_recorder.py
+import numpy as np
+import pytest
+
+from qsagin.core.recorder import TrajectoryDataset, TrajectoryRecorder
+
+
+def _state(value):
+    return {"classical": np.full(3, value), "quantum": {"key_rate_bps": value}}
+
+
+def test_scalar_actions_keep_the_pair_layout(tmp_path):
+    with TrajectoryRecorder(str(tmp_path), chunk_size=2) as recorder:
+        for step in range(3):
+            recorder.record(_state(step), (step, 0), 1.0, _state(step + 1), False)
+    dataset = TrajectoryDataset(str(tmp_path))
+    assert len(dataset) == 3 and dataset.num_chunks == 2
+    assert dataset.action_dim == 1
+    np.testing.assert_array_equal(dataset[2]["action"], [2, 0])
+    np.testing.assert_array_equal(dataset[1]["state"], [1, 1, 1, 1])
+
+
+def test_vector_actions_are_stored(tmp_path):
+    mask = np.array([True, False, True])
+    with TrajectoryRecorder(str(tmp_path), chunk_size=4, action_dim=3) as recorder:
+        recorder.record(_state(0), 1, 0.0, _state(1), False)
+        recorder.record(_state(1), mask, 0.0, _state(2), False)
+        recorder.record(_state(2), {"classical": 0.5, "quantum": [2, 0]}, 0.0, _state(3), True)
+    actions = np.stack([row["action"] for row in TrajectoryDataset(str(tmp_path))])
+    np.testing.assert_array_equal(actions[0], [1, np.nan, np.nan, 1, np.nan, np.nan])
+    np.testing.assert_array_equal(actions[1], [1, 0, 1, 1, 0, 1])
+    np.testing.assert_array_equal(actions[2], [0.5, np.nan, np.nan, 2, 0, np.nan])
+
+
+def test_action_dim_is_sized_from_the_first_action(tmp_path):
+    recorder = TrajectoryRecorder(str(tmp_path))
+    recorder.record(_state(0), [1, 0], 0.0, _state(1), False)
+    with pytest.raises(ValueError):
+        recorder.record(_state(1), [1, 0, 1], 0.0, _state(2), False)
+    recorder.close()
+    with pytest.raises(ValueError):
+        TrajectoryRecorder(str(tmp_path), action_dim=3).record(_state(0), 0, 0.0, _state(1), False)
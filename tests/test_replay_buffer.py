@@ -0,0 +1,97 @@
+# File: tests/test_replay_buffer.py
+import numpy as np
+import pytest
+
+from qsagin.agents.base_agent import BaseAgent
+from qsagin.agents.replay_buffer import PrioritizedReplayBuffer, ReplayBuffer, SumTree
+
+
+def _add(buffer, count, start=0):
+    for i in range(start, start + count):
+        buffer.add(np.full(2, i), 0, float(i), np.full(2, i + 1), False)
+
+
+def test_sum_tree_find_uses_prefix_sums():
+    tree = SumTree(5)
+    tree.update(np.arange(5), [1.0, 2.0, 3.0, 4.0, 0.0])
+    assert tree.total == 10.0
+    # Leaf i covers the cumulative range (sum(p[:i]), sum(p[:i + 1])].
+    found = tree.find([0.5, 1.0, 1.5, 3.0, 3.1, 6.0, 9.99])
+    np.testing.assert_array_equal(found, [0, 0, 1, 1, 2, 2, 3])
+
+
+def test_sum_tree_update_propagates_to_the_root():
+    tree = SumTree(6)
+    tree.update(np.arange(6), np.ones(6))
+    tree.update([2, 5], [10.0, 0.5])
+    assert tree.total == pytest.approx(1 + 1 + 10 + 1 + 1 + 0.5)
+    internal = np.arange(1, tree.leaves)
+    np.testing.assert_allclose(tree.tree[internal], tree.tree[2 * internal] + tree.tree[2 * internal + 1])
+    np.testing.assert_array_equal(tree[[2, 5]], [10.0, 0.5])
+    assert tree.find([2.5])[0] == 2
+
+
+def test_importance_weights_follow_priorities():
+    buffer = PrioritizedReplayBuffer(4, 2, alpha=1.0, beta=1.0, epsilon=0.0, seed=0)
+    _add(buffer, 2)
+    buffer.update_priorities([0, 1], [1.0, 3.0])
+    batch = buffer.sample(8)
+    # P = (0.25, 0.75), w = (N * P) ** -beta = (2, 2/3), normalised to a maximum of 1.
+    assert (batch["indices"] == 0).sum() == 2
+    np.testing.assert_allclose(batch["weights"][batch["indices"] == 0], 1.0)
+    np.testing.assert_allclose(batch["weights"][batch["indices"] == 1], 1.0 / 3.0)
+
+
+def test_update_priorities_raises_the_priority_of_new_transitions():
+    buffer = PrioritizedReplayBuffer(4, 2, alpha=1.0, epsilon=0.5, seed=0)
+    _add(buffer, 2)
+    np.testing.assert_array_equal(buffer.tree[[0, 1]], [1.0, 1.0])
+    buffer.update_priorities([0, 1], [-4.0, 0.0])
+    np.testing.assert_array_equal(buffer.tree[[0, 1]], [4.5, 0.5])
+    assert buffer.max_priority == 4.5
+    _add(buffer, 1, start=2)
+    assert buffer.tree[[2]][0] == 4.5
+    assert buffer.tree.total == pytest.approx(9.5)
+
+
+def test_buffer_wraps_around():
+    buffer = PrioritizedReplayBuffer(3, 2, alpha=1.0, epsilon=0.0, seed=0)
+    _add(buffer, 3)
+    buffer.update_priorities([0, 1, 2], [0.1, 0.1, 0.1])
+    _add(buffer, 2, start=3)
+    assert len(buffer) == 3 and buffer.pos == 2
+    np.testing.assert_array_equal(buffer.columns["reward"], [3.0, 4.0, 2.0])
+    # Overwritten slots get the maximum priority again, the surviving one keeps its own.
+    np.testing.assert_allclose(buffer.tree[[0, 1, 2]], [1.0, 1.0, 0.1])
+    assert buffer.sample(16)["indices"].max() < 3
+
+
+def test_vector_actions_are_stored():
+    buffer = ReplayBuffer(4, 2, action_dim=3)
+    buffer.add(np.zeros(2), [True, False, True], 0.0, np.zeros(2), False)
+    buffer.add_batch(np.zeros((2, 2)), [1, {"classical": 0, "quantum": [2, 1]}], [0.0, 0.0],
+                     np.zeros((2, 2)), [False, True])
+    np.testing.assert_array_equal(buffer.columns["action"][:3], [
+        [1, 0, 1, 1, 0, 1],
+        [1, np.nan, np.nan, 1, np.nan, np.nan],
+        [0, np.nan, np.nan, 2, 1, np.nan],
+    ])
+    scalar = ReplayBuffer(4, 2)
+    scalar.add_batch(np.zeros((2, 2)), np.array([3, 4]), [0.0, 0.0], np.zeros((2, 2)), [False, False])
+    np.testing.assert_array_equal(scalar.columns["action"][:2], [[3, 3], [4, 4]])
+
+
+class _CountingAgent(BaseAgent):
+    def get_action(self, state):
+        return 0
+
+    def learn_batch(self, states, actions, rewards, next_states, dones):
+        self.batches = getattr(self, "batches", 0) + 1
+
+
+def test_learn_feeds_the_agent_replay_buffer():
+    agent = _CountingAgent(replay_buffer=ReplayBuffer(8, 2))
+    agent.learn(np.zeros(2), 1, 0.5, np.ones(2), True)
+    assert len(agent.replay_buffer) == 1 and agent.batches == 1
+    np.testing.assert_array_equal(agent.replay_buffer.columns["next_state"][0], [1, 1])
+    assert agent.replay_buffer.columns["done"][0]
@@ -0,0 +1,62 @@
+# File: tests/test_sim_classical.py
+import multiprocessing
+import socket
+
+import numpy as np
+import pytest
+
+pytest.importorskip("zmq")
+pytest.importorskip("ns3gym")
+
+from qsagin.simulators.ns3_standin import serve
+from qsagin.simulators.sim_classical import NS3Simulator
+
+EPISODE_LENGTH = 6
+ACTIONS = [0, 1, 1, 0, 1, 0, 0, 1]
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("localhost", 0))
+        return s.getsockname()[1]
+
+
+def _run(chunked):
+    """Plays ACTIONS against a fresh, seeded stand-in; returns (reset_obs, observations, rewards, dones)."""
+    port = _free_port()
+    server = multiprocessing.Process(target=serve, args=({
+        "port": port, "obs_size": 3, "episode_length": EPISODE_LENGTH, "seed": 0,
+    },), daemon=True)
+    server.start()
+    sim = NS3Simulator({"port": port, "chunked_actions": chunked})
+    try:
+        reset_obs, _ = sim.reset()
+        if chunked:
+            observations, rewards, dones, _ = sim.step_chunk(ACTIONS)
+        else:
+            observations, rewards, dones = [], [], []
+            for action in ACTIONS:
+                obs, reward, done, _ = sim.step(action)
+                observations.append(obs)
+                rewards.append(reward)
+                dones.append(done)
+                if done:
+                    break
+        return np.asarray(reset_obs), np.asarray(observations), np.asarray(rewards), np.asarray(dones)
+    finally:
+        sim.close()
+        server.terminate()
+        server.join()
+
+
+def test_step_chunk_matches_single_steps():
+    single = _run(chunked=False)
+    chunked = _run(chunked=True)
+    np.testing.assert_allclose(chunked[0], single[0])
+    # The chunk stops at the end of the episode, like the single steps.
+    assert len(chunked[1]) == len(single[1]) == EPISODE_LENGTH
+    np.testing.assert_allclose(chunked[1], single[1])
+    # Single-step rewards travel as a float32 protobuf field.
+    np.testing.assert_allclose(chunked[2], single[2], rtol=1e-6)
+    np.testing.assert_array_equal(chunked[3], single[3])
+    assert chunked[3][-1] and not chunked[3][:-1].any()
@@ -0,0 +1,59 @@
+# File: tests/test_sim_replay.py
+import json
+
+import numpy as np
+
+from qsagin.simulators.sim_mock import MockClassicalSimulator
+from qsagin.simulators.sim_replay import ReplayNS3Simulator, TraceRecorder
+
+
+def _record(directory, episodes, chunk_size=4096):
+    """Records `episodes` (lists of actions); returns the observations of every step."""
+    recorder = TraceRecorder(MockClassicalSimulator({"obs_size": 4, "seed": 0}), str(directory), chunk_size)
+    observations = []
+    for actions in episodes:
+        recorder.reset()
+        observations.append([recorder.step(action)[0] for action in actions])
+    recorder.close()
+    return observations
+
+
+def _replay(directory, episodes, observations):
+    replay = ReplayNS3Simulator({"trace_dir": str(directory), "fallback": "done"})
+    for actions, expected in zip(episodes, observations):
+        replay.reset()
+        for action, obs in zip(actions, expected):
+            served, _, _, info = replay.step(action)
+            assert not info
+            np.testing.assert_allclose(served, obs)
+    return replay
+
+
+def test_each_action_key_has_its_own_cursor(tmp_path):
+    episodes = [[0, 1, 0], [0, 1, 0]]
+    _replay(tmp_path, episodes, _record(tmp_path, episodes))
+
+
+def test_chunks_are_flushed_while_recording(tmp_path):
+    recorder = TraceRecorder(MockClassicalSimulator({"obs_size": 4}), str(tmp_path), chunk_size=3)
+    recorder.reset()
+    for action in (0, 1, 0, 1):
+        recorder.step(action)
+    assert json.loads((tmp_path / "trace.json").read_text())["rows"] == 3
+    recorder.close()
+    assert json.loads((tmp_path / "trace.json").read_text())["rows"] == 5
+
+
+def test_vector_and_none_actions_across_chunk_layouts(tmp_path):
+    episodes = [[0, 2, 1], [np.array([0.5, 1.0], dtype=np.float32), None], [[1, 2, 3]]]
+    _replay(tmp_path, episodes, _record(tmp_path, episodes, chunk_size=4))
+
+
+def test_non_integral_float_actions_do_not_match(tmp_path):
+    episodes = [[1]]
+    _record(tmp_path, episodes)
+    replay = ReplayNS3Simulator({"trace_dir": str(tmp_path), "fallback": "done"})
+    replay.reset()
+    assert replay.step(1.7)[3].get("replay_miss")
+    replay.reset()
+    assert not replay.step(1.0)[3]
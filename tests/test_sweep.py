@@ -0,0 +1,38 @@
+# File: tests/test_sweep.py
+import json
+
+from qsagin.core.sweep import SweepWorker, evaluate_qkd, grid_design, run_sweep
+from scripts.run_sweep import define_sweep_spec
+
+
+def _analytic_base():
+    base = define_sweep_spec()["base"]
+    base["quantum_network"]["mode"] = "analytic"
+    return base
+
+
+def test_attenuation_axis_changes_key_rate(tmp_path):
+    grid = define_sweep_spec()["grid"]
+    axis = "quantum_network.attenuation"
+    assert axis in grid
+
+    store = tmp_path / "sweep.jsonl"
+    summary = run_sweep(_analytic_base(), grid_design({axis: grid[axis]}), str(store), workers=0)
+    assert summary["completed"] == len(grid[axis])
+
+    key_rates = [json.loads(line)["result"]["key_rate_bps_mean"] for line in store.read_text().splitlines()]
+    assert len(set(key_rates)) == len(grid[axis])
+
+
+def test_worker_reuses_simulator_across_scalar_points():
+    worker = SweepWorker()
+    quantum_config = _analytic_base()["quantum_network"]
+    first = worker.quantum_simulator(dict(quantum_config, attenuation=2e-4))
+    second = worker.quantum_simulator(dict(quantum_config, attenuation=3e-4, key_size=512))
+    assert first is second
+
+    config = {"quantum_network": dict(quantum_config, attenuation=3e-4)}
+    high_loss = evaluate_qkd(config, worker)
+    config["quantum_network"]["attenuation"] = 2e-4
+    low_loss = evaluate_qkd(config, worker)
+    assert low_loss["key_rate_bps_mean"] > high_loss["key_rate_bps_mean"]
@@ -0,0 +1,62 @@
+# File: tests/test_vec_orchestrator.py
+import numpy as np
+
+from qsagin.core.state import flatten_state, split_action
+from qsagin.core.vec_orchestrator import VecOrchestrator
+from qsagin.simulators.sim_mock import MockClassicalSimulator, MockQuantumSimulator
+
+EPISODE_LENGTH = 3
+
+
+def make_pair(seed=0):
+    classical_sim = MockClassicalSimulator({"obs_size": 4, "episode_length": EPISODE_LENGTH, "seed": seed})
+    return classical_sim, MockQuantumSimulator({"done_on_step": False})
+
+
+def reference_states(num_steps, action):
+    """States a single in-process pair goes through, with the worker's auto-reset."""
+    classical_sim, quantum_sim = make_pair()
+    classical_sim.reset()
+    quantum_sim.reset()
+    transitions = []
+    for _ in range(num_steps):
+        _, _, c_done, _ = classical_sim.step(action)
+        _, _, q_done, _ = quantum_sim.step(action)
+        state = flatten_state({"classical": classical_sim.get_state(), "quantum": quantum_sim.get_state()})
+        done = c_done or q_done
+        if done:
+            classical_sim.reset()
+            quantum_sim.reset()
+        reset_state = flatten_state({"classical": classical_sim.get_state(), "quantum": quantum_sim.get_state()})
+        transitions.append((state, done, reset_state))
+    return transitions
+
+
+def test_split_action():
+    assert split_action({"classical": 1, "quantum": 2}) == (1, 2)
+    assert split_action({"quantum": 2}) == (2, 2)
+    assert split_action((1, 2)) == (1, 2)
+    mask = [True, False, True]
+    assert split_action(mask) == (mask, mask)
+
+
+def test_worker_auto_resets_and_reports_terminal_observation():
+    vec = VecOrchestrator([make_pair, make_pair])
+    try:
+        obs = vec.reset()
+        assert obs.shape == (2, 5)
+        num_steps = 2 * EPISODE_LENGTH
+        for state, done, reset_state in reference_states(num_steps, 0):
+            obs, rewards, dones, infos = vec.step([0, 0])
+            assert dones.tolist() == [done, done]
+            for i in range(2):
+                if done:
+                    np.testing.assert_allclose(infos[i]["terminal_observation"], state)
+                    np.testing.assert_allclose(obs[i], reset_state)
+                    # The first observation of the new episode has the quantum part reset.
+                    assert obs[i][-1] == 0.0
+                else:
+                    assert "terminal_observation" not in infos[i]
+                    np.testing.assert_allclose(obs[i], state)
+    finally:
+        vec.close()